@@ -0,0 +1,368 @@
+"""
+Shared analysis helpers: PageSpeed fetching, metric extraction, model
+loading, batched prediction and recommendations.
+
+Nothing in this module imports Streamlit, so it can be used by the web app,
+the HTTP service and the command line scripts alike. scikit-learn (via
+forest.py) is only imported by the functions that need it, so importing
+this module stays cheap for the app's first page.
+"""
+
+import hashlib
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import joblib
+import numpy as np
+import requests
+from dotenv import load_dotenv
+
+PAGESPEED_ENDPOINT = "https://www.googleapis.com/pagespeedonline/v5/runPagespeed"
+
+# Paths
+MODEL_DIR = "data/model"
+MODEL_PATH = os.path.join(MODEL_DIR, "model.pkl")
+SCALER_PATH = os.path.join(MODEL_DIR, "scaler.pkl")
+FEATURES_PATH = os.path.join(MODEL_DIR, "features.pkl")
+
+# (stage, status label) in the order a single-URL analysis runs them
+ANALYSIS_STAGES = [
+    ('fetch', "📡 Connecting to PageSpeed Insights..."),
+    ('extract', "🔧 Processing Performance Metrics..."),
+    ('model', "🧠 Loading AI Model..."),
+    ('predict', "🤖 Running AI Analysis..."),
+    ('render', "🎨 Building Your Report...")
+]
+
+logger = logging.getLogger("pagespeed.analysis")
+
+
+class PageSpeedError(Exception):
+    """Raised when the PageSpeed Insights API call fails"""
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class PageSpeedConfigError(PageSpeedError):
+    """Raised when no PageSpeed API key is configured (never worth retrying)"""
+
+
+class StageTimer:
+    """
+    Time the named stages of one analysis and report them as events.
+
+    Each stage emits a 'start' and an 'end' event to on_event, a dict with
+    event, stage, label, index, total and (for 'end') seconds, so a
+    progress display can follow the real work. Durations are kept in
+    .timings and logged.
+
+        timer = StageTimer(ANALYSIS_STAGES, on_event=update_progress)
+        with timer.stage('fetch'):
+            api_data = fetch_pagespeed_data(url)
+    """
+
+    def __init__(self, stages=ANALYSIS_STAGES, on_event=None, context=""):
+        self.labels = dict(stages)
+        self.order = [name for name, _ in stages]
+        self.on_event = on_event
+        self.context = context
+        self.timings = {}
+
+    def _emit(self, event, name, **extra):
+        if self.on_event is not None:
+            self.on_event({
+                'event': event,
+                'stage': name,
+                'label': self.labels.get(name, name),
+                'index': self.order.index(name) if name in self.order else len(self.order),
+                'total': len(self.order),
+                **extra
+            })
+
+    @contextmanager
+    def stage(self, name):
+        self._emit('start', name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self.timings[name] = seconds
+            logger.info("%s stage %s took %.3fs", self.context, name, seconds)
+            self._emit('end', name, seconds=seconds)
+
+    @property
+    def total(self):
+        return sum(self.timings.values())
+
+
+def get_api_key():
+    """Read the PageSpeed API key from the environment (.env supported)"""
+    load_dotenv()
+    api_key = os.getenv('PAGESPEED_API_KEY') or os.getenv('API_KEY')
+    if not api_key or api_key == "your_api_key_here":
+        return None
+    return api_key
+
+
+def fetch_pagespeed_data(url, strategy='mobile', api_key=None, timeout=30, session=None):
+    """
+    Fetch the raw Lighthouse report for one URL.
+    Raises PageSpeedError on any HTTP or network failure, and
+    PageSpeedConfigError when there is no API key.
+    """
+    if api_key is None:
+        api_key = get_api_key()
+    if not api_key:
+        raise PageSpeedConfigError("PageSpeed API key is not configured")
+
+    http = session or requests
+    try:
+        response = http.get(
+            PAGESPEED_ENDPOINT,
+            params={
+                'url': url,
+                'key': api_key,
+                'strategy': strategy,
+                'category': ['PERFORMANCE', 'SEO', 'ACCESSIBILITY', 'BEST_PRACTICES']
+            },
+            timeout=timeout
+        )
+    except requests.RequestException as e:
+        raise PageSpeedError(f"Error fetching data: {e}") from e
+
+    if response.status_code != 200:
+        raise PageSpeedError(f"API Error: {response.status_code}", response.status_code)
+
+    return response.json()
+
+
+def normalize_url(url):
+    """Add a scheme to bare domains, like the app's URL box does"""
+    url = url.strip()
+    if not url.startswith(('http://', 'https://')):
+        url = 'https://' + url
+    return url
+
+
+def extract_metrics(api_data):
+    """
+    Extract the model's input metrics from a PageSpeed API response.
+    Raises KeyError/TypeError if the response is malformed.
+    """
+    metrics = {}
+    categories = api_data['lighthouseResult']['categories']
+
+    metrics['performance_score'] = categories.get('performance', {}).get('score', 0) * 100
+    metrics['seo_score'] = categories.get('seo', {}).get('score', 0) * 100
+    metrics['accessibility_score'] = categories.get('accessibility', {}).get('score', 0) * 100
+    metrics['best_practices_score'] = categories.get('best-practices', {}).get('score', 0) * 100
+
+    audits = api_data['lighthouseResult']['audits']
+
+    metrics['first_contentful_paint'] = audits.get('first-contentful-paint', {}).get('numericValue', 0)
+    metrics['largest_contentful_paint'] = audits.get('largest-contentful-paint', {}).get('numericValue', 0)
+    metrics['cumulative_layout_shift'] = audits.get('cumulative-layout-shift', {}).get('numericValue', 0)
+    metrics['total_blocking_time'] = audits.get('total-blocking-time', {}).get('numericValue', 0)
+    metrics['speed_index'] = audits.get('speed-index', {}).get('numericValue', 0)
+    metrics['time_to_interactive'] = audits.get('interactive', {}).get('numericValue', 0)
+
+    total_bytes = audits.get('total-byte-weight', {}).get('numericValue', 0)
+    metrics['total_byte_weight'] = total_bytes / 1024
+
+    metrics['meta_description_exists'] = 1 if audits.get('meta-description', {}).get('score', 0) == 1 else 0
+
+    title_audit = audits.get('document-title', {})
+    if title_audit.get('details', {}).get('items'):
+        metrics['title_length'] = len(title_audit['details']['items'][0].get('title', ''))
+    else:
+        metrics['title_length'] = 0
+
+    metrics['image_alt_exists'] = 1 if audits.get('image-alt', {}).get('score', 0) == 1 else 0
+    metrics['server_response_time'] = audits.get('server-response-time', {}).get('numericValue', 0)
+
+    return metrics
+
+
+def fetch_metrics_many(urls, strategy='mobile', api_key=None, timeout=30, workers=None):
+    """
+    Fetch and extract several URLs concurrently, so the whole set takes about
+    as long as its slowest request. Returns one dict per URL, in input order,
+    with 'url', 'metrics' (None on failure), 'error' and 'seconds'. Each
+    Lighthouse report is reduced to its metrics in its worker thread.
+    """
+    if api_key is None:
+        api_key = get_api_key()
+
+    def fetch_one(url):
+        started = time.perf_counter()
+        entry = {'url': url, 'metrics': None, 'error': None}
+        try:
+            entry['metrics'] = extract_metrics(fetch_pagespeed_data(url, strategy, api_key, timeout))
+        except PageSpeedError as e:
+            entry['error'] = str(e)
+        except (KeyError, TypeError) as e:
+            entry['error'] = f"Error extracting metrics: {e}"
+        entry['seconds'] = time.perf_counter() - started
+        return entry
+
+    urls = list(urls)
+    if not urls:
+        return []
+    with ThreadPoolExecutor(max_workers=workers or len(urls)) as pool:
+        return list(pool.map(fetch_one, urls))
+
+
+def load_model(model_dir=MODEL_DIR):
+    """Load the trained model, scaler and feature list from disk"""
+    model = joblib.load(os.path.join(model_dir, "model.pkl"))
+    scaler = joblib.load(os.path.join(model_dir, "scaler.pkl"))
+    features = joblib.load(os.path.join(model_dir, "features.pkl"))
+    return model, scaler, features
+
+
+def model_version(model_dir=MODEL_DIR):
+    """Short content hash of the model artifacts, stored with every prediction"""
+    digest = hashlib.sha256()
+    for name in ("model.pkl", "scaler.pkl", "features.pkl"):
+        with open(os.path.join(model_dir, name), "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()[:12]
+
+
+def build_feature_matrix(metrics_list, features):
+    """Stack metric dicts into one (n_rows, n_features) array in model order"""
+    return np.array(
+        [[float(metrics.get(feature, 0) or 0) for feature in features] for metrics in metrics_list],
+        dtype=np.float64
+    ).reshape(len(metrics_list), len(features))
+
+
+def predict_batch(model, scaler, features, metrics_list):
+    """
+    Score many metric dicts with a single forest evaluation.
+    Returns a list of (prediction, probabilities) pairs, one per input.
+    """
+    if not metrics_list:
+        return []
+
+    X_scaled = scaler.transform(build_feature_matrix(metrics_list, features))
+    probabilities_raw = model.predict_proba(X_scaled)
+    predicted_idx = probabilities_raw.argmax(axis=1)
+
+    results = []
+    for row, idx in zip(probabilities_raw, predicted_idx):
+        probabilities = {cls: float(p) for cls, p in zip(model.classes_, row)}
+        results.append((str(model.classes_[idx]), probabilities))
+    return results
+
+
+def predict_batch_early_exit(model, scaler, features, metrics_list, chunk_size=10, confidence=None):
+    """
+    Like predict_batch, but stops evaluating trees once each row's label is
+    settled (see forest.predict_proba_early_exit).
+    Returns a list of (prediction, probabilities, trees_used) triples.
+    """
+    import forest
+
+    if not metrics_list:
+        return []
+
+    X_scaled = scaler.transform(build_feature_matrix(metrics_list, features))
+    labels, probabilities_raw, trees_used = forest.predict_early_exit(
+        model, X_scaled, chunk_size=chunk_size, confidence=confidence
+    )
+
+    results = []
+    for label, row, used in zip(labels, probabilities_raw, trees_used):
+        probabilities = {cls: float(p) for cls, p in zip(model.classes_, row)}
+        results.append((str(label), probabilities, int(used)))
+    return results
+
+
+def explain_batch(attributor, scaler, features, metrics_list, predictions):
+    """
+    Per-feature contributions towards each row's predicted class, from a
+    forest.TreeAttributor built once at model-load time.
+    Returns a list of {feature: contribution} dicts, largest effect first.
+    """
+    if not metrics_list:
+        return []
+
+    X_scaled = scaler.transform(build_feature_matrix(metrics_list, features))
+    return attributor.explain_class(X_scaled, predictions)
+
+
+def get_recommendations(metrics, prediction):
+    """Get recommendations based on metrics"""
+    recommendations = []
+
+    if metrics.get('first_contentful_paint', 0) > 1800:
+        recommendations.append({
+            'category': '⚡ Performance',
+            'title': 'Optimize First Contentful Paint',
+            'description': 'Reduce server response time and eliminate render-blocking resources to improve initial page load experience.',
+            'priority': 'High' if metrics['first_contentful_paint'] > 3000 else 'Medium',
+            'color': '#FF6B6B' if metrics['first_contentful_paint'] > 3000 else '#FFD700'
+        })
+
+    if metrics.get('largest_contentful_paint', 0) > 2500:
+        recommendations.append({
+            'category': '🖼️ Performance',
+            'title': 'Improve Largest Contentful Paint',
+            'description': 'Optimize images using next-gen formats (WebP, AVIF), implement lazy loading, and use a CDN for faster delivery.',
+            'priority': 'High' if metrics['largest_contentful_paint'] > 4000 else 'Medium',
+            'color': '#FF6B6B' if metrics['largest_contentful_paint'] > 4000 else '#FFD700'
+        })
+
+    if metrics.get('cumulative_layout_shift', 0) > 0.1:
+        recommendations.append({
+            'category': '📐 User Experience',
+            'title': 'Reduce Cumulative Layout Shift',
+            'description': 'Add explicit size attributes to images and videos, reserve space for dynamic content, and use CSS aspect-ratio.',
+            'priority': 'High' if metrics['cumulative_layout_shift'] > 0.25 else 'Medium',
+            'color': '#FF6B6B' if metrics['cumulative_layout_shift'] > 0.25 else '#FFD700'
+        })
+
+    if metrics.get('meta_description_exists', 0) == 0:
+        recommendations.append({
+            'category': '🔍 SEO',
+            'title': 'Add Meta Description',
+            'description': 'Include a unique, compelling meta description (150-160 characters) to improve search engine visibility and CTR.',
+            'priority': 'Medium',
+            'color': '#FFD700'
+        })
+
+    if metrics.get('total_byte_weight', 0) > 4000:
+        recommendations.append({
+            'category': '📦 Optimization',
+            'title': 'Reduce Total Page Size',
+            'description': 'Compress and optimize images, minify CSS/JS files, remove unused code, and enable Gzip/Brotli compression.',
+            'priority': 'Medium',
+            'color': '#FFD700'
+        })
+
+    if prediction == 'Poor':
+        recommendations.append({
+            'category': '🚨 Critical',
+            'title': 'Urgent Performance Improvements Required',
+            'description': 'Your website needs immediate attention. Focus on Core Web Vitals, reduce page weight, and optimize critical resources.',
+            'priority': 'High',
+            'color': '#FF6B6B'
+        })
+    elif prediction == 'Needs Improvement':
+        recommendations.append({
+            'category': '📈 Enhancement',
+            'title': 'Performance Optimization Opportunities',
+            'description': 'Good foundation but room for improvement. Address specific metrics below threshold for better user experience.',
+            'priority': 'Medium',
+            'color': '#FFD700'
+        })
+
+    return recommendations
@@ -1,20 +1,35 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import plotly.graph_objects as go
-import plotly.express as px
-import joblib
-import requests
-import json
-import time
+import logging
 import os
+import re
 import sys
+from contextlib import nullcontext
 from datetime import datetime
-from io import BytesIO
 
 # Add current directory to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+# analysis is light (numpy, requests); scikit-learn, pandas and plotly are
+# imported where they are first needed, so the welcome page never pays for
+# them. Profile with: python scripts/07_profile_startup.py
+import analysis
+from analysis import get_recommendations
+
+CSS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "style.css")
+
+# Stage timings of every analysis go to the server log
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+
+@st.cache_resource(show_spinner=False)
+def load_css(path=CSS_PATH):
+    """The stylesheet as a minified <style> block, read once per process"""
+    with open(path) as f:
+        css = f.read()
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{}:;,>])\s*", r"\1", css)
+    return f"<style>{css.strip()}</style>"
+
 # Page configuration
 st.set_page_config(
     page_title="PageSpeed AI Analyzer Pro",
@@ -23,1386 +38,995 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Premium Custom CSS with animations, modern design, and responsiveness
+# Premium custom CSS, loaded once per process from assets/style.css
+st.markdown(load_css(), unsafe_allow_html=True)
+
+# Hero section with animated background
 st.markdown("""
-<style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800;900&display=swap');
-    
-    /* Global Styles */
-    * {
-        font-family: 'Inter', sans-serif;
-    }
-    
-    .main {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        background-attachment: fixed;
-    }
-    
-    .block-container {
-        padding: 2rem 3rem;
-        max-width: 1400px;
-        margin: 0 auto;
-    }
-    
-    /* Animated gradient background */
-    @keyframes gradientShift {
-        0% { background-position: 0% 50%; }
-        50% { background-position: 100% 50%; }
-        100% { background-position: 0% 50%; }
-    }
-    
-    /* Hero Section */
-    .hero-section {
-        background: linear-gradient(-45deg, #667eea, #764ba2, #f093fb, #4facfe);
-        background-size: 400% 400%;
-        animation: gradientShift 15s ease infinite;
-        padding: 3rem 2rem;
-        border-radius: 30px;
-        text-align: center;
-        margin-bottom: 2rem;
-        box-shadow: 0 20px 60px rgba(0,0,0,0.3);
-        position: relative;
-        overflow: hidden;
-    }
-    
-    .hero-section::before {
-        content: '';
-        position: absolute;
-        top: -50%;
-        left: -50%;
-        width: 200%;
-        height: 200%;
-        background: radial-gradient(circle, rgba(255,255,255,0.1) 1px, transparent 1px);
-        background-size: 50px 50px;
-        animation: moveGrid 20s linear infinite;
-    }
-    
-    @keyframes moveGrid {
-        0% { transform: translate(0, 0); }
-        100% { transform: translate(50px, 50px); }
-    }
-    
-    .main-title {
-        font-size: 4.5rem;
-        font-weight: 900;
-        color: white;
-        margin-bottom: 1rem;
-        text-shadow: 0 5px 15px rgba(0,0,0,0.3);
-        letter-spacing: -2px;
-        position: relative;
-        z-index: 1;
-        animation: fadeInDown 1s ease;
-    }
-    
-    @keyframes fadeInDown {
-        from {
-            opacity: 0;
-            transform: translateY(-30px);
-        }
-        to {
-            opacity: 1;
-            transform: translateY(0);
-        }
-    }
-    
-    .subtitle {
-        font-size: 1.5rem;
-        color: rgba(255,255,255,0.95);
-        font-weight: 300;
-        margin-bottom: 2rem;
-        position: relative;
-        z-index: 1;
-        animation: fadeInUp 1s ease 0.2s both;
-    }
-    
-    @keyframes fadeInUp {
-        from {
-            opacity: 0;
-            transform: translateY(30px);
-        }
-        to {
-            opacity: 1;
-            transform: translateY(0);
-        }
-    }
-    
-    /* Glass Morphism Cards */
-    .glass-card {
-        background: rgba(255, 255, 255, 0.1);
-        backdrop-filter: blur(20px);
-        border-radius: 25px;
-        padding: 2rem;
-        border: 1px solid rgba(255, 255, 255, 0.2);
-        box-shadow: 0 15px 35px rgba(0, 0, 0, 0.2);
-        transition: all 0.4s cubic-bezier(0.4, 0, 0.2, 1);
-        position: relative;
-        overflow: hidden;
-    }
-    
-    .glass-card::before {
-        content: '';
-        position: absolute;
-        top: -50%;
-        left: -50%;
-        width: 200%;
-        height: 200%;
-        background: linear-gradient(45deg, transparent, rgba(255,255,255,0.1), transparent);
-        transform: rotate(45deg);
-        transition: all 0.6s;
-    }
-    
-    .glass-card:hover::before {
-        left: 100%;
-    }
-    
-    .glass-card:hover {
-        transform: translateY(-10px) scale(1.02);
-        box-shadow: 0 25px 50px rgba(0, 0, 0, 0.3);
-        border: 1px solid rgba(255, 255, 255, 0.4);
-    }
-    
-    /* Metric Cards with 3D effect */
-    .metric-card {
-        background: linear-gradient(135deg, rgba(255,255,255,0.15), rgba(255,255,255,0.05));
-        backdrop-filter: blur(20px);
-        padding: 2rem;
-        border-radius: 25px;
-        border: 2px solid rgba(255, 255, 255, 0.3);
-        box-shadow: 0 15px 35px rgba(0,0,0,0.2), inset 0 1px 0 rgba(255,255,255,0.3);
-        color: white;
-        text-align: center;
-        transition: all 0.4s cubic-bezier(0.175, 0.885, 0.32, 1.275);
-        margin: 10px 0;
-        position: relative;
-        overflow: hidden;
-        cursor: pointer;
-    }
-    
-    .metric-card::after {
-        content: '';
-        position: absolute;
-        top: 50%;
-        left: 50%;
-        width: 0;
-        height: 0;
-        border-radius: 50%;
-        background: rgba(255, 255, 255, 0.1);
-        transform: translate(-50%, -50%);
-        transition: width 0.6s, height 0.6s;
-    }
-    
-    .metric-card:hover::after {
-        width: 300px;
-        height: 300px;
-    }
-    
-    .metric-card:hover {
-        transform: translateY(-15px) rotateX(5deg);
-        box-shadow: 0 30px 60px rgba(0,0,0,0.4);
-        border-color: rgba(255, 255, 255, 0.6);
-    }
-    
-    .metric-card h3 {
-        color: white !important;
-        font-size: 1.1rem;
-        margin-bottom: 1rem;
-        font-weight: 600;
-        text-transform: uppercase;
-        letter-spacing: 2px;
-        position: relative;
-        z-index: 1;
-    }
-    
-    .metric-card .value {
-        font-size: 3.5rem;
-        font-weight: 900;
-        margin: 1rem 0;
-        position: relative;
-        z-index: 1;
-        text-shadow: 0 3px 10px rgba(0,0,0,0.3);
-        animation: pulse 2s ease-in-out infinite;
-    }
-    
-    @keyframes pulse {
-        0%, 100% { transform: scale(1); }
-        50% { transform: scale(1.05); }
-    }
-    
-    .metric-card .label {
-        font-size: 1rem;
-        opacity: 0.9;
-        font-weight: 500;
-        position: relative;
-        z-index: 1;
-    }
-    
-    /* Score colors with glow */
-    .score-excellent { 
-        color: #00ff88 !important;
-        text-shadow: 0 0 20px rgba(0, 255, 136, 0.5);
-    }
-    .score-good { 
-        color: #90EE90 !important;
-        text-shadow: 0 0 20px rgba(144, 238, 144, 0.5);
-    }
-    .score-average { 
-        color: #FFD700 !important;
-        text-shadow: 0 0 20px rgba(255, 215, 0, 0.5);
-    }
-    .score-poor { 
-        color: #FF6B6B !important;
-        text-shadow: 0 0 20px rgba(255, 107, 107, 0.5);
-    }
-    
-    /* Buttons with gradient and animation */
-    .stButton > button {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        border: none;
-        padding: 1rem 2rem;
-        border-radius: 15px;
-        font-weight: 700;
-        font-size: 1.1rem;
-        transition: all 0.3s ease;
-        width: 100%;
-        text-transform: uppercase;
-        letter-spacing: 1px;
-        box-shadow: 0 10px 25px rgba(102, 126, 234, 0.4);
-        position: relative;
-        overflow: hidden;
-    }
-    
-    .stButton > button::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: -100%;
-        width: 100%;
-        height: 100%;
-        background: linear-gradient(90deg, transparent, rgba(255,255,255,0.3), transparent);
-        transition: left 0.5s;
-    }
-    
-    .stButton > button:hover::before {
-        left: 100%;
-    }
-    
-    .stButton > button:hover {
-        transform: translateY(-3px);
-        box-shadow: 0 15px 35px rgba(102, 126, 234, 0.6);
-    }
-    
-    .stButton > button:active {
-        transform: translateY(-1px);
-    }
+<div class="hero-section">
+    <h1 class="main-title">⚡ PageSpeed AI Analyzer Pro</h1>
+    <p class="subtitle">Next-generation AI-powered website performance analysis with real-time insights</p>
+</div>
+""", unsafe_allow_html=True)
+
+# Cache the model loading
+@st.cache_resource(show_spinner="🤖 Loading AI model...")
+def load_ai_model():
+    """Load the trained AI model"""
+    try:
+        return analysis.load_model()
+    except Exception as e:
+        st.error(f"❌ Error loading model: {e}")
+        return None, None, None
+
+@st.cache_resource(show_spinner=False)
+def load_attributor():
+    """Precompute per-node attribution deltas for the loaded model"""
+    import forest
     
-    /* Tab styling with modern look */
-    .stTabs [data-baseweb="tab-list"] {
-        gap: 1rem;
-        background: rgba(255, 255, 255, 0.1);
-        backdrop-filter: blur(10px);
-        padding: 1rem;
-        border-radius: 20px;
-        border: 1px solid rgba(255, 255, 255, 0.2);
-    }
+    model, scaler, features = load_ai_model()
+    if model is None:
+        return None
+    return forest.TreeAttributor(model, features)
+
+@st.cache_resource(show_spinner=False)
+def load_reservoir():
+    """Live training sample fed by every analysis (see reservoir.py)"""
+    try:
+        import reservoir
+        return reservoir.Reservoir(os.getenv("RESERVOIR_PATH", reservoir.DEFAULT_PATH))
+    except Exception:
+        return None
+
+def sample_analysis(url, device, metrics):
+    """Offer a finished analysis to the reservoir; never blocks the result"""
+    sampler = load_reservoir()
+    if sampler is None:
+        return
+    try:
+        sampler.offer(url, device, metrics)
+    except Exception:
+        pass
+
+@st.cache_resource(show_spinner=False)
+def load_history():
+    """Analysis history store (see history.py)"""
+    try:
+        import history
+        return history.History(os.getenv("HISTORY_PATH", history.DEFAULT_PATH))
+    except Exception:
+        return None
+
+@st.cache_resource(show_spinner=False)
+def load_model_version():
+    """Content hash of the model files, recorded with each analysis"""
+    try:
+        return analysis.model_version()
+    except Exception:
+        return None
+
+def history_recorder():
+    """
+    Callback that stores a result dict in the history. It only closes over
+    the store, so bulk workers can call it from their own threads.
+    """
+    store = load_history()
+    version = load_model_version()
+    
+    def record(result):
+        # Metrics served from the PSI cache were recorded when first fetched
+        if store is None or result.get('error') or not result.get('metrics') or result.get('cached'):
+            return
+        try:
+            store.record(result['url'], result['device'], result['metrics'],
+                         result['prediction'], result['probabilities'],
+                         model_version=version, timestamp=result['analyzed_at'].timestamp())
+        except Exception:
+            pass
     
-    .stTabs [data-baseweb="tab"] {
-        height: 60px;
-        font-weight: 600;
-        font-size: 1.1rem;
-        border-radius: 15px;
-        padding: 0 2rem;
-        color: white;
-        transition: all 0.3s ease;
-        border: 2px solid transparent;
-    }
+    return record
+
+def app_api_key():
+    """API key from Streamlit secrets, else config.py; None if neither is set up"""
+    # Try Streamlit Cloud secrets first
+    try:
+        return st.secrets["API_KEY"]
+    except Exception:
+        # Fallback to local config for development
+        try:
+            from config import API_KEY
+            return API_KEY
+        except ImportError:
+            return None
+
+# Memory budgets (see budget.py). The PSI cache is shared by every session.
+PSI_CACHE_BYTES = int(float(os.getenv("PSI_CACHE_MB", "32")) * 2**20)
+PSI_CACHE_TTL = 3600
+MAX_SESSION_RESULTS = int(os.getenv("MAX_SESSION_RESULTS", "10"))
+
+@st.cache_resource(show_spinner=False)
+def load_psi_cache():
+    """Metrics of recently fetched URLs, keyed by (url, device), under a byte budget"""
+    import budget
+    return budget.ByteBudgetCache(PSI_CACHE_BYTES, ttl=PSI_CACHE_TTL)
+
+def get_pagespeed_data(url, strategy='mobile'):
+    """Fetch data from PageSpeed Insights API"""
     
-    .stTabs [data-baseweb="tab"]:hover {
-        background-color: rgba(255, 255, 255, 0.1);
-        border-color: rgba(255, 255, 255, 0.3);
-    }
+    API_KEY = app_api_key()
+    if API_KEY is None:
+        st.error("❌ **API Key Configuration Error**")
+        st.info("""
+        Please configure your API key:
+        
+        **For Streamlit Cloud:**
+        1. Go to App Settings → Secrets
+        2. Add: API_KEY = "your_actual_api_key"
+        
+        **For Local Development:**
+        1. Create .env file with: API_KEY=your_api_key
+        2. Or update config.py with your API key
+        """)
+        return None
     
-    .stTabs [aria-selected="true"] {
-        background: white !important;
-        color: #667eea !important;
-        box-shadow: 0 5px 15px rgba(0,0,0,0.2);
-        border-color: white !important;
-    }
+    if not API_KEY or API_KEY == "your_api_key_here":
+        st.error("⚠️ **API Key Not Set**")
+        st.info("Please add your Google PageSpeed API key to proceed")
+        return None
     
-    /* Progress bar with gradient */
-    .stProgress > div > div > div {
-        background: linear-gradient(90deg, #667eea, #764ba2, #f093fb);
-        background-size: 200% 100%;
-        animation: progressShine 2s linear infinite;
-    }
+    try:
+        return analysis.fetch_pagespeed_data(url, strategy, api_key=API_KEY)
+        
+    except analysis.PageSpeedError as e:
+        st.error(str(e))
+        if e.status_code == 429:
+            st.info("Rate limit exceeded. Try again in a few minutes.")
+        elif e.status_code == 400:
+            st.info("Invalid URL or API key. Check your input.")
+        return None
+
+def extract_metrics(api_data):
+    """Extract metrics from API response"""
+    if not api_data:
+        return None
     
-    @keyframes progressShine {
-        0% { background-position: 0% 0%; }
-        100% { background-position: 200% 0%; }
-    }
+    try:
+        return analysis.extract_metrics(api_data)
+        
+    except Exception as e:
+        st.error(f"Error extracting metrics: {e}")
+        return None
+
+def get_score_color(score):
+    """Get color class based on score"""
+    if score >= 90:
+        return "score-excellent"
+    elif score >= 75:
+        return "score-good"
+    elif score >= 50:
+        return "score-average"
+    else:
+        return "score-poor"
+
+# Each results section is a fragment, so a widget inside one reruns only
+# that section; none of them fetch or predict anything
+@st.fragment
+def dashboard_section(metrics, url, device, analyzed_at):
+    """Score cards and Core Web Vitals"""
+    st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+    
+    # Header with site info
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        st.markdown(f"### 🌐 Analysis Results")
+        st.markdown(f"**URL:** `{url}`")
+        st.markdown(f"**Device:** {device.upper()} 📱" if device == 'mobile' else f"**Device:** {device.upper()} 💻")
+    with col2:
+        st.markdown(f"**Analyzed:** {analyzed_at.strftime('%H:%M:%S')}")
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+    st.markdown("<br>", unsafe_allow_html=True)
+    
+    # Score cards
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        perf_score = metrics.get('performance_score', 0)
+        st.markdown(f"""
+        <div class="metric-card">
+            <h3>⚡ Performance</h3>
+            <div class="value {get_score_color(perf_score)}">{perf_score:.0f}</div>
+            <div class="label">Core Web Vitals</div>
+        </div>
+        """, unsafe_allow_html=True)
     
-    /* Sidebar with glass effect */
-    [data-testid="stSidebar"] {
-        background: linear-gradient(180deg, rgba(102, 126, 234, 0.95), rgba(118, 75, 162, 0.95));
-        backdrop-filter: blur(20px);
-        border-right: 1px solid rgba(255, 255, 255, 0.2);
-    }
+    with col2:
+        seo_score = metrics.get('seo_score', 0)
+        st.markdown(f"""
+        <div class="metric-card">
+            <h3>🔍 SEO Score</h3>
+            <div class="value {get_score_color(seo_score)}">{seo_score:.0f}</div>
+            <div class="label">Search Optimization</div>
+        </div>
+        """, unsafe_allow_html=True)
     
-    [data-testid="stSidebar"] * {
-        color: white !important;
-    }
+    with col3:
+        acc_score = metrics.get('accessibility_score', 0)
+        st.markdown(f"""
+        <div class="metric-card">
+            <h3>♿ Accessibility</h3>
+            <div class="value {get_score_color(acc_score)}">{acc_score:.0f}</div>
+            <div class="label">Inclusive Design</div>
+        </div>
+        """, unsafe_allow_html=True)
     
-    /* Input fields */
-    .stTextInput > div > div > input {
-        background: rgba(255, 255, 255, 0.1);
-        backdrop-filter: blur(10px);
-        border: 2px solid rgba(255, 255, 255, 0.3);
-        border-radius: 15px;
-        color: white;
-        padding: 1rem;
-        font-size: 1rem;
-        transition: all 0.3s ease;
-    }
+    with col4:
+        bp_score = metrics.get('best_practices_score', 0)
+        st.markdown(f"""
+        <div class="metric-card">
+            <h3>🏆 Best Practices</h3>
+            <div class="value {get_score_color(bp_score)}">{bp_score:.0f}</div>
+            <div class="label">Web Standards</div>
+        </div>
+        """, unsafe_allow_html=True)
     
-    .stTextInput > div > div > input:focus {
-        border-color: white;
-        box-shadow: 0 0 20px rgba(255, 255, 255, 0.3);
-        background: rgba(255, 255, 255, 0.15);
-    }
+    st.markdown("<br><br>", unsafe_allow_html=True)
     
-    .stTextInput > div > div > input::placeholder {
-        color: rgba(255, 255, 255, 0.6);
-    }
+    # Core Web Vitals
+    st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+    st.markdown("### ⚡ Core Web Vitals Breakdown")
     
-    /* Radio buttons */
-    .stRadio > div {
-        background: rgba(255, 255, 255, 0.1);
-        backdrop-filter: blur(10px);
-        padding: 1rem;
-        border-radius: 15px;
-        border: 1px solid rgba(255, 255, 255, 0.2);
-    }
+    col1, col2, col3 = st.columns(3)
     
-    /* Divider */
-    hr {
-        border: none;
-        height: 2px;
-        background: linear-gradient(90deg, transparent, rgba(255,255,255,0.3), transparent);
-        margin: 2rem 0;
-    }
+    with col1:
+        fcp = metrics.get('first_contentful_paint', 0)
+        fcp_status = "✅ Good" if fcp < 1800 else "⚠️ Needs Work" if fcp < 3000 else "❌ Poor"
+        st.metric("First Contentful Paint", f"{fcp:.0f} ms", fcp_status)
     
-    /* Metrics with animation */
-    .stMetric {
-        background: rgba(255, 255, 255, 0.1);
-        backdrop-filter: blur(10px);
-        padding: 1.5rem;
-        border-radius: 15px;
-        border: 1px solid rgba(255, 255, 255, 0.2);
-        transition: all 0.3s ease;
-    }
+    with col2:
+        lcp = metrics.get('largest_contentful_paint', 0)
+        lcp_status = "✅ Good" if lcp < 2500 else "⚠️ Needs Work" if lcp < 4000 else "❌ Poor"
+        st.metric("Largest Contentful Paint", f"{lcp:.0f} ms", lcp_status)
     
-    .stMetric:hover {
-        background: rgba(255, 255, 255, 0.15);
-        transform: translateY(-5px);
-        box-shadow: 0 10px 25px rgba(0,0,0,0.2);
-    }
+    with col3:
+        cls = metrics.get('cumulative_layout_shift', 0)
+        cls_status = "✅ Good" if cls < 0.1 else "⚠️ Needs Work" if cls < 0.25 else "❌ Poor"
+        st.metric("Cumulative Layout Shift", f"{cls:.3f}", cls_status)
     
-    .stMetric label {
-        color: rgba(255, 255, 255, 0.9) !important;
-        font-weight: 600 !important;
-        font-size: 1rem !important;
-    }
+    st.markdown('</div>', unsafe_allow_html=True)
+
+@st.fragment
+def intelligence_section(metrics, prediction, probabilities, attributions):
+    """Prediction, radar, probability bars and attributions"""
+    import charts
+    
+    st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+    st.markdown("## 🤖 AI-Powered Performance Analysis")
+    
+    col1, col2 = st.columns([1, 2])
+    
+    with col1:
+        # Prediction display
+        pred_colors = {
+            'Excellent': '#00ff88',
+            'Good': '#90EE90',
+            'Needs Improvement': '#FFD700',
+            'Poor': '#FF6B6B'
+        }
+        
+        st.markdown(f"""
+        <div style="background: linear-gradient(135deg, rgba(102,126,234,0.3), rgba(118,75,162,0.3)); 
+                    padding: 3rem 2rem; border-radius: 25px; text-align: center;
+                    border: 2px solid rgba(255,255,255,0.3); box-shadow: 0 20px 40px rgba(0,0,0,0.3);">
+            <div style="font-size: 1.3rem; color: rgba(255,255,255,0.9); margin-bottom: 1rem; 
+                       text-transform: uppercase; letter-spacing: 2px; font-weight: 600;">
+                🎯 AI Prediction
+            </div>
+            <div style="font-size: 3.5rem; font-weight: 900; margin: 2rem 0; 
+                       color: {pred_colors.get(prediction, 'white')}; 
+                       text-shadow: 0 0 30px {pred_colors.get(prediction, 'white')};">
+                {prediction}
+            </div>
+            <div style="font-size: 1.5rem; color: white; font-weight: 600;">
+                Confidence: {max(probabilities.values())*100:.1f}%
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        st.markdown("<br>", unsafe_allow_html=True)
+        st.plotly_chart(charts.radar_chart(metrics), use_container_width=True)
     
-    .stMetric [data-testid="stMetricValue"] {
-        color: white !important;
-        font-size: 2rem !important;
-        font-weight: 800 !important;
-    }
+    with col2:
+        # Probability bars
+        st.markdown("### 📊 Prediction Confidence Distribution")
+        
+        st.plotly_chart(charts.probability_chart(probabilities), use_container_width=True)
+        
+        # Feature attributions
+        if attributions:
+            st.markdown("### 🔬 What Drove This Prediction")
+            
+            st.plotly_chart(charts.attribution_chart(attributions), use_container_width=True)
+            st.caption(f"How much each metric moved the probability of **{prediction}** "
+                       "away from the model's average prediction")
+        
+        # AI Insights
+        st.markdown("### 🧠 Intelligence Report")
+        
+        insights = {
+            'Poor': "🚨 **CRITICAL ALERT** - Your website requires immediate optimization. Performance issues are severely impacting user experience and likely affecting conversion rates and SEO rankings. Prioritize Core Web Vitals improvements.",
+            'Needs Improvement': "📈 **OPTIMIZATION NEEDED** - Your website has a solid foundation but significant room for improvement. Focus on addressing specific bottlenecks to enhance user experience and search rankings.",
+            'Good': "✅ **GOOD PERFORMANCE** - Your website is performing well! Minor optimizations can push you into excellent territory. Continue monitoring and maintain current standards.",
+            'Excellent': "🏆 **OUTSTANDING** - Exceptional performance! Your website delivers an excellent user experience. Keep monitoring metrics and stay current with best practices to maintain this high standard."
+        }
+        
+        st.info(insights.get(prediction, "Analysis complete."))
     
-    /* Info boxes */
-    .stAlert {
-        background: rgba(255, 255, 255, 0.1);
-        backdrop-filter: blur(10px);
-        border-radius: 15px;
-        border: 1px solid rgba(255, 255, 255, 0.2);
-        color: white;
-    }
+    st.markdown('</div>', unsafe_allow_html=True)
+
+@st.fragment
+def analytics_section(metrics):
+    """Gauges and the detailed metrics grid"""
+    import charts
     
-    /* Recommendation cards */
-    .recommendation-card {
-        background: rgba(255, 255, 255, 0.1);
-        backdrop-filter: blur(20px);
-        padding: 1.5rem;
-        border-radius: 20px;
-        border-left: 5px solid;
-        margin: 15px 0;
-        box-shadow: 0 10px 25px rgba(0,0,0,0.2);
-        transition: all 0.3s ease;
-        position: relative;
-        overflow: hidden;
-    }
+    st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+    st.markdown("## 📈 Comprehensive Metrics Analysis")
     
-    .recommendation-card::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: 0;
-        width: 100%;
-        height: 100%;
-        background: linear-gradient(135deg, rgba(255,255,255,0.05), transparent);
-        pointer-events: none;
-    }
+    # Gauge charts
+    col1, col2 = st.columns(2)
     
-    .recommendation-card:hover {
-        transform: translateX(10px);
-        box-shadow: 0 15px 35px rgba(0,0,0,0.3);
-    }
+    with col1:
+        st.plotly_chart(
+            charts.gauge_chart(metrics.get('performance_score', 0), "⚡ Performance Score"),
+            use_container_width=True
+        )
     
-    .recommendation-card h4 {
-        color: white !important;
-        font-weight: 700;
-        margin-bottom: 0.5rem;
-    }
+    with col2:
+        st.plotly_chart(
+            charts.gauge_chart(metrics.get('seo_score', 0), "🔍 SEO Score"),
+            use_container_width=True
+        )
     
-    .recommendation-card p {
-        color: rgba(255, 255, 255, 0.9);
-        line-height: 1.6;
-    }
+    st.markdown('</div>', unsafe_allow_html=True)
+    st.markdown("<br>", unsafe_allow_html=True)
     
-    .priority-badge {
-        display: inline-block;
-        padding: 0.5rem 1rem;
-        border-radius: 25px;
-        font-weight: 700;
-        font-size: 0.85rem;
-        text-transform: uppercase;
-        letter-spacing: 1px;
-        box-shadow: 0 5px 15px rgba(0,0,0,0.2);
-    }
+    # Additional metrics in a grid
+    st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+    st.markdown("### 📊 Performance Metrics Grid")
     
-    /* Loading animation */
-    @keyframes spin {
-        0% { transform: rotate(0deg); }
-        100% { transform: rotate(360deg); }
-    }
+    col1, col2, col3 = st.columns(3)
     
-    /* Expander */
-    .streamlit-expanderHeader {
-        background: rgba(255, 255, 255, 0.1);
-        backdrop-filter: blur(10px);
-        border-radius: 15px;
-        border: 1px solid rgba(255, 255, 255, 0.2);
-        color: white;
-        font-weight: 600;
-    }
+    with col1:
+        st.metric("⏱️ Total Blocking Time", f"{metrics.get('total_blocking_time', 0):.0f} ms")
+        st.metric("🚀 Speed Index", f"{metrics.get('speed_index', 0):.0f}")
     
-    .streamlit-expanderHeader:hover {
-        background: rgba(255, 255, 255, 0.15);
-    }
+    with col2:
+        st.metric("⚡ Time to Interactive", f"{metrics.get('time_to_interactive', 0):.0f} ms")
+        st.metric("📦 Total Page Size", f"{metrics.get('total_byte_weight', 0)/1024:.2f} MB")
     
-    /* Download button special */
-    .download-button {
-        background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
-        box-shadow: 0 10px 25px rgba(245, 87, 108, 0.4);
-    }
+    with col3:
+        st.metric("🖥️ Server Response", f"{metrics.get('server_response_time', 0):.0f} ms")
+        meta_status = "✅ Present" if metrics.get('meta_description_exists', 0) else "❌ Missing"
+        st.metric("📝 Meta Description", meta_status)
     
-    /* Status indicators */
-    .status-indicator {
-        display: inline-block;
-        width: 12px;
-        height: 12px;
-        border-radius: 50%;
-        margin-right: 8px;
-        animation: pulse 2s ease-in-out infinite;
-    }
+    st.markdown('</div>', unsafe_allow_html=True)
+
+@st.fragment
+def action_plan_section(metrics, prediction):
+    """Recommendations and the roadmap"""
+    st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+    st.markdown("## 💡 Personalized Action Plan")
     
-    .status-success { background: #00ff88; box-shadow: 0 0 10px #00ff88; }
-    .status-warning { background: #FFD700; box-shadow: 0 0 10px #FFD700; }
-    .status-error { background: #FF6B6B; box-shadow: 0 0 10px #FF6B6B; }
-    
-    /* Welcome screen cards */
-    .feature-card {
-        background: rgba(255, 255, 255, 0.1);
-        backdrop-filter: blur(20px);
-        padding: 2rem;
-        border-radius: 25px;
-        border: 1px solid rgba(255, 255, 255, 0.2);
-        text-align: center;
-        transition: all 0.4s ease;
-        margin: 1rem 0;
-    }
+    recommendations = get_recommendations(metrics, prediction)
     
-    .feature-card:hover {
-        transform: translateY(-10px) scale(1.05);
-        box-shadow: 0 20px 40px rgba(0,0,0,0.3);
-        background: rgba(255, 255, 255, 0.15);
-    }
+    if recommendations:
+        st.markdown(f"### Found {len(recommendations)} optimization opportunities")
+        st.markdown("<br>", unsafe_allow_html=True)
+        
+        for i, rec in enumerate(recommendations, 1):
+            st.markdown(f"""
+            <div class="recommendation-card" style="border-left-color: {rec['color']};">
+                <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 1rem;">
+                    <h4 style="margin: 0; font-size: 1.3rem;">{i}. {rec['title']}</h4>
+                    <span class="priority-badge" style="background: {rec['color']};">
+                        {rec['priority']} Priority
+                    </span>
+                </div>
+                <div style="color: rgba(255,255,255,0.8); font-size: 0.95rem; margin-bottom: 0.5rem; font-weight: 600;">
+                    {rec['category']}
+                </div>
+                <p style="margin: 0; color: rgba(255,255,255,0.95); line-height: 1.8; font-size: 1.05rem;">
+                    {rec['description']}
+                </p>
+            </div>
+            """, unsafe_allow_html=True)
+    else:
+        st.success("🎉 **Perfect!** No critical issues detected. Your website is performing excellently!")
     
-    .feature-icon {
-        font-size: 3rem;
-        margin-bottom: 1rem;
-        animation: bounce 2s ease-in-out infinite;
-    }
+    st.markdown("<br>", unsafe_allow_html=True)
     
-    @keyframes bounce {
-        0%, 100% { transform: translateY(0); }
-        50% { transform: translateY(-10px); }
-    }
+    # Implementation guide
+    st.markdown("### 📋 Implementation Roadmap")
     
-    /* Scrollbar */
-    ::-webkit-scrollbar {
-        width: 12px;
-    }
+    roadmap = """
+    **Phase 1: Critical Fixes (Week 1)**
+    - Address all HIGH priority items immediately
+    - Focus on Core Web Vitals that are in the red zone
+    - Implement quick wins like image compression
     
-    ::-webkit-scrollbar-track {
-        background: rgba(255, 255, 255, 0.1);
-        border-radius: 10px;
-    }
+    **Phase 2: Performance Optimization (Week 2-3)**
+    - Tackle MEDIUM priority recommendations
+    - Optimize resource loading and caching
+    - Implement lazy loading for images and videos
     
-    ::-webkit-scrollbar-thumb {
-        background: linear-gradient(180deg, #667eea, #764ba2);
-        border-radius: 10px;
-    }
+    **Phase 3: Fine-tuning (Week 4)**
+    - Address remaining LOW priority items
+    - Run A/B tests to measure impact
+    - Set up continuous monitoring
     
-    ::-webkit-scrollbar-thumb:hover {
-        background: linear-gradient(180deg, #764ba2, #667eea);
-    }
+    **Phase 4: Maintenance (Ongoing)**
+    - Weekly performance checks using this tool
+    - Monitor real user metrics (RUM)
+    - Stay updated with web performance best practices
+    """
     
-    /* Responsive adjustments */
-    @media (max-width: 768px) {
-        .block-container {
-            padding: 1rem 1.5rem;
-        }
-        
-        .hero-section {
-            padding: 2rem 1rem;
-            border-radius: 20px;
-        }
-        
-        .main-title {
-            font-size: 2.5rem;
-            letter-spacing: -1px;
-        }
-        
-        .subtitle {
-            font-size: 1.2rem;
-        }
-        
-        .glass-card {
-            padding: 1.5rem;
-            border-radius: 20px;
-        }
-        
-        .metric-card {
-            padding: 1.5rem;
-            border-radius: 20px;
-        }
-        
-        .metric-card h3 {
-            font-size: 1rem;
-        }
-        
-        .metric-card .value {
-            font-size: 2.5rem;
-        }
-        
-        .metric-card .label {
-            font-size: 0.9rem;
-        }
-        
-        .stButton > button {
-            padding: 0.8rem 1.5rem;
-            font-size: 1rem;
-            border-radius: 12px;
-        }
-        
-        .stTabs [data-baseweb="tab-list"] {
-            gap: 0.5rem;
-            padding: 0.8rem;
-            border-radius: 15px;
-            flex-wrap: wrap;
-        }
-        
-        .stTabs [data-baseweb="tab"] {
-            height: 50px;
-            font-size: 1rem;
-            padding: 0 1rem;
-            border-radius: 12px;
-        }
-        
-        .stTextInput > div > div > input {
-            padding: 0.8rem;
-            font-size: 0.9rem;
-            border-radius: 12px;
-        }
-        
-        .stRadio > div {
-            padding: 0.8rem;
-            border-radius: 12px;
-        }
-        
-        .stMetric {
-            padding: 1rem;
-            border-radius: 12px;
-        }
-        
-        .stMetric label {
-            font-size: 0.9rem !important;
-        }
-        
-        .stMetric [data-testid="stMetricValue"] {
-            font-size: 1.5rem !important;
-        }
-        
-        .recommendation-card {
-            padding: 1.2rem;
-            border-radius: 15px;
-            margin: 10px 0;
-        }
-        
-        .recommendation-card h4 {
-            font-size: 1.1rem;
-        }
-        
-        .recommendation-card p {
-            font-size: 0.95rem;
-        }
-        
-        .priority-badge {
-            padding: 0.4rem 0.8rem;
-            font-size: 0.75rem;
-        }
-        
-        .feature-card {
-            padding: 1.5rem;
-            border-radius: 20px;
-        }
-        
-        .feature-icon {
-            font-size: 2.5rem;
-        }
-        
-        ::-webkit-scrollbar {
-            width: 8px;
-        }
-    }
+    st.markdown(roadmap)
     
-    @media (max-width: 576px) {
-        .block-container {
-            padding: 1rem;
-        }
-        
-        .hero-section {
-            padding: 1.5rem 1rem;
-            border-radius: 15px;
-        }
-        
-        .main-title {
-            font-size: 2rem;
-        }
-        
-        .subtitle {
-            font-size: 1rem;
-        }
-        
-        .glass-card {
-            padding: 1rem;
-            border-radius: 15px;
-        }
-        
-        .metric-card {
-            padding: 1rem;
-            border-radius: 15px;
-        }
-        
-        .metric-card h3 {
-            font-size: 0.9rem;
-            margin-bottom: 0.5rem;
-        }
-        
-        .metric-card .value {
-            font-size: 2rem;
-            margin: 0.5rem 0;
-        }
-        
-        .metric-card .label {
-            font-size: 0.8rem;
-        }
-        
-        .stButton > button {
-            padding: 0.7rem 1.2rem;
-            font-size: 0.9rem;
-            border-radius: 10px;
-        }
-        
-        .stTabs [data-baseweb="tab-list"] {
-            gap: 0.3rem;
-            padding: 0.5rem;
-            border-radius: 12px;
-        }
-        
-        .stTabs [data-baseweb="tab"] {
-            height: 40px;
-            font-size: 0.9rem;
-            padding: 0 0.8rem;
-            border-radius: 10px;
-        }
-        
-        .stTextInput > div > div > input {
-            padding: 0.7rem;
-            font-size: 0.85rem;
-            border-radius: 10px;
-        }
-        
-        .stRadio > div {
-            padding: 0.7rem;
-            border-radius: 10px;
-            flex-direction: column;
-        }
-        
-        .stMetric {
-            padding: 0.8rem;
-            border-radius: 10px;
-        }
-        
-        .stMetric label {
-            font-size: 0.85rem !important;
-        }
-        
-        .stMetric [data-testid="stMetricValue"] {
-            font-size: 1.2rem !important;
-        }
-        
-        .recommendation-card {
-            padding: 1rem;
-            border-radius: 12px;
-            margin: 8px 0;
-        }
-        
-        .recommendation-card h4 {
-            font-size: 1rem;
-        }
-        
-        .recommendation-card p {
-            font-size: 0.9rem;
-        }
-        
-        .priority-badge {
-            padding: 0.3rem 0.6rem;
-            font-size: 0.7rem;
-        }
-        
-        .feature-card {
-            padding: 1.2rem;
-            border-radius: 15px;
-        }
-        
-        .feature-icon {
-            font-size: 2rem;
-        }
-        
-        ::-webkit-scrollbar {
-            width: 6px;
-        }
-    }
+    st.markdown('</div>', unsafe_allow_html=True)
+
+RESULT_SECTIONS = [
+    "📊 Performance Dashboard", 
+    "🤖 AI Intelligence", 
+    "📈 Detailed Analytics", 
+    "💡 Action Plan"
+]
+
+@st.fragment
+def display_analysis_results(metrics, prediction, probabilities, url, device, attributions=None,
+                             analyzed_at=None):
+    """Display beautiful analysis results"""
     
-    /* Adjust columns for small screens */
-    @media (max-width: 768px) {
-        [data-testid="column"] {
-            margin-bottom: 1rem;
-        }
-    }
-</style>
-""", unsafe_allow_html=True)
+    # Only the open section is built, so the charts of the others cost
+    # nothing until the user switches to them (which reruns just this)
+    section = st.segmented_control(
+        "Results section",
+        RESULT_SECTIONS,
+        default=RESULT_SECTIONS[0],
+        key="results_section",
+        label_visibility="collapsed",
+        width="stretch"
+    ) or RESULT_SECTIONS[0]
+    
+    if section == RESULT_SECTIONS[0]:
+        dashboard_section(metrics, url, device, analyzed_at or datetime.now())
+    elif section == RESULT_SECTIONS[1]:
+        intelligence_section(metrics, prediction, probabilities, attributions)
+    elif section == RESULT_SECTIONS[2]:
+        analytics_section(metrics)
+    else:
+        action_plan_section(metrics, prediction)
 
-# Hero section with animated background
-st.markdown("""
-<div class="hero-section">
-    <h1 class="main-title">⚡ PageSpeed AI Analyzer Pro</h1>
-    <p class="subtitle">Next-generation AI-powered website performance analysis with real-time insights</p>
-</div>
-""", unsafe_allow_html=True)
+SINGLE_MODE = "🔍 Single URL"
+COMPARE_MODE = "⚖️ Compare"
+BULK_MODE = "📋 Bulk"
+HISTORY_MODE = "📈 History"
+MODES = [SINGLE_MODE, COMPARE_MODE, BULK_MODE, HISTORY_MODE]
 
-# Cache the model loading
-@st.cache_resource(show_spinner="🤖 Loading AI model...")
-def load_ai_model():
-    """Load the trained AI model"""
-    try:
-        model = joblib.load('data/model/model.pkl')
-        scaler = joblib.load('data/model/scaler.pkl')
-        features = joblib.load('data/model/features.pkl')
-        return model, scaler, features
-    except Exception as e:
-        st.error(f"❌ Error loading model: {e}")
-        return None, None, None
+def export_button(source, name, key):
+    """
+    Download button for a zip bundle of CSV, JSONL and HTML reports (see
+    reports.py). source is a zero-argument callable returning the results;
+    the bundle is only built when the button is clicked.
+    """
+    import reports
+    
+    st.download_button(
+        label="📦 Export Reports (CSV · JSONL · HTML)",
+        data=lambda: reports.bundle_bytes(source(), title=name),
+        file_name=f"{re.sub(r'[^A-Za-z0-9.-]+', '_', name)}.zip",
+        mime="application/zip",
+        on_click="ignore",
+        key=key,
+        use_container_width=True
+    )
 
-# Cache API data fetching
-@st.cache_data(ttl=3600, show_spinner="📡 Fetching PageSpeed data...")
-def get_pagespeed_data(url, strategy='mobile'):
-    """Fetch data from PageSpeed Insights API"""
-    
-    # Get API key from Streamlit secrets or config
-    API_KEY = None
+def start_bulk_job(urls, device, workers):
+    """Start a background BulkJob for this session, replacing any earlier one"""
+    import bulk
     
-    # Try Streamlit Cloud secrets first
-    try:
-        API_KEY = st.secrets["API_KEY"]
-        # st.success("Using API key from Streamlit secrets")
-    except Exception as e:
-        # Fallback to local config for development
-        try:
-            from config import API_KEY
-            # st.success("Using API key from config.py")
-        except ImportError:
-            st.error("❌ **API Key Configuration Error**")
-            st.info("""
-            Please configure your API key:
-            
-            **For Streamlit Cloud:**
-            1. Go to App Settings → Secrets
-            2. Add: API_KEY = "your_actual_api_key"
-            
-            **For Local Development:**
-            1. Create .env file with: API_KEY=your_api_key
-            2. Or update config.py with your API key
-            """)
-            return None
+    model, scaler, features = load_ai_model()
+    if not (model and scaler and features):
+        st.error("❌ AI model unavailable. Please train the model first.")
+        return
     
-    if not API_KEY or API_KEY == "your_api_key_here":
+    api_key = app_api_key()
+    if not api_key or api_key == "your_api_key_here":
         st.error("⚠️ **API Key Not Set**")
         st.info("Please add your Google PageSpeed API key to proceed")
-        return None
+        return
     
-    try:
-        response = requests.get(
-            "https://www.googleapis.com/pagespeedonline/v5/runPagespeed",
-            params={
-                'url': url,
-                'key': API_KEY,
-                'strategy': strategy,
-                'category': ['PERFORMANCE', 'SEO', 'ACCESSIBILITY', 'BEST_PRACTICES']
-            },
-            timeout=30
+    previous = st.session_state.get('bulk_job')
+    if previous is not None:
+        previous.cancel()
+    st.session_state['bulk_job'] = bulk.BulkJob(urls, device, api_key, model, scaler, features,
+                                                workers=workers, on_result=history_recorder())
+
+def bulk_results(job):
+    """Progress and the live results table of a bulk job"""
+    import pandas as pd
+    import bulk
+    
+    progress = job.progress()
+    done, total = progress['done'], progress['total']
+    rate = done / progress['seconds'] if progress['seconds'] else 0
+    status = "Running" if progress['running'] else "Finished"
+    st.progress(done / total if total else 1.0,
+                text=f"{status}: {done}/{total} analyzed · {progress['failed']} failed · "
+                     f"{rate * 60:.0f}/min · {progress['seconds']:.0f} s")
+    
+    if progress['running'] and st.button("⏹️ Stop", key="bulk_stop"):
+        job.cancel()
+    
+    rows = [bulk.summary_row(result) for result in job.snapshot()]
+    if rows:
+        # Click a column header to sort
+        st.dataframe(
+            pd.DataFrame(rows),
+            hide_index=True,
+            use_container_width=True,
+            column_config={
+                'url': st.column_config.LinkColumn("URL"),
+                'confidence': st.column_config.NumberColumn("Confidence", format="percent"),
+                'seconds': st.column_config.NumberColumn("Seconds", format="%.1f")
+            }
         )
-        
-        if response.status_code == 200:
-            return response.json()
+    
+    if not progress['running'] and rows:
+        export_button(job.snapshot, f"pagespeed_bulk_{job.device}", key="bulk_export")
+    
+    # The job finished since this fragment started polling: one full
+    # rerun renders it again without the timer
+    if not progress['running'] and st.session_state.get('bulk_polling'):
+        st.session_state['bulk_polling'] = False
+        st.rerun()
+
+def bulk_page(device):
+    """Analyze a pasted or uploaded list of URLs in the background"""
+    import bulk
+    
+    st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+    st.markdown("## 📋 Bulk Analysis")
+    st.markdown(f"Paste URLs or upload a CSV (a `url` column, or one URL per line). "
+                f"Up to {bulk.MAX_URLS:,} unique URLs per run, analyzed for **{device.upper()}**.")
+    
+    job = st.session_state.get('bulk_job')
+    running = job is not None and job.running
+    
+    with st.form("bulk_form"):
+        text = st.text_area("🌐 URLs", height=160, placeholder="https://example.com\nhttps://example.org")
+        uploaded = st.file_uploader("📄 URL file", type=["csv", "txt"])
+        workers = st.slider("⚙️ Concurrent requests", 1, 16, bulk.DEFAULT_WORKERS)
+        submitted = st.form_submit_button("🚀 Analyze All", type="primary", disabled=running,
+                                          use_container_width=True)
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    if submitted:
+        urls = bulk.read_urls(text, [uploaded] if uploaded else [])
+        if not urls:
+            st.warning("⚠️ No URLs found. Paste one per line or upload a file.")
         else:
-            st.error(f"API Error: {response.status_code}")
-            if response.status_code == 429:
-                st.info("Rate limit exceeded. Try again in a few minutes.")
-            elif response.status_code == 400:
-                st.info("Invalid URL or API key. Check your input.")
-            return None
-            
-    except Exception as e:
-        st.error(f"Error fetching data: {e}")
-        return None
+            start_bulk_job(urls, device, workers)
+    
+    job = st.session_state.get('bulk_job')
+    if job is None:
+        return
+    
+    # While the job runs, only the results fragment reruns (every second)
+    st.session_state['bulk_polling'] = job.running
+    st.fragment(bulk_results, run_every=1 if job.running else None)(job)
+
+MAX_COMPARE = 5
+COMPARE_VITALS = [
+    ('largest_contentful_paint', "Largest Contentful Paint (ms)", '{:,.0f}'),
+    ('first_contentful_paint', "First Contentful Paint (ms)", '{:,.0f}'),
+    ('total_blocking_time', "Total Blocking Time (ms)", '{:,.0f}'),
+    ('cumulative_layout_shift', "Cumulative Layout Shift", '{:.3f}')
+]
+
+def site_label(url):
+    """Short legend name for a URL"""
+    return re.sub(r'^https?://(www\.)?', '', url).rstrip('/')
 
-def extract_metrics(api_data):
-    """Extract metrics from API response"""
-    if not api_data:
+def run_comparison(urls, device, timer):
+    """
+    Fetch every URL at once and score them in one model call; returns a
+    comparison dict or None
+    """
+    with timer.stage('model'):
+        model, scaler, features = load_ai_model()
+    if not (model and scaler and features):
+        st.error("❌ AI model unavailable. Please train the model first.")
         return None
     
-    try:
-        metrics = {}
-        categories = api_data['lighthouseResult']['categories']
-        
-        metrics['performance_score'] = categories.get('performance', {}).get('score', 0) * 100
-        metrics['seo_score'] = categories.get('seo', {}).get('score', 0) * 100
-        metrics['accessibility_score'] = categories.get('accessibility', {}).get('score', 0) * 100
-        metrics['best_practices_score'] = categories.get('best-practices', {}).get('score', 0) * 100
-        
-        audits = api_data['lighthouseResult']['audits']
-        
-        metrics['first_contentful_paint'] = audits.get('first-contentful-paint', {}).get('numericValue', 0)
-        metrics['largest_contentful_paint'] = audits.get('largest-contentful-paint', {}).get('numericValue', 0)
-        metrics['cumulative_layout_shift'] = audits.get('cumulative-layout-shift', {}).get('numericValue', 0)
-        metrics['total_blocking_time'] = audits.get('total-blocking-time', {}).get('numericValue', 0)
-        metrics['speed_index'] = audits.get('speed-index', {}).get('numericValue', 0)
-        metrics['time_to_interactive'] = audits.get('interactive', {}).get('numericValue', 0)
-        
-        total_bytes = audits.get('total-byte-weight', {}).get('numericValue', 0)
-        metrics['total_byte_weight'] = total_bytes / 1024
-        
-        metrics['meta_description_exists'] = 1 if audits.get('meta-description', {}).get('score', 0) == 1 else 0
-        
-        title_audit = audits.get('document-title', {})
-        if title_audit.get('details', {}).get('items'):
-            metrics['title_length'] = len(title_audit['details']['items'][0].get('title', ''))
-        else:
-            metrics['title_length'] = 0
-        
-        metrics['image_alt_exists'] = 1 if audits.get('image-alt', {}).get('score', 0) == 1 else 0
-        metrics['server_response_time'] = audits.get('server-response-time', {}).get('numericValue', 0)
-        
-        return metrics
-        
-    except Exception as e:
-        st.error(f"Error extracting metrics: {e}")
+    api_key = app_api_key()
+    if not api_key or api_key == "your_api_key_here":
+        st.error("⚠️ **API Key Not Set**")
+        st.info("Please add your Google PageSpeed API key to proceed")
         return None
+    
+    # Total latency is the slowest site's round trip, not the sum
+    cache = load_psi_cache()
+    cached = {url: cache.get((url, device)) for url in urls}
+    with timer.stage('fetch'):
+        fetched = analysis.fetch_metrics_many([url for url in urls if cached[url] is None],
+                                              device, api_key=api_key)
+    fetched = {entry['url']: entry for entry in fetched}
+    entries = []
+    for url in urls:
+        if cached[url] is not None:
+            entries.append({'url': url, 'metrics': cached[url], 'error': None, 'seconds': 0.0, 'cached': True})
+            continue
+        entries.append(fetched[url])
+        if fetched[url]['metrics']:
+            cache.put((url, device), fetched[url]['metrics'])
+    
+    analyzed_at = datetime.now()
+    for entry in entries:
+        entry.update(device=device, analyzed_at=analyzed_at, prediction=None, probabilities=None)
+    scored = [entry for entry in entries if entry['metrics']]
+    with timer.stage('predict'):
+        predictions = analysis.predict_batch(model, scaler, features,
+                                             [entry['metrics'] for entry in scored]) if scored else []
+    
+    record = history_recorder()
+    for entry, (prediction, probabilities) in zip(scored, predictions):
+        entry.update(prediction=prediction, probabilities=probabilities)
+        sample_analysis(entry['url'], device, entry['metrics'])
+        record(entry)
+    
+    return {
+        'device': device,
+        'entries': entries,
+        'analyzed_at': analyzed_at,
+        'timings': timer.timings
+    }
 
-def get_score_color(score):
-    """Get color class based on score"""
-    if score >= 90:
-        return "score-excellent"
-    elif score >= 75:
-        return "score-good"
-    elif score >= 50:
-        return "score-average"
-    else:
-        return "score-poor"
-
-def create_gauge_chart(value, title, max_value=100):
-    """Create a beautiful gauge chart"""
-    fig = go.Figure(go.Indicator(
-        mode="gauge+number+delta",
-        value=value,
-        title={'text': title, 'font': {'size': 24, 'color': 'white', 'family': 'Inter'}},
-        delta={'reference': 75, 'increasing': {'color': "#00ff88"}},
-        domain={'x': [0, 1], 'y': [0, 1]},
-        gauge={
-            'axis': {'range': [0, max_value], 'tickwidth': 2, 'tickcolor': "white"},
-            'bar': {'color': "#00ff88", 'thickness': 0.35},
-            'bgcolor': "rgba(255,255,255,0.1)",
-            'borderwidth': 3,
-            'bordercolor': "rgba(255,255,255,0.3)",
-            'steps': [
-                {'range': [0, 50], 'color': 'rgba(255, 107, 107, 0.3)'},
-                {'range': [50, 75], 'color': 'rgba(255, 215, 0, 0.3)'},
-                {'range': [75, 90], 'color': 'rgba(144, 238, 144, 0.3)'},
-                {'range': [90, 100], 'color': 'rgba(0, 255, 136, 0.3)'}
-            ],
-            'threshold': {
-                'line': {'color': "white", 'width': 5},
-                'thickness': 0.8,
-                'value': value
+@st.fragment
+def comparison_view(comparison):
+    """Overlaid scores, side-by-side Core Web Vitals and probabilities"""
+    import pandas as pd
+    import charts
+    
+    entries = comparison['entries']
+    for entry in entries:
+        if entry['error']:
+            st.warning(f"⚠️ {entry['url']}: {entry['error']}")
+    scored = [entry for entry in entries if entry['metrics']]
+    if not scored:
+        return
+    
+    timings = comparison['timings']
+    slowest = max(entry['seconds'] for entry in entries)
+    cached = sum(1 for entry in entries if entry.get('cached'))
+    st.caption(
+        f"⏱️ {len(entries) - cached} sites fetched in parallel in {timings.get('fetch', 0):.1f} s "
+        f"(slowest site {slowest:.1f} s)" + (f" · {cached} from cache" if cached else "")
+        + f" · one model call for all {len(scored)} · total {sum(timings.values()):.2f} s"
+    )
+    
+    names = [site_label(entry['url']) for entry in scored]
+    st.dataframe(
+        pd.DataFrame([
+            {
+                'site': name,
+                'prediction': entry['prediction'],
+                'confidence': max(entry['probabilities'].values()),
+                'performance': entry['metrics'].get('performance_score'),
+                'seo': entry['metrics'].get('seo_score'),
+                'accessibility': entry['metrics'].get('accessibility_score'),
+                'best_practices': entry['metrics'].get('best_practices_score')
             }
-        }
-    ))
-    
-    fig.update_layout(
-        height=300,
-        margin=dict(t=60, b=20, l=30, r=30),
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        font={'color': "white", 'family': "Inter", 'size': 16}
+            for name, entry in zip(names, scored)
+        ]),
+        hide_index=True,
+        use_container_width=True,
+        column_config={'confidence': st.column_config.NumberColumn("Confidence", format="percent")}
     )
     
-    return fig
-
-def create_radar_chart(metrics):
-    """Create an enhanced radar chart"""
-    categories = ['Performance', 'SEO', 'Accessibility', 'Best Practices']
-    values = [
-        metrics.get('performance_score', 0),
-        metrics.get('seo_score', 0),
-        metrics.get('accessibility_score', 0),
-        metrics.get('best_practices_score', 0)
-    ]
-    
-    fig = go.Figure()
-    
-    fig.add_trace(go.Scatterpolar(
-        r=values + [values[0]],
-        theta=categories + [categories[0]],
-        fill='toself',
-        fillcolor='rgba(102, 126, 234, 0.4)',
-        line=dict(color='#00ff88', width=4),
-        marker=dict(size=12, color='#00ff88', symbol='circle',
-                   line=dict(color='white', width=2)),
-        name='Current Score'
-    ))
-    
-    # Add target line at 90
-    target = [90, 90, 90, 90]
-    fig.add_trace(go.Scatterpolar(
-        r=target + [target[0]],
-        theta=categories + [categories[0]],
-        fill=None,
-        line=dict(color='rgba(255,255,255,0.5)', width=2, dash='dash'),
-        marker=dict(size=0),
-        name='Target (90)'
-    ))
-    
-    fig.update_layout(
-        polar=dict(
-            radialaxis=dict(
-                visible=True,
-                range=[0, 100],
-                tickfont=dict(color='white', size=12),
-                gridcolor='rgba(255,255,255,0.2)'
-            ),
-            angularaxis=dict(
-                tickfont=dict(color='white', size=14, family='Inter'),
-                gridcolor='rgba(255,255,255,0.2)'
-            ),
-            bgcolor='rgba(0,0,0,0)'
-        ),
-        showlegend=True,
-        legend=dict(font=dict(color='white', size=12)),
-        height=400,
-        margin=dict(t=40, b=40, l=40, r=40),
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)'
+    st.markdown("### 🎯 Scores")
+    st.plotly_chart(
+        charts.comparison_radar_chart([(name, entry['metrics']) for name, entry in zip(names, scored)]),
+        use_container_width=True
     )
     
-    return fig
-
-def get_recommendations(metrics, prediction):
-    """Get recommendations based on metrics"""
-    recommendations = []
-    
-    if metrics.get('first_contentful_paint', 0) > 1800:
-        recommendations.append({
-            'category': '⚡ Performance',
-            'title': 'Optimize First Contentful Paint',
-            'description': 'Reduce server response time and eliminate render-blocking resources to improve initial page load experience.',
-            'priority': 'High' if metrics['first_contentful_paint'] > 3000 else 'Medium',
-            'color': '#FF6B6B' if metrics['first_contentful_paint'] > 3000 else '#FFD700'
-        })
-    
-    if metrics.get('largest_contentful_paint', 0) > 2500:
-        recommendations.append({
-            'category': '🖼️ Performance',
-            'title': 'Improve Largest Contentful Paint',
-            'description': 'Optimize images using next-gen formats (WebP, AVIF), implement lazy loading, and use a CDN for faster delivery.',
-            'priority': 'High' if metrics['largest_contentful_paint'] > 4000 else 'Medium',
-            'color': '#FF6B6B' if metrics['largest_contentful_paint'] > 4000 else '#FFD700'
-        })
-    
-    if metrics.get('cumulative_layout_shift', 0) > 0.1:
-        recommendations.append({
-            'category': '📐 User Experience',
-            'title': 'Reduce Cumulative Layout Shift',
-            'description': 'Add explicit size attributes to images and videos, reserve space for dynamic content, and use CSS aspect-ratio.',
-            'priority': 'High' if metrics['cumulative_layout_shift'] > 0.25 else 'Medium',
-            'color': '#FF6B6B' if metrics['cumulative_layout_shift'] > 0.25 else '#FFD700'
-        })
-    
-    if metrics.get('meta_description_exists', 0) == 0:
-        recommendations.append({
-            'category': '🔍 SEO',
-            'title': 'Add Meta Description',
-            'description': 'Include a unique, compelling meta description (150-160 characters) to improve search engine visibility and CTR.',
-            'priority': 'Medium',
-            'color': '#FFD700'
-        })
-    
-    if metrics.get('total_byte_weight', 0) > 4000:
-        recommendations.append({
-            'category': '📦 Optimization',
-            'title': 'Reduce Total Page Size',
-            'description': 'Compress and optimize images, minify CSS/JS files, remove unused code, and enable Gzip/Brotli compression.',
-            'priority': 'Medium',
-            'color': '#FFD700'
-        })
-    
-    if prediction == 'Poor':
-        recommendations.append({
-            'category': '🚨 Critical',
-            'title': 'Urgent Performance Improvements Required',
-            'description': 'Your website needs immediate attention. Focus on Core Web Vitals, reduce page weight, and optimize critical resources.',
-            'priority': 'High',
-            'color': '#FF6B6B'
-        })
-    elif prediction == 'Needs Improvement':
-        recommendations.append({
-            'category': '📈 Enhancement',
-            'title': 'Performance Optimization Opportunities',
-            'description': 'Good foundation but room for improvement. Address specific metrics below threshold for better user experience.',
-            'priority': 'Medium',
-            'color': '#FFD700'
-        })
-    
-    return recommendations
-
-def display_analysis_results(metrics, prediction, probabilities, url, device):
-    """Display beautiful analysis results"""
+    st.markdown("### ⚡ Core Web Vitals")
+    for row in range(0, len(COMPARE_VITALS), 2):
+        for col, (metric, title, text_format) in zip(st.columns(2), COMPARE_VITALS[row:row + 2]):
+            with col:
+                st.plotly_chart(
+                    charts.comparison_bar_chart(
+                        names, [entry['metrics'].get(metric, 0) for entry in scored], title, text_format
+                    ),
+                    use_container_width=True
+                )
     
-    # Create tabs
-    tab1, tab2, tab3, tab4 = st.tabs([
-        "📊 Performance Dashboard", 
-        "🤖 AI Intelligence", 
-        "📈 Detailed Analytics", 
-        "💡 Action Plan"
-    ])
+    st.markdown("### 🤖 AI Prediction")
+    st.plotly_chart(
+        charts.comparison_probability_chart([(name, entry['probabilities'])
+                                             for name, entry in zip(names, scored)]),
+        use_container_width=True
+    )
     
-    with tab1:
-        st.markdown('<div class="glass-card">', unsafe_allow_html=True)
-        
-        # Header with site info
-        col1, col2 = st.columns([3, 1])
-        with col1:
-            st.markdown(f"### 🌐 Analysis Results")
-            st.markdown(f"**URL:** `{url}`")
-            st.markdown(f"**Device:** {device.upper()} 📱" if device == 'mobile' else f"**Device:** {device.upper()} 💻")
-        with col2:
-            st.markdown(f"**Analyzed:** {datetime.now().strftime('%H:%M:%S')}")
-        
-        st.markdown('</div>', unsafe_allow_html=True)
-        st.markdown("<br>", unsafe_allow_html=True)
-        
-        # Score cards
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            perf_score = metrics.get('performance_score', 0)
-            st.markdown(f"""
-            <div class="metric-card">
-                <h3>⚡ Performance</h3>
-                <div class="value {get_score_color(perf_score)}">{perf_score:.0f}</div>
-                <div class="label">Core Web Vitals</div>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col2:
-            seo_score = metrics.get('seo_score', 0)
-            st.markdown(f"""
-            <div class="metric-card">
-                <h3>🔍 SEO Score</h3>
-                <div class="value {get_score_color(seo_score)}">{seo_score:.0f}</div>
-                <div class="label">Search Optimization</div>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col3:
-            acc_score = metrics.get('accessibility_score', 0)
-            st.markdown(f"""
-            <div class="metric-card">
-                <h3>♿ Accessibility</h3>
-                <div class="value {get_score_color(acc_score)}">{acc_score:.0f}</div>
-                <div class="label">Inclusive Design</div>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col4:
-            bp_score = metrics.get('best_practices_score', 0)
-            st.markdown(f"""
-            <div class="metric-card">
-                <h3>🏆 Best Practices</h3>
-                <div class="value {get_score_color(bp_score)}">{bp_score:.0f}</div>
-                <div class="label">Web Standards</div>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        st.markdown("<br><br>", unsafe_allow_html=True)
-        
-        # Core Web Vitals
-        st.markdown('<div class="glass-card">', unsafe_allow_html=True)
-        st.markdown("### ⚡ Core Web Vitals Breakdown")
-        
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            fcp = metrics.get('first_contentful_paint', 0)
-            fcp_status = "✅ Good" if fcp < 1800 else "⚠️ Needs Work" if fcp < 3000 else "❌ Poor"
-            st.metric("First Contentful Paint", f"{fcp:.0f} ms", fcp_status)
-        
-        with col2:
-            lcp = metrics.get('largest_contentful_paint', 0)
-            lcp_status = "✅ Good" if lcp < 2500 else "⚠️ Needs Work" if lcp < 4000 else "❌ Poor"
-            st.metric("Largest Contentful Paint", f"{lcp:.0f} ms", lcp_status)
-        
-        with col3:
-            cls = metrics.get('cumulative_layout_shift', 0)
-            cls_status = "✅ Good" if cls < 0.1 else "⚠️ Needs Work" if cls < 0.25 else "❌ Poor"
-            st.metric("Cumulative Layout Shift", f"{cls:.3f}", cls_status)
-        
+    export_button(lambda: entries, "pagespeed_comparison", key="compare_export")
+
+def compare_page(device):
+    """Analyze a handful of sites side by side"""
+    st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+    st.markdown("## ⚖️ Compare Websites")
+    st.markdown(f"Enter 2 to {MAX_COMPARE} URLs, one per line. All of them are analyzed at once "
+                f"for **{device.upper()}**.")
+    
+    with st.form("compare_form"):
+        text = st.text_area("🌐 URLs", height=140,
+                            placeholder="https://example.com\nhttps://competitor.com")
+        submitted = st.form_submit_button("⚖️ Compare", type="primary", use_container_width=True)
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    if submitted:
+        urls = list(dict.fromkeys(analysis.normalize_url(line) for line in text.splitlines() if line.strip()))
+        if len(urls) < 2:
+            st.warning("⚠️ Enter at least two URLs to compare.")
+        else:
+            if len(urls) > MAX_COMPARE:
+                st.warning(f"⚠️ Comparing the first {MAX_COMPARE} of {len(urls)} URLs.")
+                urls = urls[:MAX_COMPARE]
+            with st.spinner(f"📡 Analyzing {len(urls)} sites in parallel..."):
+                timer = analysis.StageTimer(context=f"compare {len(urls)} [{device}]")
+                comparison = run_comparison(urls, device, timer)
+            if comparison is not None:
+                st.session_state['comparison'] = comparison
+    
+    comparison = st.session_state.get('comparison')
+    if comparison is not None:
+        comparison_view(comparison)
+
+HISTORY_RANGES = {"24 hours": 1, "7 days": 7, "30 days": 30, "1 year": 365, "All": None}
+SCORE_TRENDS = {
+    'performance_score': "Performance",
+    'seo_score': "SEO",
+    'accessibility_score': "Accessibility",
+    'best_practices_score': "Best Practices"
+}
+VITAL_TRENDS = {
+    'largest_contentful_paint': "Largest Contentful Paint (ms)",
+    'first_contentful_paint': "First Contentful Paint (ms)",
+    'total_blocking_time': "Total Blocking Time (ms)",
+    'speed_index': "Speed Index (ms)",
+    'server_response_time': "Server Response Time (ms)",
+    'cumulative_layout_shift': "Cumulative Layout Shift"
+}
+
+def history_page(device):
+    """Score and Core Web Vitals trends of previously analyzed URLs"""
+    import time
+    import pandas as pd
+    import charts
+    
+    st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+    st.markdown("## 📈 History")
+    
+    store = load_history()
+    urls = store.urls(device) if store is not None else []
+    if not urls:
+        st.info(f"No {device} analyses recorded yet. Analyze a URL to start its history.")
         st.markdown('</div>', unsafe_allow_html=True)
+        return
     
-    with tab2:
-        st.markdown('<div class="glass-card">', unsafe_allow_html=True)
-        st.markdown("## 🤖 AI-Powered Performance Analysis")
-        
-        col1, col2 = st.columns([1, 2])
-        
-        with col1:
-            # Prediction display
-            pred_colors = {
-                'Excellent': '#00ff88',
-                'Good': '#90EE90',
-                'Needs Improvement': '#FFD700',
-                'Poor': '#FF6B6B'
-            }
-            
-            st.markdown(f"""
-            <div style="background: linear-gradient(135deg, rgba(102,126,234,0.3), rgba(118,75,162,0.3)); 
-                        padding: 3rem 2rem; border-radius: 25px; text-align: center;
-                        border: 2px solid rgba(255,255,255,0.3); box-shadow: 0 20px 40px rgba(0,0,0,0.3);">
-                <div style="font-size: 1.3rem; color: rgba(255,255,255,0.9); margin-bottom: 1rem; 
-                           text-transform: uppercase; letter-spacing: 2px; font-weight: 600;">
-                    🎯 AI Prediction
-                </div>
-                <div style="font-size: 3.5rem; font-weight: 900; margin: 2rem 0; 
-                           color: {pred_colors.get(prediction, 'white')}; 
-                           text-shadow: 0 0 30px {pred_colors.get(prediction, 'white')};">
-                    {prediction}
-                </div>
-                <div style="font-size: 1.5rem; color: white; font-weight: 600;">
-                    Confidence: {max(probabilities.values())*100:.1f}%
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            st.markdown("<br>", unsafe_allow_html=True)
-            st.plotly_chart(create_radar_chart(metrics), use_container_width=True)
-        
-        with col2:
-            # Probability bars
-            st.markdown("### 📊 Prediction Confidence Distribution")
-            
-            categories = list(probabilities.keys())
-            values = list(probabilities.values())
-            
-            fig = px.bar(
-                x=categories,
-                y=values,
-                color=values,
-                color_continuous_scale=[[0, '#FF6B6B'], [0.5, '#FFD700'], [0.75, '#90EE90'], [1, '#00ff88']],
-                labels={'x': '', 'y': 'Probability'},
-                text=[f'{v:.1%}' for v in values]
-            )
-            
-            fig.update_traces(
-                textposition='outside',
-                textfont=dict(size=16, color='white', family='Inter', weight='bold'),
-                marker=dict(line=dict(width=3, color='rgba(255,255,255,0.5)'))
-            )
-            
-            fig.update_layout(
-                showlegend=False,
-                yaxis=dict(
-                    tickformat=".0%", 
-                    range=[0, 1],
-                    gridcolor='rgba(255,255,255,0.2)',
-                    tickfont=dict(color='white', size=12)
-                ),
-                xaxis=dict(tickfont=dict(color='white', size=13, family='Inter')),
-                height=350,
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)'
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
-            
-            # AI Insights
-            st.markdown("### 🧠 Intelligence Report")
-            
-            insights = {
-                'Poor': "🚨 **CRITICAL ALERT** - Your website requires immediate optimization. Performance issues are severely impacting user experience and likely affecting conversion rates and SEO rankings. Prioritize Core Web Vitals improvements.",
-                'Needs Improvement': "📈 **OPTIMIZATION NEEDED** - Your website has a solid foundation but significant room for improvement. Focus on addressing specific bottlenecks to enhance user experience and search rankings.",
-                'Good': "✅ **GOOD PERFORMANCE** - Your website is performing well! Minor optimizations can push you into excellent territory. Continue monitoring and maintain current standards.",
-                'Excellent': "🏆 **OUTSTANDING** - Exceptional performance! Your website delivers an excellent user experience. Keep monitoring metrics and stay current with best practices to maintain this high standard."
+    url = st.selectbox("🌐 Website", urls)
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        window = st.radio("📅 Range", list(HISTORY_RANGES), index=2, horizontal=True)
+    with col2:
+        vital = st.selectbox("⚡ Core Web Vital", list(VITAL_TRENDS),
+                             format_func=VITAL_TRENDS.get)
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Downsampled in SQLite: at most a few hundred points for any range
+    days = HISTORY_RANGES[window]
+    end = time.time() if days else None
+    start = end - days * 86400 if days else None
+    points = store.trend(url, device, start, end, metrics=[*SCORE_TRENDS, vital], max_points=300)
+    if not points:
+        st.info(f"No analyses of {url} in the last {window}.")
+        return
+    
+    st.caption(f"{sum(point['n'] for point in points)} analyses · {len(points)} points")
+    st.plotly_chart(charts.trend_chart(points, list(SCORE_TRENDS), SCORE_TRENDS, y_range=(0, 100)),
+                    use_container_width=True)
+    st.plotly_chart(charts.trend_chart(points, [vital], VITAL_TRENDS), use_container_width=True)
+    
+    st.markdown("### 🕒 Latest Analyses")
+    st.dataframe(
+        pd.DataFrame([
+            {
+                'analyzed': datetime.fromtimestamp(row['timestamp']),
+                'prediction': row['prediction'],
+                'confidence': row['confidence'],
+                'performance': row['metrics'].get('performance_score'),
+                'lcp_ms': row['metrics'].get('largest_contentful_paint'),
+                'cls': row['metrics'].get('cumulative_layout_shift'),
+                'model': row['model_version']
             }
-            
-            st.info(insights.get(prediction, "Analysis complete."))
-        
-        st.markdown('</div>', unsafe_allow_html=True)
+            for row in store.recent(url, device, limit=20)
+        ]),
+        hide_index=True,
+        use_container_width=True,
+        column_config={'confidence': st.column_config.NumberColumn("Confidence", format="percent")}
+    )
     
-    with tab3:
-        st.markdown('<div class="glass-card">', unsafe_allow_html=True)
-        st.markdown("## 📈 Comprehensive Metrics Analysis")
-        
-        # Gauge charts
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.plotly_chart(
-                create_gauge_chart(metrics.get('performance_score', 0), "⚡ Performance Score"),
-                use_container_width=True
-            )
-        
-        with col2:
-            st.plotly_chart(
-                create_gauge_chart(metrics.get('seo_score', 0), "🔍 SEO Score"),
-                use_container_width=True
-            )
-        
-        st.markdown('</div>', unsafe_allow_html=True)
-        st.markdown("<br>", unsafe_allow_html=True)
-        
-        # Additional metrics in a grid
-        st.markdown('<div class="glass-card">', unsafe_allow_html=True)
-        st.markdown("### 📊 Performance Metrics Grid")
-        
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            st.metric("⏱️ Total Blocking Time", f"{metrics.get('total_blocking_time', 0):.0f} ms")
-            st.metric("🚀 Speed Index", f"{metrics.get('speed_index', 0):.0f}")
-        
-        with col2:
-            st.metric("⚡ Time to Interactive", f"{metrics.get('time_to_interactive', 0):.0f} ms")
-            st.metric("📦 Total Page Size", f"{metrics.get('total_byte_weight', 0)/1024:.2f} MB")
-        
-        with col3:
-            st.metric("🖥️ Server Response", f"{metrics.get('server_response_time', 0):.0f} ms")
-            meta_status = "✅ Present" if metrics.get('meta_description_exists', 0) else "❌ Missing"
-            st.metric("📝 Meta Description", meta_status)
-        
-        st.markdown('</div>', unsafe_allow_html=True)
+    # Every analysis in the range, streamed from SQLite when clicked
+    export_button(lambda: store.analyses(url, device, start, end),
+                  f"pagespeed_history_{site_label(url)}_{device}", key="history_export")
+
+def run_analysis(url, device, timer):
+    """Fetch, extract and predict one URL; returns a result dict or None"""
+    cache = load_psi_cache()
+    metrics = cache.get((url, device))
+    cached = metrics is not None
     
-    with tab4:
-        st.markdown('<div class="glass-card">', unsafe_allow_html=True)
-        st.markdown("## 💡 Personalized Action Plan")
-        
-        recommendations = get_recommendations(metrics, prediction)
-        
-        if recommendations:
-            st.markdown(f"### Found {len(recommendations)} optimization opportunities")
-            st.markdown("<br>", unsafe_allow_html=True)
-            
-            for i, rec in enumerate(recommendations, 1):
-                st.markdown(f"""
-                <div class="recommendation-card" style="border-left-color: {rec['color']};">
-                    <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 1rem;">
-                        <h4 style="margin: 0; font-size: 1.3rem;">{i}. {rec['title']}</h4>
-                        <span class="priority-badge" style="background: {rec['color']};">
-                            {rec['priority']} Priority
-                        </span>
-                    </div>
-                    <div style="color: rgba(255,255,255,0.8); font-size: 0.95rem; margin-bottom: 0.5rem; font-weight: 600;">
-                        {rec['category']}
-                    </div>
-                    <p style="margin: 0; color: rgba(255,255,255,0.95); line-height: 1.8; font-size: 1.05rem;">
-                        {rec['description']}
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
-        else:
-            st.success("🎉 **Perfect!** No critical issues detected. Your website is performing excellently!")
-        
-        st.markdown("<br>", unsafe_allow_html=True)
-        
-        # Implementation guide
-        st.markdown("### 📋 Implementation Roadmap")
+    if not cached:
+        with timer.stage('fetch'):
+            api_data = get_pagespeed_data(url, device)
         
-        roadmap = """
-        **Phase 1: Critical Fixes (Week 1)**
-        - Address all HIGH priority items immediately
-        - Focus on Core Web Vitals that are in the red zone
-        - Implement quick wins like image compression
-        
-        **Phase 2: Performance Optimization (Week 2-3)**
-        - Tackle MEDIUM priority recommendations
-        - Optimize resource loading and caching
-        - Implement lazy loading for images and videos
+        if not api_data:
+            st.error("❌ Unable to fetch data. Please verify the URL and try again.")
+            return None
         
-        **Phase 3: Fine-tuning (Week 4)**
-        - Address remaining LOW priority items
-        - Run A/B tests to measure impact
-        - Set up continuous monitoring
+        with timer.stage('extract'):
+            metrics = extract_metrics(api_data)
+        # Only the metrics are kept: the Lighthouse payload is often several MB
+        del api_data
         
-        **Phase 4: Maintenance (Ongoing)**
-        - Weekly performance checks using this tool
-        - Monitor real user metrics (RUM)
-        - Stay updated with web performance best practices
-        """
+        if not metrics:
+            st.error("❌ Metric extraction failed. Please try again.")
+            return None
         
-        st.markdown(roadmap)
+        cache.put((url, device), metrics)
+    
+    sample_analysis(url, device, metrics)
+    
+    with timer.stage('model'):
+        model, scaler, features = load_ai_model()
+        attributor = load_attributor() if model is not None else None
+    
+    if not (model and scaler and features):
+        st.error("❌ AI model unavailable. Please train the model first.")
+        return None
+    
+    with timer.stage('predict'):
+        prediction, probabilities = analysis.predict_batch(model, scaler, features, [metrics])[0]
+        
+        attributions = None
+        if attributor is not None:
+            attributions = analysis.explain_batch(attributor, scaler, features, [metrics], [prediction])[0]
+    
+    result = {
+        'url': url,
+        'device': device,
+        'metrics': metrics,
+        'prediction': prediction,
+        'probabilities': probabilities,
+        'attributions': attributions,
+        'analyzed_at': datetime.now(),
+        # Same dict the timer fills, so the render stage lands here too
+        'timings': timer.timings,
+        'cached': cached
+    }
+    history_recorder()(result)
+    return result
+
+@st.fragment
+def report_section(result):
+    """Download button for the text report of one result"""
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col2:
+        report = f"""
+# PageSpeed AI Analysis Report - Pro Edition
+
+**Website:** {result['url']}
+**Device:** {result['device'].upper()}
+**Analyzed:** {result['analyzed_at'].strftime('%Y-%m-%d %H:%M:%S')}
+
+## 📊 Performance Scores
+
+- ⚡ Performance: {result['metrics'].get('performance_score', 0):.1f}/100
+- 🔍 SEO: {result['metrics'].get('seo_score', 0):.1f}/100  
+- ♿ Accessibility: {result['metrics'].get('accessibility_score', 0):.1f}/100
+- 🏆 Best Practices: {result['metrics'].get('best_practices_score', 0):.1f}/100
+
+## 🤖 AI Prediction
+
+- Category: {result['prediction']}
+- Confidence: {max(result['probabilities'].values())*100:.1f}%
+
+## ⚡ Core Web Vitals
+
+- First Contentful Paint: {result['metrics'].get('first_contentful_paint', 0):.0f} ms
+- Largest Contentful Paint: {result['metrics'].get('largest_contentful_paint', 0):.0f} ms
+- Cumulative Layout Shift: {result['metrics'].get('cumulative_layout_shift', 0):.3f}
+
+## 💡 Recommendations
+
+{len(get_recommendations(result['metrics'], result['prediction']))} optimization opportunities identified
+
+---
+Generated by PageSpeed AI Analyzer Pro
+"""
         
-        st.markdown('</div>', unsafe_allow_html=True)
+        st.download_button(
+            label="📥 Download Full Report",
+            data=report,
+            file_name=f"pagespeed_pro_report_{result['url'].replace('https://', '').replace('http://', '').replace('/', '_')[:50]}.txt",
+            mime="text/plain",
+            on_click="ignore",
+            use_container_width=True
+        )
+
+def keep_result(results, key, result=None):
+    """
+    Store (or, without result, mark as viewed) one of this session's
+    results; beyond MAX_SESSION_RESULTS the least recently viewed is dropped
+    """
+    result = results.pop(key) if result is None else result
+    results.pop(key, None)
+    results[key] = result
+    while len(results) > MAX_SESSION_RESULTS:
+        results.pop(next(iter(results)))
+
+def usage_readout():
+    """Process memory, the shared PSI cache and this session's share"""
+    import budget
+    
+    psi = load_psi_cache().stats()
+    lookups = psi['hits'] + psi['misses']
+    results = st.session_state.get('results', {})
+    job = st.session_state.get('bulk_job')
+    bulk_results = job.snapshot() if job is not None else []
+    session_bytes = budget.approx_size([list(results.values()), bulk_results,
+                                        st.session_state.get('comparison')])
+    
+    size = budget.format_bytes
+    st.markdown(f"""
+    - **Server process:** {size(budget.process_rss())}
+    - **PSI cache (all sessions):** {psi['entries']} URLs · {size(psi['bytes'])} of {size(psi['max_bytes'])}
+      · {psi['hits'] / lookups if lookups else 0:.0%} hits · {psi['evictions']} evicted
+    - **This session:** {len(results)} of {MAX_SESSION_RESULTS} results kept · {len(bulk_results)} bulk rows
+      · {size(session_bytes)}
+    """)
+
+def show_result(result, timer=None):
+    """Render a stored result; timer times the render of a fresh analysis"""
+    st.success(f"✅ Successfully analyzed **{result['url']}** on **{result['device'].upper()}**")
+    timings_slot = st.empty()
+    st.markdown("<br>", unsafe_allow_html=True)
+    
+    # Display results
+    with timer.stage('render') if timer else nullcontext():
+        display_analysis_results(result['metrics'], result['prediction'], result['probabilities'],
+                                 result['url'], result['device'], result['attributions'],
+                                 result['analyzed_at'])
+    
+    timings = result['timings']
+    timings_slot.caption(
+        "⏱️ " + " · ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in timings.items())
+        + f" · total {sum(timings.values()):.2f} s"
+    )
+    
+    # Download report
+    st.markdown("<br><br>", unsafe_allow_html=True)
+    report_section(result)
 
 def main():
     """Main application function"""
@@ -1418,12 +1042,18 @@ def main():
         
         st.markdown("<br>", unsafe_allow_html=True)
         
+        # Mode selection
+        mode = st.radio("🧭 Mode", MODES, horizontal=True)
+        
+        url, analyze_button = "", False
+        
         # URL input
-        url = st.text_input(
-            "🌐 Website URL",
-            placeholder="https://example.com",
-            help="Enter the complete URL including http:// or https://"
-        )
+        if mode == SINGLE_MODE:
+            url = st.text_input(
+                "🌐 Website URL",
+                placeholder="https://example.com",
+                help="Enter the complete URL including http:// or https://"
+            )
         
         # Device selection
         device = st.radio(
@@ -1434,11 +1064,12 @@ def main():
         )
         
         # Analysis button
-        analyze_button = st.button(
-            "🚀 Start Analysis",
-            type="primary",
-            use_container_width=True
-        )
+        if mode == SINGLE_MODE:
+            analyze_button = st.button(
+                "🚀 Start Analysis",
+                type="primary",
+                use_container_width=True
+            )
         
         st.markdown("<br>", unsafe_allow_html=True)
         st.divider()
@@ -1468,6 +1099,9 @@ def main():
         
         st.markdown(status_html, unsafe_allow_html=True)
         
+        with st.expander("🧮 Memory Usage"):
+            usage_readout()
+        
         st.divider()
         
         # Quick info
@@ -1495,8 +1129,34 @@ def main():
             Built with Streamlit, Scikit-learn & Plotly
             """)
     
+    if mode == COMPARE_MODE:
+        compare_page(device)
+        return
+    
+    if mode == BULK_MODE:
+        bulk_page(device)
+        return
+    
+    if mode == HISTORY_MODE:
+        history_page(device)
+        return
+    
+    # Results of this session, keyed by (url, device), survive reruns
+    results = st.session_state.setdefault('results', {})
+    
+    # Check for quick analysis
+    if 'quick_url' in st.session_state:
+        url = st.session_state.pop('quick_url')
+        analyze_button = True
+    
+    key = (analysis.normalize_url(url), device) if url else None
+    if key in results:
+        keep_result(results, key)
+        st.session_state['current'] = key
+    result = results.get(st.session_state.get('current'))
+    
     # Main content
-    if not url:
+    if not url and result is None:
         # Welcome screen with feature showcase
         st.markdown('<div class="glass-card">', unsafe_allow_html=True)
         
@@ -1560,118 +1220,33 @@ def main():
         
         return
     
-    # Check for quick analysis
-    if 'quick_url' in st.session_state:
-        url = st.session_state['quick_url']
-        del st.session_state['quick_url']
-        analyze_button = True
-    
     # Perform analysis
-    if analyze_button and url:
-        if not url.startswith(('http://', 'https://')):
-            url = 'https://' + url
-        
-        # Animated progress
+    if analyze_button and key:
+        # Progress follows the stage events of the real work
         progress_bar = st.progress(0)
         status_text = st.empty()
         
-        # Step 1
-        status_text.markdown("### 📡 Connecting to PageSpeed Insights...")
-        progress_bar.progress(25)
-        time.sleep(0.5)
-        
-        api_data = get_pagespeed_data(url, device)
-        
-        if not api_data:
-            st.error("❌ Unable to fetch data. Please verify the URL and try again.")
-            return
-        
-        # Step 2
-        status_text.markdown("### 🔧 Processing Performance Metrics...")
-        progress_bar.progress(50)
-        time.sleep(0.5)
-        
-        metrics = extract_metrics(api_data)
-        
-        if not metrics:
-            st.error("❌ Metric extraction failed. Please try again.")
-            return
+        def show_progress(event):
+            if event['event'] == 'start':
+                status_text.markdown(f"### {event['label']}")
+                progress_bar.progress(min(1.0, event['index'] / event['total']))
+            else:
+                progress_bar.progress(min(1.0, (event['index'] + 1) / event['total']))
         
-        # Step 3
-        status_text.markdown("### 🤖 Running AI Analysis...")
-        progress_bar.progress(75)
-        time.sleep(0.5)
+        timer = analysis.StageTimer(on_event=show_progress, context=f"{key[0]} [{key[1]}]")
+        result = run_analysis(*key, timer)
         
-        model, scaler, features = load_ai_model()
+        if result is not None:
+            keep_result(results, key, result)
+            st.session_state['current'] = key
+            show_result(result, timer)
         
-        if model and scaler and features:
-            feature_values = [metrics.get(feature, 0) for feature in features]
-            features_scaled = scaler.transform([feature_values])
-            
-            prediction = model.predict(features_scaled)[0]
-            probabilities_raw = model.predict_proba(features_scaled)[0]
-            probabilities = dict(zip(model.classes_, probabilities_raw))
-            
-            status_text.markdown("### ✅ Analysis Complete!")
-            progress_bar.progress(100)
-            time.sleep(0.8)
-            
-            progress_bar.empty()
-            status_text.empty()
-            
-            # Success message
-            st.success(f"✅ Successfully analyzed **{url}** on **{device.upper()}**")
-            st.markdown("<br>", unsafe_allow_html=True)
-            
-            # Display results
-            display_analysis_results(metrics, prediction, probabilities, url, device)
-            
-            # Download report
-            st.markdown("<br><br>", unsafe_allow_html=True)
-            col1, col2, col3 = st.columns([1, 2, 1])
-            with col2:
-                report = f"""
-# PageSpeed AI Analysis Report - Pro Edition
-
-**Website:** {url}
-**Device:** {device.upper()}
-**Analyzed:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-## 📊 Performance Scores
-
-- ⚡ Performance: {metrics.get('performance_score', 0):.1f}/100
-- 🔍 SEO: {metrics.get('seo_score', 0):.1f}/100  
-- ♿ Accessibility: {metrics.get('accessibility_score', 0):.1f}/100
-- 🏆 Best Practices: {metrics.get('best_practices_score', 0):.1f}/100
-
-## 🤖 AI Prediction
-
-- Category: {prediction}
-- Confidence: {max(probabilities.values())*100:.1f}%
-
-## ⚡ Core Web Vitals
-
-- First Contentful Paint: {metrics.get('first_contentful_paint', 0):.0f} ms
-- Largest Contentful Paint: {metrics.get('largest_contentful_paint', 0):.0f} ms
-- Cumulative Layout Shift: {metrics.get('cumulative_layout_shift', 0):.3f}
-
-## 💡 Recommendations
-
-{len(get_recommendations(metrics, prediction))} optimization opportunities identified
-
----
-Generated by PageSpeed AI Analyzer Pro
-"""
-                
-                st.download_button(
-                    label="📥 Download Full Report",
-                    data=report,
-                    file_name=f"pagespeed_pro_report_{url.replace('https://', '').replace('http://', '').replace('/', '_')[:50]}.txt",
-                    mime="text/plain",
-                    use_container_width=True
-                )
-        else:
-            st.error("❌ AI model unavailable. Please train the model first.")
+        progress_bar.empty()
+        status_text.empty()
+        return
+    
+    if result is not None:
+        show_result(result)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,114 @@
+"""
+Memory accounting for long-running processes such as the web app.
+
+ByteBudgetCache is a thread-safe LRU cache capped by the approximate size
+of its values rather than by entry count. It is shared by every session,
+so however many users are active the cache never holds more than its byte
+budget: the least recently used entries are evicted first, and entries
+older than the TTL are dropped when they are next read.
+
+Sizes are estimated from the pickled value, which is cheap for the small
+dicts cached here and close enough for budgeting.
+
+Nothing in this module imports Streamlit.
+"""
+
+import os
+import pickle
+import resource
+import threading
+import time
+from collections import OrderedDict
+
+
+def approx_size(value):
+    """Approximate size of a value in bytes (its pickled length)"""
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return len(repr(value))
+
+
+def format_bytes(n):
+    """Human readable size, e.g. '3.2 MB'"""
+    for unit in ("B", "KB", "MB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GB"
+
+
+def process_rss():
+    """Resident memory of this process in bytes (peak RSS where /proc is unavailable)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # kilobytes on Linux, bytes on macOS
+        return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+class ByteBudgetCache:
+    """LRU cache holding at most max_bytes of values, each for at most ttl seconds"""
+
+    def __init__(self, max_bytes, ttl=None, sizeof=approx_size):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sizeof = sizeof
+        self.lock = threading.Lock()
+        # key -> (value, size, stored at)
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry[2] > self.ttl:
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        """Store value, evicting the least recently used entries to fit; returns False if it can never fit"""
+        size = self.sizeof(value)
+        with self.lock:
+            if key in self.entries:
+                self._remove(key)
+            if size > self.max_bytes:
+                return False
+            while self.bytes + size > self.max_bytes:
+                self._remove(next(iter(self.entries)))
+                self.evictions += 1
+            self.entries[key] = (value, size, time.monotonic())
+            self.bytes += size
+            return True
+
+    def _remove(self, key):
+        _, size, _ = self.entries.pop(key)
+        self.bytes -= size
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        """{'entries', 'bytes', 'max_bytes', 'hits', 'misses', 'evictions'}"""
+        with self.lock:
+            return {
+                'entries': len(self.entries),
+                'bytes': self.bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
@@ -0,0 +1,164 @@
+"""
+Bulk analysis: score many URLs concurrently in the background.
+
+A BulkJob runs on its own threads, so the web app only polls it for
+progress. At most `workers` PageSpeed requests are in flight and only
+twice that many URLs are queued at a time. Each Lighthouse response is
+reduced to its metrics as soon as it arrives, and each URL keeps only a
+small result dict. Memory therefore grows with the number of URLs, which
+read_urls caps at MAX_URLS, and not with the size of the PSI payloads.
+
+Requests go through collector.Collector, so they share its retry and
+backoff for throttling and server errors and its token-bucket pacing.
+
+Nothing in this module imports Streamlit.
+"""
+
+import io
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import analysis
+import collector
+
+MAX_URLS = 5000
+DEFAULT_WORKERS = 4
+
+
+def read_urls(text='', files=(), limit=MAX_URLS):
+    """
+    Unique, normalized URLs from pasted text (one per line) and uploaded
+    files (a CSV with a `url` column, or one URL per line), at most `limit`.
+    """
+    sources = [io.StringIO(text or '')]
+    sources += [io.StringIO(f.getvalue().decode('utf-8', errors='replace')) for f in files]
+    return [url for url, _ in itertools.islice(collector.read_seeds(sources), limit)]
+
+
+def summary_row(result):
+    """Flat table row for one result dict"""
+    metrics = result.get('metrics') or {}
+    probabilities = result.get('probabilities') or {}
+    return {
+        'url': result['url'],
+        'device': result['device'],
+        'prediction': result.get('prediction'),
+        'confidence': max(probabilities.values()) if probabilities else None,
+        'performance': metrics.get('performance_score'),
+        'seo': metrics.get('seo_score'),
+        'accessibility': metrics.get('accessibility_score'),
+        'best_practices': metrics.get('best_practices_score'),
+        'lcp_ms': metrics.get('largest_contentful_paint'),
+        'cls': metrics.get('cumulative_layout_shift'),
+        'tbt_ms': metrics.get('total_blocking_time'),
+        'seconds': sum(result['timings'].values()) if result.get('timings') else None,
+        'error': result.get('error')
+    }
+
+
+class BulkJob:
+    """
+    Analyze a list of URLs for one device on a background thread pool.
+    on_result, if given, is called with every result dict from a worker thread.
+    """
+
+    def __init__(self, urls, device, api_key, model, scaler, features,
+                 workers=DEFAULT_WORKERS, limiter=None, on_result=None):
+        self.urls = list(urls)
+        self.device = device
+        self.model = model
+        self.scaler = scaler
+        self.features = features
+        self.workers = workers
+        self.on_result = on_result
+        self.client = collector.Collector(
+            api_key=api_key, workers=workers,
+            limiter=limiter or collector.RateLimiter(daily_quota=0)
+        )
+        self.results = []
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.seconds = None
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @property
+    def running(self):
+        return self._thread.is_alive()
+
+    def _analyze(self, url):
+        timer = analysis.StageTimer(context=f"{url} [{self.device}]")
+        result = {
+            'url': url,
+            'device': self.device,
+            'metrics': None,
+            'prediction': None,
+            'probabilities': None,
+            'analyzed_at': datetime.now(),
+            'timings': timer.timings,
+            'error': None
+        }
+        try:
+            with timer.stage('fetch'):
+                api_data = self.client.fetch_json(url, self.device)
+            with timer.stage('extract'):
+                result['metrics'] = analysis.extract_metrics(api_data)
+            # Drop the Lighthouse payload before the (cheap) prediction
+            del api_data
+            with timer.stage('predict'):
+                result['prediction'], result['probabilities'] = analysis.predict_batch(
+                    self.model, self.scaler, self.features, [result['metrics']]
+                )[0]
+        except collector.QuotaExceeded:
+            # Only raised once the job is cancelled (the limiter has no daily cap)
+            return
+        except Exception as e:
+            result['error'] = str(e) or type(e).__name__
+
+        with self.lock:
+            self.results.append(result)
+        if self.on_result is not None:
+            try:
+                self.on_result(result)
+            except Exception:
+                # A failing consumer (e.g. the history store) must not stop the job
+                pass
+
+    def _run(self):
+        # Bounded queue: URLs are submitted only as earlier ones finish
+        slots = threading.BoundedSemaphore(self.workers * 2)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for url in self.urls:
+                slots.acquire()
+                if self._cancelled.is_set():
+                    break
+                future = pool.submit(self._analyze, url)
+                future.add_done_callback(lambda _: slots.release())
+        self.seconds = time.perf_counter() - self.started
+
+    def cancel(self):
+        """Stop submitting URLs and abort requests that are waiting to retry"""
+        self._cancelled.set()
+        self.client.stop()
+
+    def progress(self):
+        """{'total', 'done', 'failed', 'running', 'seconds'}"""
+        with self.lock:
+            done = len(self.results)
+            failed = sum(1 for result in self.results if result['error'])
+        return {
+            'total': len(self.urls),
+            'done': done,
+            'failed': failed,
+            'running': self.running,
+            'seconds': self.seconds if self.seconds is not None else time.perf_counter() - self.started
+        }
+
+    def snapshot(self):
+        """Copy of the results finished so far, in completion order"""
+        with self.lock:
+            return list(self.results)
@@ -0,0 +1,342 @@
+"""
+Plotly figures for analysis results, built from cached templates.
+
+Each chart's layout, styling and trace skeleton is built and validated
+once per process and kept as a plain dict. A render only deep-copies that
+dict, fills in the data values and wraps it in a Figure, instead of
+rebuilding the whole figure from keyword arguments every time.
+
+All charts use CHART_TEMPLATE, a small dark-theme template, in place of
+plotly's default one, which would otherwise be serialized into every
+chart sent to the browser (about 7 KB per chart).
+
+Nothing in this module imports Streamlit.
+"""
+
+import copy
+from datetime import datetime
+from functools import lru_cache
+
+import plotly.graph_objects as go
+
+WHITE_GRID = 'rgba(255,255,255,0.2)'
+TRANSPARENT = 'rgba(0,0,0,0)'
+
+CHART_TEMPLATE = go.layout.Template(layout=dict(
+    paper_bgcolor=TRANSPARENT,
+    plot_bgcolor=TRANSPARENT,
+    font={'color': "white", 'family': "Inter"}
+))
+
+PROBABILITY_COLORSCALE = [[0, '#FF6B6B'], [0.5, '#FFD700'], [0.75, '#90EE90'], [1, '#00ff88']]
+RADAR_CATEGORIES = ['Performance', 'SEO', 'Accessibility', 'Best Practices']
+RADAR_METRICS = ['performance_score', 'seo_score', 'accessibility_score', 'best_practices_score']
+# One color per compared site, in input order
+SITE_COLORS = ['#00ff88', '#667eea', '#FFD700', '#FF6B6B', '#4FC3F7']
+
+
+def _closed(values):
+    """Repeat the first point so a polar trace closes its loop"""
+    return list(values) + [values[0]]
+
+
+@lru_cache(maxsize=None)
+def _gauge_template(max_value):
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number+delta",
+        value=0,
+        title={'text': "", 'font': {'size': 24, 'color': 'white', 'family': 'Inter'}},
+        delta={'reference': 75, 'increasing': {'color': "#00ff88"}},
+        domain={'x': [0, 1], 'y': [0, 1]},
+        gauge={
+            'axis': {'range': [0, max_value], 'tickwidth': 2, 'tickcolor': "white"},
+            'bar': {'color': "#00ff88", 'thickness': 0.35},
+            'bgcolor': "rgba(255,255,255,0.1)",
+            'borderwidth': 3,
+            'bordercolor': "rgba(255,255,255,0.3)",
+            'steps': [
+                {'range': [0, 50], 'color': 'rgba(255, 107, 107, 0.3)'},
+                {'range': [50, 75], 'color': 'rgba(255, 215, 0, 0.3)'},
+                {'range': [75, 90], 'color': 'rgba(144, 238, 144, 0.3)'},
+                {'range': [90, 100], 'color': 'rgba(0, 255, 136, 0.3)'}
+            ],
+            'threshold': {
+                'line': {'color': "white", 'width': 5},
+                'thickness': 0.8,
+                'value': 0
+            }
+        }
+    ))
+    fig.update_layout(
+        template=CHART_TEMPLATE,
+        height=300,
+        margin=dict(t=60, b=20, l=30, r=30),
+        font={'size': 16}
+    )
+    return fig.to_dict()
+
+
+@lru_cache(maxsize=None)
+def _radar_template():
+    fig = go.Figure()
+    fig.add_trace(go.Scatterpolar(
+        r=[],
+        theta=_closed(RADAR_CATEGORIES),
+        fill='toself',
+        fillcolor='rgba(102, 126, 234, 0.4)',
+        line=dict(color='#00ff88', width=4),
+        marker=dict(size=12, color='#00ff88', symbol='circle',
+                    line=dict(color='white', width=2)),
+        name='Current Score'
+    ))
+    # Target line at 90
+    fig.add_trace(go.Scatterpolar(
+        r=_closed([90] * len(RADAR_CATEGORIES)),
+        theta=_closed(RADAR_CATEGORIES),
+        fill=None,
+        line=dict(color='rgba(255,255,255,0.5)', width=2, dash='dash'),
+        marker=dict(size=0),
+        name='Target (90)'
+    ))
+    fig.update_layout(
+        template=CHART_TEMPLATE,
+        polar=dict(
+            radialaxis=dict(
+                visible=True,
+                range=[0, 100],
+                tickfont=dict(color='white', size=12),
+                gridcolor=WHITE_GRID
+            ),
+            angularaxis=dict(
+                tickfont=dict(color='white', size=14, family='Inter'),
+                gridcolor=WHITE_GRID
+            ),
+            bgcolor=TRANSPARENT
+        ),
+        showlegend=True,
+        legend=dict(font=dict(color='white', size=12)),
+        height=400,
+        margin=dict(t=40, b=40, l=40, r=40)
+    )
+    return fig.to_dict()
+
+
+@lru_cache(maxsize=None)
+def _probability_template():
+    fig = go.Figure(go.Bar(
+        x=[],
+        y=[],
+        marker=dict(
+            colorscale=PROBABILITY_COLORSCALE,
+            line=dict(width=3, color='rgba(255,255,255,0.5)')
+        ),
+        textposition='outside',
+        textfont=dict(size=16, color='white', family='Inter', weight='bold'),
+        hovertemplate="%{x}: %{y:.1%}<extra></extra>"
+    ))
+    fig.update_layout(
+        template=CHART_TEMPLATE,
+        showlegend=False,
+        yaxis=dict(
+            title='Probability',
+            tickformat=".0%",
+            range=[0, 1],
+            gridcolor=WHITE_GRID,
+            tickfont=dict(color='white', size=12)
+        ),
+        xaxis=dict(tickfont=dict(color='white', size=13, family='Inter')),
+        height=350
+    )
+    return fig.to_dict()
+
+
+@lru_cache(maxsize=None)
+def _attribution_template():
+    fig = go.Figure(go.Bar(
+        x=[],
+        y=[],
+        orientation='h',
+        textposition='outside',
+        textfont=dict(color='white', family='Inter')
+    ))
+    fig.update_layout(
+        template=CHART_TEMPLATE,
+        xaxis=dict(
+            tickformat="+.0%",
+            gridcolor=WHITE_GRID,
+            tickfont=dict(color='white', size=12)
+        ),
+        yaxis=dict(tickfont=dict(color='white', size=13, family='Inter')),
+        height=300,
+        margin=dict(t=20, b=20, l=10, r=40)
+    )
+    return fig.to_dict()
+
+
+@lru_cache(maxsize=None)
+def _comparison_radar_template():
+    spec = copy.deepcopy(_radar_template())
+    # Keep only the target trace; each site gets its own trace per render
+    spec['data'] = spec['data'][1:]
+    spec['layout']['legend'].update(orientation='h', y=-0.1)
+    spec['layout']['height'] = 450
+    return spec
+
+
+@lru_cache(maxsize=None)
+def _comparison_bar_template():
+    fig = go.Figure()
+    fig.update_layout(
+        template=CHART_TEMPLATE,
+        barmode='group',
+        yaxis=dict(gridcolor=WHITE_GRID, tickfont=dict(color='white', size=12)),
+        xaxis=dict(tickfont=dict(color='white', size=12, family='Inter')),
+        legend=dict(font=dict(color='white', size=12), orientation='h', y=1.15),
+        title=dict(font=dict(color='white', size=16, family='Inter')),
+        height=300,
+        margin=dict(t=50, b=20, l=10, r=10)
+    )
+    return fig.to_dict()
+
+
+def gauge_chart(value, title, max_value=100):
+    """Gauge for one score"""
+    spec = copy.deepcopy(_gauge_template(max_value))
+    indicator = spec['data'][0]
+    indicator['value'] = value
+    indicator['title']['text'] = title
+    indicator['gauge']['threshold']['value'] = value
+    return go.Figure(spec)
+
+
+def radar_spec(metrics):
+    """radar_chart as a plain figure dict, for callers that only serialize it"""
+    spec = copy.deepcopy(_radar_template())
+    spec['data'][0]['r'] = _closed([metrics.get(name, 0) for name in RADAR_METRICS])
+    return spec
+
+
+def radar_chart(metrics):
+    """The four Lighthouse category scores against the 90 target"""
+    return go.Figure(radar_spec(metrics))
+
+
+def probability_spec(probabilities):
+    """probability_chart as a plain figure dict"""
+    spec = copy.deepcopy(_probability_template())
+    bar = spec['data'][0]
+    values = list(probabilities.values())
+    bar['x'] = list(probabilities.keys())
+    bar['y'] = values
+    bar['marker']['color'] = values
+    bar['text'] = [f'{v:.1%}' for v in values]
+    return spec
+
+
+def probability_chart(probabilities):
+    """Bar per performance category, colored by probability"""
+    return go.Figure(probability_spec(probabilities))
+
+
+def attribution_chart(attributions, top_n=6):
+    """Horizontal bars for the metrics that moved the prediction most"""
+    spec = copy.deepcopy(_attribution_template())
+    top = list(attributions.items())[:top_n][::-1]
+    bar = spec['data'][0]
+    bar['x'] = [value for _, value in top]
+    bar['y'] = [name.replace('_', ' ').title() for name, _ in top]
+    bar['marker'] = {'color': ['#00ff88' if value > 0 else '#FF6B6B' for _, value in top]}
+    bar['text'] = [f'{value:+.1%}' for _, value in top]
+    return go.Figure(spec)
+
+
+@lru_cache(maxsize=None)
+def _trend_template():
+    fig = go.Figure()
+    fig.update_layout(
+        template=CHART_TEMPLATE,
+        xaxis=dict(type='date', gridcolor=WHITE_GRID, tickfont=dict(color='white', size=12)),
+        yaxis=dict(gridcolor=WHITE_GRID, tickfont=dict(color='white', size=12)),
+        legend=dict(font=dict(color='white', size=12), orientation='h', y=1.12),
+        hovermode='x unified',
+        height=350,
+        margin=dict(t=40, b=20, l=10, r=10)
+    )
+    return fig.to_dict()
+
+
+def trend_chart(points, metrics, labels=None, y_range=None):
+    """One line per metric over time, from history.History.trend points"""
+    spec = copy.deepcopy(_trend_template())
+    labels = labels or {}
+    x = [datetime.fromtimestamp(point['timestamp']).isoformat() for point in points]
+    spec['data'] = [
+        {
+            'type': 'scatter',
+            'mode': 'lines+markers' if len(points) <= 60 else 'lines',
+            'x': x,
+            'y': [point.get(name) for point in points],
+            'name': labels.get(name, name.replace('_', ' ').title()),
+            'line': {'width': 3}
+        }
+        for name in metrics
+    ]
+    if y_range:
+        spec['layout']['yaxis']['range'] = list(y_range)
+    return go.Figure(spec)
+
+
+def comparison_radar_chart(sites):
+    """Category scores of several sites overlaid; sites is [(name, metrics)]"""
+    spec = copy.deepcopy(_comparison_radar_template())
+    theta = _closed(RADAR_CATEGORIES)
+    spec['data'] = [
+        {
+            'type': 'scatterpolar',
+            'r': _closed([metrics.get(name, 0) for name in RADAR_METRICS]),
+            'theta': theta,
+            'fill': 'toself',
+            'opacity': 0.6,
+            'line': {'color': color, 'width': 3},
+            'marker': {'size': 8, 'color': color},
+            'name': name
+        }
+        for (name, metrics), color in zip(sites, SITE_COLORS)
+    ] + spec['data']
+    return go.Figure(spec)
+
+
+def comparison_bar_chart(names, values, title, text_format='{:,.0f}'):
+    """One bar per site for a single metric"""
+    spec = copy.deepcopy(_comparison_bar_template())
+    spec['data'] = [{
+        'type': 'bar',
+        'x': list(names),
+        'y': list(values),
+        'marker': {'color': SITE_COLORS[:len(names)]},
+        'text': [text_format.format(value) for value in values],
+        'textposition': 'outside',
+        'textfont': {'color': 'white', 'family': 'Inter'},
+        'showlegend': False
+    }]
+    spec['layout']['title']['text'] = title
+    return go.Figure(spec)
+
+
+def comparison_probability_chart(sites):
+    """Class probabilities of several sites as grouped bars; sites is [(name, probabilities)]"""
+    spec = copy.deepcopy(_comparison_bar_template())
+    spec['data'] = [
+        {
+            'type': 'bar',
+            'x': list(probabilities.keys()),
+            'y': list(probabilities.values()),
+            'name': name,
+            'marker': {'color': color},
+            'hovertemplate': "%{x}: %{y:.1%}<extra>" + name + "</extra>"
+        }
+        for (name, probabilities), color in zip(sites, SITE_COLORS)
+    ]
+    spec['layout']['yaxis'].update(title='Probability', tickformat=".0%", range=[0, 1])
+    spec['layout']['height'] = 350
+    return go.Figure(spec)
@@ -1,21 +1,29 @@
 # check_data.py
-import pandas as pd
 import os
+import time
+
+import columnar
 
 print("Checking data...")
 
-data_path = "data/raw/sample_data.csv"
+data_path = columnar.resolve("data/raw/sample_data.csv")
 if os.path.exists(data_path):
-    df = pd.read_csv(data_path)
-    print(f"✅ Data file exists with {len(df)} rows")
+    start = time.perf_counter()
+    df = columnar.read_frame(data_path)
+    elapsed = time.perf_counter() - start
+    print(f"✅ Data file exists with {len(df)} rows ({data_path}, loaded in {elapsed * 1000:.1f} ms)")
     print(f"✅ Columns: {list(df.columns)}")
+    print(f"✅ In memory: {df.memory_usage(deep=True).sum() / 1024:.1f} KB")
     print("\n📋 First 3 rows:")
     print(df.head(3))
-    
+
     # Check for empty rows
     if len(df) == 0:
         print("❌ WARNING: File exists but has 0 rows!")
     else:
         print(f"✅ Data looks good! {len(df)} rows loaded.")
+
+    if not columnar.is_columnar(data_path):
+        print(f"💡 Faster loads: python columnar.py {data_path}")
 else:
-    print(f"❌ Data file not found at {data_path}")
\ No newline at end of file
+    print(f"❌ Data file not found at {data_path}")
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+REAL DATA COLLECTOR: Build a labeled training corpus from PageSpeed Insights
+
+Reads seed URL lists, fetches every URL for both strategies (mobile and
+desktop) concurrently, extracts the metrics with the same code the app
+uses (analysis.extract_metrics) and appends one labeled row per
+(url, strategy) to the training CSV as results arrive.
+
+    - Quota: requests are paced by a shared token bucket (PSI allows 400
+      requests per 100 s per key by default) and a daily cap that is
+      persisted next to the output, so restarts don't reset it.
+    - 429 and 5xx responses are retried with exponential backoff; other
+      errors are logged to <output>.errors.jsonl and retried on the next run.
+    - Resumable: (url, strategy) pairs already in the output are skipped,
+      so a killed job just continues where it stopped.
+
+Seed files hold one URL per line, or a CSV with a `url` column and an
+optional `website_type` column. Run it as a background job:
+
+    nohup python collector.py --seeds data/seeds/top10k.txt --workers 8 > collect.log 2>&1 &
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from datetime import date, datetime
+
+import pandas as pd
+import requests
+
+import analysis
+import outofcore
+
+DEFAULT_OUTPUT = "data/raw/real_data.csv"
+STRATEGIES = ('mobile', 'desktop')
+
+# Public PageSpeed Insights defaults per API key
+DEFAULT_RATE = 400
+DEFAULT_RATE_WINDOW = 100.0
+DEFAULT_DAILY_QUOTA = 25_000
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+COLUMNS = [
+    'url', 'website_type', 'device_type', 'timestamp',
+    'performance_score', 'seo_score', 'accessibility_score', 'best_practices_score',
+    'first_contentful_paint', 'largest_contentful_paint', 'cumulative_layout_shift',
+    'total_blocking_time', 'speed_index', 'time_to_interactive', 'total_byte_weight',
+    'meta_description_exists', 'title_length', 'image_alt_exists', 'server_response_time',
+    'performance_category'
+]
+
+
+class QuotaExceeded(Exception):
+    """Raised when the daily request budget is used up"""
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket: at most `rate` requests per `window` seconds,
+    plus a daily cap whose count is kept in a small JSON file.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, window=DEFAULT_RATE_WINDOW,
+                 daily_quota=DEFAULT_DAILY_QUOTA, state_path=None):
+        self.capacity = float(rate)
+        self.refill_per_second = rate / window
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.daily_quota = daily_quota
+        self.state_path = state_path
+        self.lock = threading.Lock()
+        self.day, self.used_today = self._load_state()
+
+    def _load_state(self):
+        today = date.today().isoformat()
+        if self.state_path and os.path.exists(self.state_path):
+            with open(self.state_path) as f:
+                state = json.load(f)
+            if state.get('day') == today:
+                return today, state.get('used', 0)
+        return today, 0
+
+    def _save_state(self):
+        if self.state_path:
+            tmp_path = self.state_path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({'day': self.day, 'used': self.used_today}, f)
+            os.replace(tmp_path, self.state_path)
+
+    def acquire(self):
+        """Block until a request may be sent; raises QuotaExceeded"""
+        while True:
+            with self.lock:
+                today = date.today().isoformat()
+                if today != self.day:
+                    self.day, self.used_today = today, 0
+                if self.daily_quota and self.used_today >= self.daily_quota:
+                    raise QuotaExceeded(f"Daily quota of {self.daily_quota} requests used")
+
+                now = time.monotonic()
+                self.tokens = min(self.capacity,
+                                  self.tokens + (now - self.updated) * self.refill_per_second)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    self.used_today += 1
+                    self._save_state()
+                    return
+                wait = (1 - self.tokens) / self.refill_per_second
+            time.sleep(wait)
+
+
+def read_seeds(sources):
+    """
+    Yield (url, website_type) from seed files, normalized and de-duplicated.
+    Sources are paths or open text files.
+    """
+    seen = set()
+    for source in sources:
+        with nullcontext(source) if hasattr(source, 'read') else open(source, newline='') as f:
+            first = f.readline()
+            f.seek(0)
+            if 'url' in [c.strip().lower() for c in first.split(',')]:
+                rows = ((row.get('url', ''), row.get('website_type', '')) for row in csv.DictReader(f))
+            else:
+                rows = ((line.split(',')[0], '') for line in f)
+            for url, website_type in rows:
+                url = (url or '').strip()
+                if not url or url.startswith('#'):
+                    continue
+                url = analysis.normalize_url(url)
+                if url not in seen:
+                    seen.add(url)
+                    yield url, (website_type or '').strip()
+
+
+def collected_pairs(output):
+    """(url, strategy) pairs already in the output CSV, read in chunks"""
+    done = set()
+    if not os.path.exists(output) or os.path.getsize(output) == 0:
+        return done
+    for chunk in pd.read_csv(output, usecols=['url', 'device_type'], dtype=str, chunksize=100_000):
+        done.update(zip(chunk['url'], chunk['device_type']))
+    return done
+
+
+def categorize(performance_score):
+    """Label a row the same way the training data is labeled"""
+    for low, high, label in zip(outofcore.PERFORMANCE_BINS, outofcore.PERFORMANCE_BINS[1:],
+                                outofcore.PERFORMANCE_LABELS):
+        if low <= performance_score < high:
+            return label
+    return outofcore.PERFORMANCE_LABELS[-1]
+
+
+def build_row(url, website_type, strategy, metrics):
+    """One training row from extracted metrics"""
+    row = {column: metrics.get(column, '') for column in COLUMNS}
+    row.update({
+        'url': url,
+        'website_type': website_type,
+        'device_type': strategy,
+        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'performance_category': categorize(metrics['performance_score'])
+    })
+    return row
+
+
+class Collector:
+    """Fetch (url, strategy) pairs on a thread pool and append rows to a CSV"""
+
+    def __init__(self, output=DEFAULT_OUTPUT, api_key=None, workers=8, limiter=None,
+                 max_retries=4, timeout=60, flush_every=25):
+        self.output = output
+        self.api_key = api_key
+        self.workers = workers
+        self.limiter = limiter or RateLimiter(state_path=output + ".quota.json")
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.flush_every = flush_every
+        self._local = threading.local()
+        self._stop = threading.Event()
+
+    def _session(self):
+        # One pooled HTTP connection set per worker thread
+        if not hasattr(self._local, "session"):
+            self._local.session = requests.Session()
+        return self._local.session
+
+    def fetch_json(self, url, strategy):
+        """Fetch one pair's PSI response, retrying throttling, server and network errors"""
+        for attempt in range(self.max_retries + 1):
+            if self._stop.is_set():
+                raise QuotaExceeded("Collection stopped")
+            self.limiter.acquire()
+            try:
+                return analysis.fetch_pagespeed_data(url, strategy, api_key=self.api_key,
+                                                     timeout=self.timeout, session=self._session())
+            except analysis.PageSpeedError as e:
+                # Only failures of the request itself: a missing key or a 4xx won't go away
+                retryable = (e.status_code in RETRY_STATUS
+                             or isinstance(e.__cause__, requests.RequestException))
+                if not retryable or attempt == self.max_retries:
+                    raise
+                time.sleep(min(60, 2 ** attempt + random.random()))
+
+    def fetch(self, url, website_type, strategy):
+        """Fetch and extract one pair into a training row"""
+        api_data = self.fetch_json(url, strategy)
+        return build_row(url, website_type, strategy, analysis.extract_metrics(api_data))
+
+    def stop(self):
+        """Make pending and future fetches raise QuotaExceeded"""
+        self._stop.set()
+
+    def run(self, seeds, limit=None, verbose=True):
+        """
+        Collect every pending (url, strategy) pair from seeds.
+        Returns {'collected', 'failed', 'skipped', 'seconds'}. Raises
+        PageSpeedConfigError at once when no API key is configured.
+        """
+        if not (self.api_key or analysis.get_api_key()):
+            raise analysis.PageSpeedConfigError("PageSpeed API key is not configured")
+        done = collected_pairs(self.output)
+        pending = [(url, website_type, strategy)
+                   for url, website_type in seeds for strategy in STRATEGIES
+                   if (url, strategy) not in done]
+        if limit:
+            pending = pending[:limit]
+
+        os.makedirs(os.path.dirname(self.output) or '.', exist_ok=True)
+        write_header = not os.path.exists(self.output) or os.path.getsize(self.output) == 0
+        errors_path = self.output + ".errors.jsonl"
+        stats = {'collected': 0, 'failed': 0, 'skipped': len(done), 'seconds': 0.0}
+        start = time.perf_counter()
+
+        if verbose:
+            print(f"🌐 {len(pending)} requests pending ({len(done)} already collected)")
+
+        with open(self.output, 'a', newline='') as out, open(errors_path, 'a') as errors, \
+                ThreadPoolExecutor(max_workers=self.workers) as pool:
+            # Appending to an existing dataset keeps its column layout
+            fieldnames = COLUMNS if write_header else pd.read_csv(self.output, nrows=0).columns.tolist()
+            writer = csv.DictWriter(out, fieldnames=fieldnames, extrasaction='ignore')
+            if write_header:
+                writer.writeheader()
+
+            futures = {pool.submit(self.fetch, *task): task for task in pending}
+            try:
+                for future in as_completed(futures):
+                    url, _, strategy = futures[future]
+                    try:
+                        writer.writerow(future.result())
+                        stats['collected'] += 1
+                    except QuotaExceeded as e:
+                        if not self._stop.is_set() and verbose:
+                            print(f"⛔ {e}; stopping (rerun tomorrow to continue)")
+                        self._stop.set()
+                        continue
+                    except (analysis.PageSpeedError, KeyError, TypeError, ValueError) as e:
+                        stats['failed'] += 1
+                        errors.write(json.dumps({'url': url, 'strategy': strategy, 'error': str(e),
+                                                 'timestamp': datetime.now().isoformat()}) + "\n")
+
+                    finished = stats['collected'] + stats['failed']
+                    if finished % self.flush_every == 0:
+                        out.flush()
+                        errors.flush()
+                        if verbose:
+                            elapsed = time.perf_counter() - start
+                            rate = finished / elapsed
+                            eta = (len(pending) - finished) / rate if rate else 0
+                            print(f"📥 {finished}/{len(pending)} | {stats['collected']} ok, "
+                                  f"{stats['failed']} failed | {rate * 60:.0f}/min | "
+                                  f"ETA {eta / 60:.0f} min")
+            except KeyboardInterrupt:
+                self._stop.set()
+                for future in futures:
+                    future.cancel()
+                if verbose:
+                    print("\n⏹️  Interrupted; rows collected so far are saved")
+
+        stats['seconds'] = time.perf_counter() - start
+        return stats
+
+
+def main():
+    """
+    Command line entry point
+    """
+    parser = argparse.ArgumentParser(description="Collect real PageSpeed data for training")
+    parser.add_argument("--seeds", nargs="+", required=True, help="Seed URL files (txt or csv)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--rate", type=int, default=DEFAULT_RATE,
+                        help=f"Requests per --rate-window seconds (default {DEFAULT_RATE})")
+    parser.add_argument("--rate-window", type=float, default=DEFAULT_RATE_WINDOW)
+    parser.add_argument("--daily-quota", type=int, default=DEFAULT_DAILY_QUOTA,
+                        help="Stop after this many requests per day (0 = no cap)")
+    parser.add_argument("--limit", type=int, help="Only fetch this many pending requests")
+    parser.add_argument("--timeout", type=int, default=60)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🌐 COLLECTING REAL PAGESPEED DATA")
+    print("=" * 60)
+
+    api_key = analysis.get_api_key()
+    if not api_key:
+        print("❌ PageSpeed API key is not configured")
+        print("💡 Add PAGESPEED_API_KEY to your .env file")
+        return
+
+    limiter = RateLimiter(args.rate, args.rate_window, args.daily_quota,
+                          state_path=args.output + ".quota.json")
+    collector = Collector(args.output, api_key=api_key, workers=args.workers,
+                          limiter=limiter, timeout=args.timeout)
+    stats = collector.run(list(read_seeds(args.seeds)), limit=args.limit)
+
+    print(f"\n✅ Collected {stats['collected']} rows, {stats['failed']} failed "
+          f"in {stats['seconds'] / 60:.1f} min")
+    print(f"💾 Output: {args.output}")
+    if stats['failed']:
+        print(f"⚠️  Failures logged to {args.output}.errors.jsonl (rerun to retry them)")
+
+
+if __name__ == "__main__":
+    main()
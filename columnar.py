@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+COLUMNAR DATASETS: Typed, memory-mappable replacement for data/raw CSVs
+
+A dataset is a directory (by convention <name>.cols) holding one raw
+binary file per column plus a meta.json manifest:
+
+    float     float32
+    flag      int8 (0/1 columns such as meta_description_exists)
+    int       smallest signed integer type that fits the values
+    category  dictionary-encoded: int8/int16/int32 codes (-1 = missing),
+              the distinct values live in a side file read on demand
+    datetime  datetime64[s]
+
+Columns are opened with np.memmap, so loading costs one small JSON read
+no matter how many rows there are, and only the pages actually touched
+are read from disk.
+
+Convert in either direction (the destination defaults to the sibling
+.cols directory or .csv file):
+    python columnar.py data/raw/sample_data.csv
+    python columnar.py data/raw/sample_data.cols data/raw/sample_copy.csv
+"""
+
+import argparse
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+
+SUFFIX = ".cols"
+META_FILE = "meta.json"
+FORMAT_VERSION = 1
+
+# Text columns stored as datetimes rather than categories
+DATETIME_COLUMNS = ('timestamp',)
+
+DEFAULT_CHUNK_ROWS = 500_000
+
+_INT_TYPES = [np.int8, np.int16, np.int32, np.int64]
+
+
+def is_columnar(path):
+    """True if path is a columnar dataset directory"""
+    return os.path.isfile(os.path.join(path, META_FILE))
+
+
+def sibling_path(path):
+    """data/raw/x.csv <-> data/raw/x.cols"""
+    stem = os.path.splitext(path.rstrip(os.sep))[0]
+    return stem + (".csv" if is_columnar(path) else SUFFIX)
+
+
+def resolve(path):
+    """
+    Prefer the columnar copy of a CSV when one exists and is at least as
+    new as the CSV; otherwise return path unchanged.
+    """
+    if path.endswith(".csv"):
+        columnar_path = sibling_path(path)
+        if is_columnar(columnar_path) and (
+                not os.path.exists(path)
+                or os.path.getmtime(os.path.join(columnar_path, META_FILE)) >= os.path.getmtime(path)):
+            return columnar_path
+    return path
+
+
+def _smallest_int(low, high):
+    for dtype in _INT_TYPES:
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return dtype
+    return np.int64
+
+
+class ColumnarWriter:
+    """
+    Append DataFrame chunks to a columnar dataset.
+
+    Column kinds are planned from the first chunk. A later chunk that does
+    not fit its column's kind promotes the column, rewriting the rows
+    written so far: an integer column becomes float when nulls or
+    fractions appear, and a float column that has only held nulls becomes
+    a category column when text appears. Anything else raises ValueError
+    rather than storing a wrong value. Integers and category codes are
+    written wide while streaming and narrowed to the smallest type that
+    fits on close(), so chunks can be appended without knowing the value
+    range in advance.
+    """
+
+    def __init__(self, path, datetime_columns=DATETIME_COLUMNS):
+        self.path = path
+        self.datetime_columns = set(datetime_columns)
+        self.rows = 0
+        self._columns = None
+        self._files = {}
+        if os.path.exists(path):
+            shutil.rmtree(path)
+        os.makedirs(path)
+
+    def _plan(self, df):
+        columns = []
+        for index, name in enumerate(df.columns):
+            series = df[name]
+            if pd.api.types.is_bool_dtype(series):
+                kind, dtype = 'int', np.int64
+            elif pd.api.types.is_integer_dtype(series):
+                kind, dtype = 'int', np.int64
+            elif pd.api.types.is_float_dtype(series):
+                kind, dtype = 'float', np.float32
+            elif pd.api.types.is_datetime64_any_dtype(series) or name in self.datetime_columns:
+                kind, dtype = 'datetime', np.dtype('datetime64[s]')
+            else:
+                kind, dtype = 'category', np.int32
+            columns.append({
+                'name': str(name),
+                'kind': kind,
+                'dtype': np.dtype(dtype).str,
+                'file': f"c{index:03d}.bin",
+                'min': None,
+                'max': None,
+                'non_null': 0,
+                'categories': {} if kind == 'category' else None
+            })
+        return columns
+
+    def _fit_kind(self, column, series):
+        """Promote column if this chunk's values do not fit its kind, or raise"""
+        kind, name = column['kind'], column['name']
+        numeric = pd.api.types.is_numeric_dtype(series)
+        if kind == 'int' and not (pd.api.types.is_integer_dtype(series) or pd.api.types.is_bool_dtype(series)):
+            if not numeric:
+                raise ValueError(f"Column {name!r}: non-numeric values after row {self.rows} "
+                                 f"in an integer column")
+            values = series.to_numpy(dtype=np.float64)
+            if not np.isfinite(values).all() or (values != np.round(values)).any():
+                self._retype(column, 'float', np.float32, lambda part: part.astype(np.float32))
+        elif kind == 'float' and not numeric:
+            if column['non_null']:
+                raise ValueError(f"Column {name!r}: non-numeric values after row {self.rows} "
+                                 f"in a float column")
+            # Only nulls so far: the column is text that started out empty
+            self._retype(column, 'category', np.int32, lambda part: np.full(len(part), -1, dtype=np.int32))
+            column['categories'] = {}
+
+    def _retype(self, column, kind, dtype, convert):
+        """Change a column's kind mid-stream, converting the rows already written"""
+        name = column['name']
+        self._files[name].close()
+        self._rewrite(column, dtype, convert)
+        self._files[name] = open(os.path.join(self.path, column['file']), 'ab')
+        column.update(kind=kind, min=None, max=None)
+
+    def _encode(self, column, series):
+        self._fit_kind(column, series)
+        kind = column['kind']
+        if kind == 'float':
+            values = series.to_numpy(dtype=np.float32)
+            column['non_null'] += int(np.count_nonzero(~np.isnan(values)))
+            return values
+        if kind == 'datetime':
+            values = pd.to_datetime(series, errors='coerce')
+            given = series.notna() & (series.astype(str).str.strip() != '')
+            unparsed = given & values.isna()
+            if unparsed.any():
+                raise ValueError(f"Column {column['name']!r}: {series[unparsed].iloc[0]!r} is not a date")
+            return values.to_numpy(dtype='datetime64[s]')
+        if kind == 'int':
+            values = series.to_numpy(dtype=np.int64)
+        else:
+            # Factorize the chunk, then map only its distinct values to global codes
+            codes, uniques = pd.factorize(series)
+            lookup = column['categories']
+            mapping = np.array([lookup.setdefault(str(u), len(lookup)) for u in uniques],
+                               dtype=np.int32)
+            values = np.full(len(codes), -1, dtype=np.int32)
+            present = codes >= 0
+            values[present] = mapping[codes[present]]
+        if len(values):
+            low, high = int(values.min()), int(values.max())
+            column['min'] = low if column['min'] is None else min(column['min'], low)
+            column['max'] = high if column['max'] is None else max(column['max'], high)
+        return values
+
+    def write(self, df):
+        if self._columns is None:
+            self._columns = self._plan(df)
+            for column in self._columns:
+                self._files[column['name']] = open(os.path.join(self.path, column['file']), 'wb')
+        for column in self._columns:
+            values = self._encode(column, df[column['name']])
+            self._files[column['name']].write(np.ascontiguousarray(values).tobytes())
+        self.rows += len(df)
+
+    def _narrow(self, column):
+        """Rewrite a wide integer column with the smallest dtype that fits"""
+        low, high = column['min'] or 0, column['max'] or 0
+        if column['kind'] == 'int' and low >= 0 and high <= 1:
+            column['kind'] = 'flag'
+        dtype = np.dtype(_smallest_int(low, high))
+        if dtype == np.dtype(column['dtype']):
+            return
+        self._rewrite(column, dtype, lambda part: part.astype(dtype))
+
+    def _rewrite(self, column, dtype, convert):
+        """Rewrite a closed column file chunk by chunk as dtype"""
+        file_path = os.path.join(self.path, column['file'])
+        if self.rows:
+            old = np.memmap(file_path, dtype=column['dtype'], mode='r', shape=(self.rows,))
+            tmp_path = file_path + ".tmp"
+            with open(tmp_path, 'wb') as f:
+                for start in range(0, self.rows, DEFAULT_CHUNK_ROWS):
+                    f.write(np.ascontiguousarray(convert(old[start:start + DEFAULT_CHUNK_ROWS])).tobytes())
+            del old
+            os.replace(tmp_path, file_path)
+        column['dtype'] = np.dtype(dtype).str
+
+    def close(self):
+        if self._columns is None:
+            raise ValueError("No rows written")
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+
+        manifest = []
+        for column in self._columns:
+            if column['kind'] in ('int', 'category'):
+                self._narrow(column)
+            entry = {k: column[k] for k in ('name', 'kind', 'dtype', 'file')}
+            if column['kind'] == 'category':
+                # Insertion order = code order
+                entry['categories'] = column['file'].replace('.bin', '.categories.json')
+                with open(os.path.join(self.path, entry['categories']), 'w') as f:
+                    json.dump(list(column['categories']), f)
+            manifest.append(entry)
+
+        # The manifest goes last: a dataset without one is incomplete
+        with open(os.path.join(self.path, META_FILE), 'w') as f:
+            json.dump({'version': FORMAT_VERSION, 'rows': self.rows, 'columns': manifest}, f, indent=2)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            for f in self._files.values():
+                f.close()
+
+
+class ColumnarDataset:
+    """Read-only, memory-mapped view of a columnar dataset"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, META_FILE)) as f:
+            meta = json.load(f)
+        if meta.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported columnar format version in {path}: {meta.get('version')}")
+        self.rows = meta['rows']
+        self.specs = {column['name']: column for column in meta['columns']}
+        self.columns = list(self.specs)
+        self._arrays = {}
+        self._categories = {}
+
+    def __len__(self):
+        return self.rows
+
+    def column(self, name):
+        """Raw stored values (category codes for category columns), memory-mapped"""
+        if name not in self._arrays:
+            spec = self.specs[name]
+            if self.rows == 0:
+                self._arrays[name] = np.empty(0, dtype=spec['dtype'])
+            else:
+                self._arrays[name] = np.memmap(os.path.join(self.path, spec['file']),
+                                               dtype=spec['dtype'], mode='r', shape=(self.rows,))
+        return self._arrays[name]
+
+    def categories(self, name):
+        """Distinct values of a category column, in code order"""
+        if name not in self._categories:
+            with open(os.path.join(self.path, self.specs[name]['categories'])) as f:
+                self._categories[name] = json.load(f)
+        return self._categories[name]
+
+    def series(self, name, rows=slice(None)):
+        """One column as a pandas Series (categories decoded as pd.Categorical)"""
+        values = self.column(name)[rows]
+        if self.specs[name]['kind'] == 'category':
+            categories = self.categories(name)
+            return pd.Series(pd.Categorical.from_codes(values, categories), name=name)
+        return pd.Series(values, name=name, copy=False)
+
+    def frame(self, columns=None, rows=slice(None)):
+        """A DataFrame of the given columns (default: all) and row slice"""
+        columns = self.columns if columns is None else columns
+        return pd.DataFrame({name: self.series(name, rows) for name in columns}, copy=False)
+
+    def matrix(self, columns, rows=slice(None), dtype=np.float32):
+        """Stack numeric columns into an (n_rows, n_columns) array"""
+        return np.column_stack([np.asarray(self.column(name)[rows], dtype=dtype) for name in columns])
+
+    def iter_frames(self, columns=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+        """Yield DataFrames of at most chunk_rows rows"""
+        for start in range(0, self.rows, chunk_rows):
+            yield self.frame(columns, slice(start, start + chunk_rows))
+
+
+def read_frame(path, columns=None):
+    """Load a CSV or a columnar dataset as a DataFrame"""
+    if is_columnar(path):
+        return ColumnarDataset(path).frame(columns)
+    return pd.read_csv(path, usecols=columns)
+
+
+def csv_to_columnar(src, dst=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Stream a CSV into a columnar dataset; returns (dst, rows)"""
+    dst = dst or sibling_path(src)
+    with ColumnarWriter(dst) as writer, pd.read_csv(src, chunksize=chunk_rows) as chunks:
+        for chunk in chunks:
+            writer.write(chunk)
+    return dst, writer.rows
+
+
+def columnar_to_csv(src, dst=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Write a columnar dataset back out as CSV; returns (dst, rows)"""
+    dst = dst or sibling_path(src)
+    dataset = ColumnarDataset(src)
+    if dataset.rows == 0:
+        dataset.frame().to_csv(dst, index=False)
+    for index, chunk in enumerate(dataset.iter_frames(chunk_rows=chunk_rows)):
+        chunk.to_csv(dst, mode='w' if index == 0 else 'a', header=index == 0, index=False)
+    return dst, dataset.rows
+
+
+def main():
+    """
+    Command line entry point
+    """
+    parser = argparse.ArgumentParser(description="Convert between CSV and columnar datasets")
+    parser.add_argument("source", help="A .csv file or a .cols directory")
+    parser.add_argument("destination", nargs="?", help="Defaults to the sibling .cols / .csv path")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if is_columnar(args.source):
+        dst, rows = columnar_to_csv(args.source, args.destination, args.chunk_rows)
+    else:
+        dst, rows = csv_to_columnar(args.source, args.destination, args.chunk_rows)
+    elapsed = time.perf_counter() - start
+
+    print(f"✅ {args.source} → {dst}: {rows:,} rows in {elapsed:.1f}s")
+    if is_columnar(dst):
+        dataset = ColumnarDataset(dst)
+        for name, spec in dataset.specs.items():
+            print(f"   {name:<26} {spec['kind']:<9} {np.dtype(spec['dtype']).name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+SYNTHETIC DATA GENERATOR: Vectorized, chunked and shardable
+
+Every column is drawn as one NumPy array per chunk instead of row by row.
+The three historical generators are available as profiles:
+
+    websites  -> scripts/01_create_data.py (per-website_type distributions)
+    sample    -> create_data_now.py (data/raw/sample_data.csv layout)
+    balanced  -> create_balanced_data.py (equal rows per category)
+
+Large datasets are split into fixed-size shards. Shard i always uses the
+seed SeedSequence(seed, spawn_key=(i,)), so the output is identical no
+matter how many worker processes generate it.
+
+Examples:
+    python datagen.py --profile websites --rows 300 --output data/raw/websites.csv
+    python datagen.py --profile sample --rows 100000000 --output data/raw/big --workers 8 --format parquet
+    python datagen.py --profile balanced --rows 400 --output data/raw/balanced_data.cols --format columnar
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import columnar
+
+CATEGORIES = ['Poor', 'Needs Improvement', 'Good', 'Excellent']
+WEBSITE_TYPES = ['ecommerce', 'blog', 'corporate', 'portfolio', 'news']
+
+DEFAULT_CHUNK_ROWS = 500_000
+DEFAULT_SHARD_ROWS = 5_000_000
+
+EXTENSIONS = {'csv': '.csv', 'parquet': '.parquet', 'columnar': columnar.SUFFIX}
+FORMATS = list(EXTENSIONS)
+
+
+def _uniform(rng, low, high, size):
+    """Uniform draws where low/high may be per-row arrays"""
+    return low + (high - low) * rng.random(size)
+
+
+def _categorize(performance):
+    """Map performance scores to the four target categories"""
+    return np.select(
+        [performance >= 90, performance >= 75, performance >= 50],
+        ['Excellent', 'Good', 'Needs Improvement'],
+        default='Poor'
+    )
+
+
+def _example_urls(index):
+    return "https://example" + pd.Series(index).astype(str) + ".com"
+
+
+def _profile_websites(rng, start, count, total):
+    """Distributions from create_synthetic_dataset in scripts/01_create_data.py"""
+    type_idx = rng.choice(len(WEBSITE_TYPES), size=count, p=[0.3, 0.25, 0.2, 0.15, 0.1])
+
+    # Per-type ranges: ecommerce, blog, then everything else
+    fcp_lo = np.array([800, 500, 600, 600, 600])[type_idx]
+    fcp_hi = np.array([3500, 2500, 3000, 3000, 3000])[type_idx]
+    lcp_lo = np.array([1500, 1000, 1200, 1200, 1200])[type_idx]
+    lcp_hi = np.array([5000, 4000, 4500, 4500, 4500])[type_idx]
+    perf_lo = np.array([40, 60, 50, 50, 50])[type_idx]
+    perf_hi = np.array([90, 95, 92, 92, 92])[type_idx]
+
+    fcp = _uniform(rng, fcp_lo, fcp_hi, count)
+    lcp = _uniform(rng, lcp_lo, lcp_hi, count)
+    base_perf = _uniform(rng, perf_lo, perf_hi, count)
+
+    cls = _uniform(rng, 0, 0.4, count)
+    tbt = _uniform(rng, 0, 600, count)
+    speed_index = _uniform(rng, 1000, 5000, count)
+    page_size = _uniform(rng, 500, 8000, count)
+
+    performance = np.clip(base_perf - (fcp / 200 + lcp / 300 + cls * 50 + tbt / 30 + page_size / 1000), 0, 100)
+    seo = np.clip(performance * _uniform(rng, 0.8, 1.2, count), 0, 100)
+    accessibility = np.clip(performance * _uniform(rng, 0.9, 1.1, count), 0, 100)
+    best_practices = np.clip(performance * _uniform(rng, 0.85, 1.15, count), 0, 100)
+
+    index = np.arange(start, start + count)
+    return pd.DataFrame({
+        'website_id': index + 1,
+        'url': _example_urls(index),
+        'website_type': np.array(WEBSITE_TYPES)[type_idx],
+        'device_type': np.where(rng.random(count) < 0.5, 'mobile', 'desktop'),
+        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+
+        # Scores
+        'performance_score': performance.round(1),
+        'seo_score': seo.round(1),
+        'accessibility_score': accessibility.round(1),
+        'best_practices_score': best_practices.round(1),
+
+        # Core Web Vitals
+        'first_contentful_paint': fcp.round(0),
+        'largest_contentful_paint': lcp.round(0),
+        'cumulative_layout_shift': cls.round(3),
+        'total_blocking_time': tbt.round(0),
+        'speed_index': speed_index.round(0),
+
+        # Resource metrics
+        'total_byte_weight': page_size.round(0),
+
+        # SEO metrics
+        'meta_description_exists': (rng.random(count) >= 0.3).astype(np.int64),
+        'title_length': rng.integers(10, 120, size=count),
+
+        # Target for prediction
+        'performance_category': _categorize(performance)
+    })
+
+
+def _profile_sample(rng, start, count, total):
+    """Distributions from create_data_now.py"""
+    type_idx = rng.integers(0, len(WEBSITE_TYPES), size=count)
+
+    perf_lo = np.array([40, 60, 50, 50, 50])[type_idx]
+    perf_hi = np.array([95, 98, 92, 92, 92])[type_idx]
+    performance = _uniform(rng, perf_lo, perf_hi, count)
+
+    # Core metrics
+    fcp = _uniform(rng, 500, 4000, count)
+    lcp = _uniform(rng, 1000, 6000, count)
+    cls = _uniform(rng, 0, 0.4, count)
+    tbt = _uniform(rng, 0, 600, count)
+    page_size = _uniform(rng, 500, 8000, count)
+
+    performance = np.clip(performance - (fcp / 200 + lcp / 300 + cls * 50 + tbt / 30 + page_size / 1000), 0, 100)
+    seo = np.clip(performance * _uniform(rng, 0.8, 1.2, count), 0, 100)
+    accessibility = np.clip(performance * _uniform(rng, 0.9, 1.1, count), 0, 100)
+    best_practices = np.clip(performance * _uniform(rng, 0.85, 1.15, count), 0, 100)
+
+    index = np.arange(start, start + count)
+    day = pd.Series(index % 30 + 1).astype(str).str.zfill(2)
+    return pd.DataFrame({
+        'url': _example_urls(index),
+        'website_type': np.array(WEBSITE_TYPES)[type_idx],
+        'device_type': np.where(rng.random(count) < 0.5, 'mobile', 'desktop'),
+        'timestamp': "2024-01-" + day + " 10:00:00",
+
+        # Scores
+        'performance_score': performance.round(1),
+        'seo_score': seo.round(1),
+        'accessibility_score': accessibility.round(1),
+        'best_practices_score': best_practices.round(1),
+
+        # Core Web Vitals
+        'first_contentful_paint': fcp.round(0),
+        'largest_contentful_paint': lcp.round(0),
+        'cumulative_layout_shift': cls.round(3),
+        'total_blocking_time': tbt.round(0),
+        'speed_index': _uniform(rng, 1000, 5000, count).round(0),
+        'time_to_interactive': _uniform(rng, 2000, 8000, count).round(0),
+
+        # Resource metrics
+        'total_byte_weight': page_size.round(0),
+
+        # SEO metrics
+        'meta_description_exists': (rng.random(count) >= 0.3).astype(np.int64),
+        'title_length': rng.integers(10, 120, size=count),
+        'h1_count': rng.integers(1, 5, size=count),
+
+        # Accessibility
+        'image_alt_exists': (rng.random(count) >= 0.2).astype(np.int64),
+
+        # Target for prediction
+        'performance_category': _categorize(performance)
+    })
+
+
+def _profile_balanced(rng, start, count, total):
+    """Distributions from create_balanced_data.py (equal blocks per category)"""
+    index = np.arange(start, start + count)
+    cat_idx = index * len(CATEGORIES) // total
+
+    # Per-category ranges in CATEGORIES order: Poor, NI, Good, Excellent
+    perf = _uniform(rng, np.array([30, 50, 75, 90])[cat_idx], np.array([50, 75, 90, 100])[cat_idx], count)
+    fcp = _uniform(rng, np.array([3500, 2500, 1500, 500])[cat_idx], np.array([4000, 3500, 2500, 1500])[cat_idx], count)
+    lcp = _uniform(rng, np.array([4500, 3500, 2500, 1000])[cat_idx], np.array([6000, 4500, 3500, 2500])[cat_idx], count)
+
+    return pd.DataFrame({
+        'performance_score': perf.round(1),
+        'seo_score': (perf * _uniform(rng, 0.8, 1.2, count)).round(1),
+        'accessibility_score': (perf * _uniform(rng, 0.9, 1.1, count)).round(1),
+        'first_contentful_paint': fcp.round(0),
+        'largest_contentful_paint': lcp.round(0),
+        'cumulative_layout_shift': _uniform(rng, 0, 0.3, count).round(3),
+        'total_blocking_time': _uniform(rng, 0, 500, count).round(0),
+        'total_byte_weight': _uniform(rng, 500, 5000, count).round(0),
+        'meta_description_exists': (rng.random(count) >= 0.2).astype(np.int64),
+        'title_length': rng.integers(10, 80, size=count),
+        'performance_category': np.array(CATEGORIES)[cat_idx]
+    })
+
+
+PROFILES = {
+    'websites': _profile_websites,
+    'sample': _profile_sample,
+    'balanced': _profile_balanced
+}
+
+
+def shard_rng(seed, shard_index):
+    """Independent, reproducible random stream for one shard"""
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(shard_index,)))
+
+
+def iter_shard(profile, shard_index, start, count, total, seed=42, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Yield one shard as a sequence of DataFrame chunks"""
+    make_chunk = PROFILES[profile]
+    rng = shard_rng(seed, shard_index)
+    for offset in range(0, count, chunk_rows):
+        size = min(chunk_rows, count - offset)
+        yield make_chunk(rng, start + offset, size, total)
+
+
+def shard_plan(n_rows, shard_rows=DEFAULT_SHARD_ROWS):
+    """List of (shard_index, start, count) covering n_rows"""
+    return [
+        (i, start, min(shard_rows, n_rows - start))
+        for i, start in enumerate(range(0, n_rows, shard_rows))
+    ]
+
+
+def iter_chunks(profile, n_rows, seed=42, chunk_rows=DEFAULT_CHUNK_ROWS, shard_rows=DEFAULT_SHARD_ROWS):
+    """Yield the whole dataset chunk by chunk, shard after shard"""
+    for shard_index, start, count in shard_plan(n_rows, shard_rows):
+        yield from iter_shard(profile, shard_index, start, count, n_rows, seed, chunk_rows)
+
+
+def generate(profile, n_rows, seed=42, chunk_rows=DEFAULT_CHUNK_ROWS, shard_rows=DEFAULT_SHARD_ROWS):
+    """Generate a dataset small enough to hold in memory as one DataFrame"""
+    chunks = list(iter_chunks(profile, n_rows, seed, chunk_rows, shard_rows))
+    if not chunks:
+        return PROFILES[profile](shard_rng(seed, 0), 0, 0, 1)
+    return pd.concat(chunks, ignore_index=True)
+
+
+class ChunkWriter:
+    """Append DataFrame chunks to a CSV, Parquet file or columnar dataset"""
+
+    def __init__(self, path, fmt='csv'):
+        self.path = path
+        self.fmt = fmt
+        self.rows = 0
+        self._parquet_writer = None
+        self._columnar_writer = None
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown format: {fmt}")
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        if fmt == 'columnar':
+            self._columnar_writer = columnar.ColumnarWriter(path)
+
+    def write(self, df):
+        if self.fmt == 'columnar':
+            self._columnar_writer.write(df)
+        elif self.fmt == 'csv':
+            df.to_csv(self.path, mode='w' if self.rows == 0 else 'a', header=self.rows == 0, index=False)
+        else:
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError:
+                raise ImportError("Parquet output needs pyarrow: pip install pyarrow")
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.path, table.schema)
+            self._parquet_writer.write_table(table)
+        self.rows += len(df)
+
+    def close(self):
+        if self._columnar_writer is not None:
+            self._columnar_writer.close()
+            self._columnar_writer = None
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _write_shard(args):
+    """Worker entry point: write one shard to its own part file"""
+    profile, shard_index, start, count, total, seed, chunk_rows, path, fmt = args
+    with ChunkWriter(path, fmt) as writer:
+        for chunk in iter_shard(profile, shard_index, start, count, total, seed, chunk_rows):
+            writer.write(chunk)
+    return path, writer.rows
+
+
+def write_dataset(profile, n_rows, output, fmt='csv', seed=42, workers=1,
+                  chunk_rows=DEFAULT_CHUNK_ROWS, shard_rows=DEFAULT_SHARD_ROWS):
+    """
+    Write a synthetic dataset with bounded memory.
+
+    If output has a file extension, shards are written one after another
+    into that single file. Otherwise output is treated as a directory and
+    each shard becomes part-NNNNN.<ext>, generated in parallel by up to
+    `workers` processes. Returns the list of files written.
+    """
+    plan = shard_plan(n_rows, shard_rows)
+
+    if os.path.splitext(output)[1]:
+        with ChunkWriter(output, fmt) as writer:
+            for chunk in iter_chunks(profile, n_rows, seed, chunk_rows, shard_rows):
+                writer.write(chunk)
+        return [output]
+
+    os.makedirs(output, exist_ok=True)
+    jobs = [
+        (profile, shard_index, start, count, n_rows, seed, chunk_rows,
+         os.path.join(output, f"part-{shard_index:05d}{EXTENSIONS[fmt]}"), fmt)
+        for shard_index, start, count in plan
+    ]
+    if workers <= 1:
+        results = [_write_shard(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_write_shard, jobs))
+    return [path for path, _ in results]
+
+
+def main():
+    """
+    Command line entry point
+    """
+    parser = argparse.ArgumentParser(description="Generate synthetic PageSpeed training data")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="websites")
+    parser.add_argument("--rows", type=int, default=300)
+    parser.add_argument("--output", default="data/raw/websites.csv",
+                        help="File path, or a directory for sharded parallel output")
+    parser.add_argument("--format", choices=FORMATS, default="csv")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument("--shard-rows", type=int, default=DEFAULT_SHARD_ROWS)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"🎭 GENERATING {args.rows:,} '{args.profile}' ROWS")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    paths = write_dataset(args.profile, args.rows, args.output, args.format, args.seed,
+                          args.workers, args.chunk_rows, args.shard_rows)
+    elapsed = time.perf_counter() - start
+
+    print(f"✅ Wrote {len(paths)} file(s) in {elapsed:.1f}s "
+          f"({args.rows / max(elapsed, 1e-9):,.0f} rows/s)")
+    print(f"💾 Output: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
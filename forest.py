@@ -0,0 +1,491 @@
+"""
+Forest-level inference helpers for the trained RandomForestClassifier.
+
+A RandomForest's predict_proba is the mean of its trees' class
+probabilities, so trees can be evaluated a chunk at a time and the
+running sums inspected between chunks.
+"""
+
+import copy
+import io
+import time
+
+import joblib
+import numpy as np
+from scipy import sparse
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.tree._tree import TREE_LEAF, TREE_UNDEFINED, Tree
+
+
+def _tree_proba(tree, X):
+    """
+    Class probabilities from one fitted tree.
+    Calls the low-level tree directly to skip per-call input validation;
+    X must already be C-contiguous float32.
+    """
+    return tree.tree_.predict(X)[:, :tree.n_classes_]
+
+
+def predict_proba_early_exit(model, X, chunk_size=10, confidence=None):
+    """
+    Evaluate the forest's trees in chunks and stop early per row.
+
+    A row stops as soon as its leading class can no longer be overturned:
+    each remaining tree adds at most 1.0 to any class, so once
+    (leader - runner_up) > trees_left the final argmax is fixed and the
+    label is guaranteed to match model.predict().
+
+    If confidence is given (e.g. 0.9), a row also stops once the running
+    mean probability of its leading class reaches that value. This is
+    faster but no longer guarantees the full-forest label.
+
+    Returns (probabilities, trees_used). Probabilities are the mean over
+    the trees actually evaluated for each row.
+    """
+    X = np.ascontiguousarray(X, dtype=np.float32)
+    estimators = model.estimators_
+    n_trees = len(estimators)
+    n_rows = X.shape[0]
+    n_classes = len(model.classes_)
+
+    probabilities = np.zeros((n_rows, n_classes), dtype=np.float64)
+    trees_used = np.full(n_rows, n_trees, dtype=np.int32)
+
+    # Rows still being scored, kept compacted so each tree only sees them
+    active = np.arange(n_rows)
+    X_active = X
+    sums = np.zeros((n_rows, n_classes), dtype=np.float64)
+
+    evaluated = 0
+    for start in range(0, n_trees, chunk_size):
+        chunk = estimators[start:start + chunk_size]
+        for tree in chunk:
+            sums += _tree_proba(tree, X_active)
+        evaluated += len(chunk)
+
+        trees_left = n_trees - evaluated
+        if trees_left == 0:
+            break
+
+        top_two = np.partition(sums, n_classes - 2, axis=1)[:, -2:]
+        done = (top_two[:, 1] - top_two[:, 0]) > trees_left
+        if confidence is not None:
+            done |= top_two[:, 1] >= confidence * evaluated
+
+        if done.any():
+            finished = active[done]
+            probabilities[finished] = sums[done] / evaluated
+            trees_used[finished] = evaluated
+
+            keep = ~done
+            active = active[keep]
+            if active.size == 0:
+                return probabilities, trees_used
+            X_active = np.ascontiguousarray(X_active[keep])
+            sums = sums[keep]
+
+    probabilities[active] = sums / evaluated
+    trees_used[active] = evaluated
+    return probabilities, trees_used
+
+
+def predict_early_exit(model, X, chunk_size=10, confidence=None):
+    """
+    Early-exit version of model.predict().
+    Returns (labels, probabilities, trees_used).
+    """
+    probabilities, trees_used = predict_proba_early_exit(model, X, chunk_size, confidence)
+    labels = model.classes_.take(probabilities.argmax(axis=1))
+    return labels, probabilities, trees_used
+
+
+# ---------------------------------------------------------------------------
+# Compaction: smaller forests for a latency / size budget
+# ---------------------------------------------------------------------------
+
+def model_size_bytes(model):
+    """Size of the model as joblib would write it to disk"""
+    buffer = io.BytesIO()
+    joblib.dump(model, buffer)
+    return buffer.tell()
+
+
+def measure_latency(model, X, repeats=50):
+    """
+    Median single-row and full-batch predict_proba latency in milliseconds.
+    The model is timed with n_jobs=1, which is how it is served.
+    """
+    model = copy.copy(model)
+    if hasattr(model, "n_jobs"):
+        model.n_jobs = 1
+
+    row = X[:1]
+    model.predict_proba(row)  # warm-up
+
+    single = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        model.predict_proba(row)
+        single.append(time.perf_counter() - start)
+
+    batch = []
+    for _ in range(max(3, repeats // 10)):
+        start = time.perf_counter()
+        model.predict_proba(X)
+        batch.append(time.perf_counter() - start)
+
+    return float(np.median(single) * 1000), float(np.median(batch) * 1000)
+
+
+def subset_forest(model, tree_indices):
+    """Copy of the forest that keeps only the given trees"""
+    compact = copy.copy(model)
+    compact.estimators_ = [model.estimators_[i] for i in tree_indices]
+    compact.n_estimators = len(compact.estimators_)
+    if hasattr(model, "estimators_samples_"):
+        # Cached bootstrap indices no longer line up with the kept trees
+        compact.__dict__.pop("_estimators_samples", None)
+    return compact
+
+
+def select_trees(model, X, n_trees):
+    """
+    Greedy forward selection of n_trees trees whose averaged vote best
+    reproduces the full forest's labels on X.
+    Returns the chosen tree indices in selection order.
+    """
+    X = np.ascontiguousarray(X, dtype=np.float32)
+    per_tree = np.stack([_tree_proba(tree, X) for tree in model.estimators_])
+    target = per_tree.mean(axis=0).argmax(axis=1)
+
+    chosen = []
+    running = np.zeros(per_tree.shape[1:], dtype=np.float64)
+    remaining = list(range(len(model.estimators_)))
+
+    for _ in range(min(n_trees, len(remaining))):
+        candidates = running[None, :, :] + per_tree[remaining]
+        agreement = (candidates.argmax(axis=2) == target[None, :]).mean(axis=1)
+        best = int(np.argmax(agreement))
+        chosen.append(remaining.pop(best))
+        running += per_tree[chosen[-1]]
+
+    return chosen
+
+
+def _prune_tree_to_depth(tree, max_depth):
+    """
+    Copy of a fitted DecisionTree truncated at max_depth.
+    Internal node values already hold the class distribution of the samples
+    reaching them, so cutting a node turns it into a valid leaf. Nodes below
+    the cut are dropped and the remaining ones renumbered.
+    """
+    state = tree.tree_.__getstate__()
+    nodes = state["nodes"]
+    values = state["values"]
+
+    old_ids = []
+    depths = []
+    queue = [(0, 0)]
+    while queue:
+        node_id, depth = queue.pop(0)
+        old_ids.append(node_id)
+        depths.append(depth)
+        if depth < max_depth and nodes[node_id]["left_child"] != TREE_LEAF:
+            queue.append((nodes[node_id]["left_child"], depth + 1))
+            queue.append((nodes[node_id]["right_child"], depth + 1))
+
+    new_id = {old: new for new, old in enumerate(old_ids)}
+    new_nodes = nodes[old_ids].copy()
+    for i, (old, depth) in enumerate(zip(old_ids, depths)):
+        if depth >= max_depth or nodes[old]["left_child"] == TREE_LEAF:
+            new_nodes[i]["left_child"] = TREE_LEAF
+            new_nodes[i]["right_child"] = TREE_LEAF
+            new_nodes[i]["feature"] = TREE_UNDEFINED
+            new_nodes[i]["threshold"] = TREE_UNDEFINED
+        else:
+            new_nodes[i]["left_child"] = new_id[nodes[old]["left_child"]]
+            new_nodes[i]["right_child"] = new_id[nodes[old]["right_child"]]
+
+    pruned_tree = Tree(tree.tree_.n_features, np.array(tree.tree_.n_classes, dtype=np.intp),
+                       tree.tree_.n_outputs)
+    pruned_tree.__setstate__({
+        "max_depth": min(state["max_depth"], max_depth),
+        "node_count": len(old_ids),
+        "nodes": new_nodes,
+        "values": np.ascontiguousarray(values[old_ids])
+    })
+
+    pruned = copy.copy(tree)
+    pruned.tree_ = pruned_tree
+    pruned.max_depth = max_depth
+    return pruned
+
+
+def prune_forest_depth(model, max_depth):
+    """Copy of the forest with every tree truncated at max_depth"""
+    compact = copy.copy(model)
+    compact.estimators_ = [_prune_tree_to_depth(tree, max_depth) for tree in model.estimators_]
+    compact.max_depth = max_depth
+    return compact
+
+
+def distill_forest(model, X, n_trees, max_depth=None, random_state=42):
+    """
+    Train a smaller RandomForest on the teacher forest's own labels for X.
+    The student learns the teacher's decision surface rather than the noisy
+    original targets.
+    """
+    teacher_labels = model.predict(X)
+    student = RandomForestClassifier(
+        n_estimators=n_trees,
+        max_depth=max_depth,
+        min_samples_split=getattr(model, "min_samples_split", 2),
+        min_samples_leaf=getattr(model, "min_samples_leaf", 1),
+        random_state=random_state,
+        n_jobs=-1
+    )
+    student.fit(X, teacher_labels)
+    return student
+
+
+def compact_forest(model, X_fit, X_timing, max_latency_ms=None, max_size_kb=None,
+                   strategies=("select", "prune", "distill"), tree_counts=None, depths=None):
+    """
+    Search for the compact model that best reproduces the full forest while
+    meeting the latency and/or size budget.
+
+    Candidates are built from X_fit (the training split) and scored by their
+    agreement with the full forest on X_fit; X_timing is used for the
+    latency measurement. Returns (best, candidates) where each candidate is a
+    dict with the model, strategy, n_trees, max_depth, fidelity, latency_ms,
+    batch_ms and size_kb. best is None if nothing fits the budget.
+    """
+    n_full = len(model.estimators_)
+    full_depth = max(tree.get_depth() for tree in model.estimators_)
+    if tree_counts is None:
+        tree_counts = sorted({n for n in (5, 10, 20, 30, 50, 75, 100, n_full) if n <= n_full})
+    if depths is None:
+        depths = sorted({d for d in (4, 6, 8, full_depth) if d <= full_depth})
+
+    target = model.predict(X_fit)
+    selection_order = select_trees(model, X_fit, max(tree_counts)) if "select" in strategies else []
+
+    builders = []
+    for n_trees in tree_counts:
+        if "select" in strategies:
+            builders.append(("select", n_trees, full_depth,
+                             lambda n=n_trees: subset_forest(model, selection_order[:n])))
+        for depth in depths:
+            if "prune" in strategies and depth < full_depth:
+                builders.append(("prune", n_trees, depth,
+                                 lambda n=n_trees, d=depth: prune_forest_depth(
+                                     subset_forest(model, selection_order[:n]) if selection_order
+                                     else subset_forest(model, range(n)), d)))
+            if "distill" in strategies and n_trees < n_full:
+                builders.append(("distill", n_trees, depth,
+                                 lambda n=n_trees, d=depth: distill_forest(model, X_fit, n, d)))
+
+    candidates = []
+    for strategy, n_trees, depth, build in builders:
+        candidate = build()
+        latency_ms, batch_ms = measure_latency(candidate, X_timing)
+        size_kb = model_size_bytes(candidate) / 1024
+        candidates.append({
+            "model": candidate,
+            "strategy": strategy,
+            "n_trees": n_trees,
+            "max_depth": depth,
+            "fidelity": float((candidate.predict(X_fit) == target).mean()),
+            "latency_ms": latency_ms,
+            "batch_ms": batch_ms,
+            "size_kb": size_kb
+        })
+
+    within_budget = [
+        c for c in candidates
+        if (max_latency_ms is None or c["latency_ms"] <= max_latency_ms)
+        and (max_size_kb is None or c["size_kb"] <= max_size_kb)
+    ]
+    # Best fidelity wins; ties go to the cheaper model
+    best = max(within_budget, key=lambda c: (c["fidelity"], -c["latency_ms"]), default=None)
+    return best, candidates
+
+
+# ---------------------------------------------------------------------------
+# Incremental growth: add trees for new rows, retire old or weak ones
+# ---------------------------------------------------------------------------
+
+def _align_tree_classes(tree, columns, n_classes):
+    """
+    Copy of a forest tree whose outputs cover all n_classes of the target
+    forest. Trees inside a forest are fitted on encoded labels, so output k
+    of this tree is written to column columns[k]; a tree fitted on a batch
+    that lacked some classes gets zeros for them.
+    """
+    if tree.n_classes_ == n_classes and np.array_equal(columns, np.arange(n_classes)):
+        return tree
+
+    state = tree.tree_.__getstate__()
+    values = np.zeros(state["values"].shape[:2] + (n_classes,), dtype=state["values"].dtype)
+    values[:, :, columns] = state["values"][:, :, :len(columns)]
+
+    aligned_tree = Tree(tree.tree_.n_features, np.array([n_classes], dtype=np.intp),
+                        tree.tree_.n_outputs)
+    aligned_tree.__setstate__({**state, "values": np.ascontiguousarray(values)})
+
+    aligned = copy.copy(tree)
+    aligned.tree_ = aligned_tree
+    aligned.classes_ = np.arange(n_classes, dtype=np.float64)
+    aligned.n_classes_ = n_classes
+    return aligned
+
+
+def tree_accuracies(model, X, y):
+    """Accuracy of every individual tree on (X, y), in forest order"""
+    X = np.ascontiguousarray(X, dtype=np.float32)
+    codes = np.searchsorted(model.classes_, y)
+    return np.array([(_tree_proba(tree, X).argmax(axis=1) == codes).mean()
+                     for tree in model.estimators_])
+
+
+def grow_forest(model, X_new, y_new, n_new_trees, max_trees=None, retire="oldest",
+                random_state=None):
+    """
+    Fit n_new_trees on the new rows only and add them to a copy of the forest.
+
+    Trees are kept oldest first, so the forest stays a record of when each
+    tree was trained. If the grown forest exceeds max_trees (default: the
+    current size) the surplus is retired from the existing trees, either
+    the oldest ones or the ones scoring worst on the new rows, which they
+    have never seen. The cost is one small forest fit on the new rows,
+    independent of how much data the existing trees were trained on.
+
+    Returns (grown, info) where info lists the retired tree indices and,
+    for retire='weakest', the old trees' accuracies on the new rows.
+    """
+    if retire not in ("oldest", "weakest"):
+        raise ValueError(f"Unknown retire strategy: {retire}")
+    X_new = np.asarray(X_new)
+    y_new = np.asarray(y_new)
+    if X_new.shape[1] != model.n_features_in_:
+        raise ValueError(f"Expected {model.n_features_in_} features, got {X_new.shape[1]}")
+    unknown = set(np.unique(y_new)) - set(model.classes_)
+    if unknown:
+        raise ValueError(f"Labels not known to the model: {sorted(unknown)}")
+
+    n_old = len(model.estimators_)
+    max_trees = n_old if max_trees is None else max_trees
+    if n_new_trees > max_trees:
+        raise ValueError(f"Cannot add {n_new_trees} trees to a forest capped at {max_trees}")
+
+    params = model.get_params()
+    params.update(n_estimators=n_new_trees, warm_start=False, oob_score=False,
+                  random_state=random_state)
+    batch = RandomForestClassifier(**params).fit(X_new, y_new)
+    columns = np.searchsorted(model.classes_, batch.classes_)
+    new_trees = [_align_tree_classes(tree, columns, len(model.classes_)) for tree in batch.estimators_]
+
+    n_retire = max(0, n_old + n_new_trees - max_trees)
+    scores = None
+    if retire == "oldest":
+        retired = list(range(n_retire))
+    else:
+        scores = tree_accuracies(model, X_new, y_new)
+        # Stable sort: among equally weak trees the oldest goes first
+        retired = sorted(np.argsort(scores, kind="stable")[:n_retire].tolist())
+
+    retired_set = set(retired)
+    grown = subset_forest(model, [i for i in range(n_old) if i not in retired_set])
+    grown.estimators_ = grown.estimators_ + new_trees
+    grown.n_estimators = len(grown.estimators_)
+    grown.__dict__.pop("oob_score_", None)
+    grown.__dict__.pop("oob_decision_function_", None)
+
+    return grown, {
+        "added": n_new_trees,
+        "retired": retired,
+        "old_tree_accuracy": scores
+    }
+
+
+# ---------------------------------------------------------------------------
+# Attributions: per-feature contributions to each prediction
+# ---------------------------------------------------------------------------
+
+class TreeAttributor:
+    """
+    Saabas-style path attributions for a fitted forest.
+
+    Every split moves a sample from a parent node to a child node, and the
+    child's class distribution differs from the parent's by a fixed delta.
+    Crediting that delta to the parent's split feature makes each tree's
+    output decompose exactly as
+
+        leaf value = root value + sum of deltas along the path
+
+    The deltas for all trees are precomputed once into a sparse
+    (total_nodes x n_features * n_classes) matrix, so explaining a batch is
+    one decision_path walk plus one sparse matrix product.
+    """
+
+    def __init__(self, model, feature_names=None):
+        self.model = model
+        self.classes_ = model.classes_
+        self.n_classes = len(model.classes_)
+        self.n_features = model.n_features_in_
+        self.feature_names = list(feature_names) if feature_names is not None else [
+            f"feature_{i}" for i in range(self.n_features)
+        ]
+
+        rows, cols, data = [], [], []
+        bias = np.zeros(self.n_classes)
+        offset = 0
+        for tree in model.estimators_:
+            t = tree.tree_
+            values = t.value[:, 0, :self.n_classes]
+            bias += values[0]
+
+            parents = np.flatnonzero(t.children_left != TREE_LEAF)
+            for children in (t.children_left[parents], t.children_right[parents]):
+                delta = values[children] - values[parents]
+                split_feature = t.feature[parents]
+                rows.append(np.repeat(children + offset, self.n_classes))
+                cols.append((split_feature[:, None] * self.n_classes
+                             + np.arange(self.n_classes)[None, :]).ravel())
+                data.append(delta.ravel())
+            offset += t.node_count
+
+        n_trees = len(model.estimators_)
+        self.bias = bias / n_trees
+        self._deltas = sparse.csr_matrix(
+            (np.concatenate(data) / n_trees, (np.concatenate(rows), np.concatenate(cols))),
+            shape=(offset, self.n_features * self.n_classes)
+        )
+
+    def explain(self, X):
+        """
+        Per-feature contributions for each row of (already scaled) X.
+        Returns (bias, contributions) with shapes (n_classes,) and
+        (n_rows, n_features, n_classes); bias + contributions.sum(axis=1)
+        equals model.predict_proba(X).
+        """
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        paths = sparse.hstack(
+            [tree.tree_.decision_path(X) for tree in self.model.estimators_], format="csr"
+        )
+        contributions = (paths @ self._deltas).toarray()
+        return self.bias, contributions.reshape(len(X), self.n_features, self.n_classes)
+
+    def explain_class(self, X, labels):
+        """
+        Contributions towards one class per row (usually the predicted one).
+        Returns a list of {feature: contribution} dicts sorted by magnitude.
+        """
+        _, contributions = self.explain(X)
+        class_index = {cls: i for i, cls in enumerate(self.classes_)}
+        results = []
+        for row, label in zip(contributions, labels):
+            values = row[:, class_index[label]]
+            order = np.argsort(-np.abs(values))
+            results.append({self.feature_names[i]: float(values[i]) for i in order})
+        return results
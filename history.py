@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+ANALYSIS HISTORY: Every analysis, kept for trend queries
+
+Each finished analysis (web app, bulk runs, the HTTP service) is recorded
+with its metrics, prediction, probabilities and the version of the model
+that made it. Rows live in a small SQLite file indexed on
+(url, device, timestamp), so one site's history over any time range is a
+single index range scan.
+
+Trend queries are downsampled inside SQLite: the range is cut into at most
+`max_points` equal time buckets and each bucket is averaged by GROUP BY,
+so a multi-year history comes back as a few hundred points no matter how
+many analyses it holds.
+
+    python history.py stats
+    python history.py trend https://example.com --days 365
+    python history.py export data/raw/history.csv
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_PATH = "data/live/history.sqlite"
+
+# Metrics stored as columns so trend queries can aggregate them in SQL
+TREND_METRICS = [
+    'performance_score', 'seo_score', 'accessibility_score', 'best_practices_score',
+    'first_contentful_paint', 'largest_contentful_paint', 'cumulative_layout_shift',
+    'total_blocking_time', 'speed_index', 'server_response_time'
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS analyses (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL,
+    device TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    prediction TEXT,
+    confidence REAL,
+    model_version TEXT,
+    {metric_columns},
+    metrics TEXT NOT NULL,
+    probabilities TEXT
+);
+CREATE INDEX IF NOT EXISTS analyses_url_device_time ON analyses (url, device, timestamp);
+CREATE TABLE IF NOT EXISTS sites (
+    url TEXT NOT NULL,
+    device TEXT NOT NULL,
+    analyses INTEGER NOT NULL,
+    last REAL NOT NULL,
+    PRIMARY KEY (url, device)
+);
+""".format(metric_columns=",\n    ".join(f"{name} REAL" for name in TREND_METRICS))
+
+
+ROW_COLUMNS = "url, device, timestamp, prediction, confidence, model_version, metrics, probabilities"
+
+
+def _row_dict(row):
+    url, device, timestamp, prediction, confidence, model_version, metrics, probabilities = row
+    return {
+        'url': url, 'device': device, 'timestamp': timestamp, 'prediction': prediction,
+        'confidence': confidence, 'model_version': model_version,
+        'metrics': json.loads(metrics),
+        'probabilities': json.loads(probabilities) if probabilities else None
+    }
+
+
+class History:
+    """Append-only SQLite store of analysis results"""
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+
+    def record(self, url, device, metrics, prediction=None, probabilities=None,
+               model_version=None, timestamp=None):
+        """Store one analysis; timestamp is unix seconds (default: now)"""
+        confidence = max(probabilities.values()) if probabilities else None
+        timestamp = timestamp if timestamp is not None else time.time()
+        columns = ['url', 'device', 'timestamp', 'prediction', 'confidence', 'model_version',
+                   *TREND_METRICS, 'metrics', 'probabilities']
+        values = [url, device, timestamp,
+                  prediction, confidence, model_version,
+                  *[metrics.get(name) for name in TREND_METRICS],
+                  json.dumps(metrics), json.dumps(probabilities) if probabilities else None]
+        with self.lock, self.db:
+            self.db.execute(
+                f"INSERT INTO analyses ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                values
+            )
+            # Per-site summary, so listing sites never scans the analyses
+            self.db.execute(
+                "INSERT INTO sites (url, device, analyses, last) VALUES (?, ?, 1, ?) "
+                "ON CONFLICT(url, device) DO UPDATE SET analyses = analyses + 1, last = MAX(last, excluded.last)",
+                (url, device, timestamp)
+            )
+
+    def urls(self, device=None):
+        """Recorded URLs, most recently analyzed first"""
+        query = "SELECT url FROM sites"
+        params = ()
+        if device:
+            query += " WHERE device = ?"
+            params = (device,)
+        query += " GROUP BY url ORDER BY MAX(last) DESC"
+        with self.lock:
+            return [url for (url,) in self.db.execute(query, params)]
+
+    def span(self, url, device):
+        """(first, last) timestamp recorded for a URL, or None"""
+        with self.lock:
+            first, last = self.db.execute(
+                "SELECT MIN(timestamp), MAX(timestamp) FROM analyses WHERE url = ? AND device = ?",
+                (url, device)
+            ).fetchone()
+        return None if first is None else (first, last)
+
+    def trend(self, url, device, start=None, end=None, metrics=None, max_points=300):
+        """
+        Downsampled history of one URL between start and end (unix seconds;
+        default: everything). Returns one dict per time bucket with the
+        bucket's mean timestamp, its number of analyses ('n') and the mean
+        of each metric, at most max_points of them.
+        """
+        metrics = [name for name in (metrics or TREND_METRICS) if name in TREND_METRICS]
+        if start is None or end is None:
+            span = self.span(url, device)
+            if span is None:
+                return []
+            start = span[0] if start is None else start
+            end = span[1] if end is None else end
+        # end is inclusive, so the last analysis always lands in a bucket
+        bucket = max(1e-6, (end - start) / max_points) * (1 + 1e-9)
+
+        averages = ", ".join(f"AVG({name})" for name in metrics)
+        query = f"""
+            SELECT AVG(timestamp), COUNT(*), {averages}
+            FROM analyses
+            WHERE url = ? AND device = ? AND timestamp >= ? AND timestamp <= ?
+            GROUP BY CAST((timestamp - ?) / ? AS INTEGER)
+            ORDER BY 1
+        """
+        with self.lock:
+            rows = self.db.execute(query, (url, device, start, end, start, bucket)).fetchall()
+        return [{'timestamp': row[0], 'n': row[1], **dict(zip(metrics, row[2:]))} for row in rows]
+
+    def recent(self, url=None, device=None, limit=50):
+        """Latest analyses (newest first) as dicts with parsed metrics"""
+        clauses, params = self._filter(url, device)
+        query = f"SELECT {ROW_COLUMNS} FROM analyses{clauses} ORDER BY timestamp DESC LIMIT ?"
+        with self.lock:
+            rows = self.db.execute(query, [*params, limit]).fetchall()
+        return [_row_dict(row) for row in rows]
+
+    def analyses(self, url=None, device=None, start=None, end=None, chunk_rows=1000):
+        """
+        Every matching analysis, oldest first, as dicts shaped like recent().
+        Rows are read chunk_rows at a time (keyset paging on timestamp, id),
+        so any range can be streamed without holding it in memory.
+        """
+        clauses, params = self._filter(url, device, start, end)
+        clauses += " AND (timestamp, id) > (?, ?)" if clauses else " WHERE (timestamp, id) > (?, ?)"
+        query = f"SELECT {ROW_COLUMNS}, id FROM analyses{clauses} ORDER BY timestamp, id LIMIT ?"
+        after = (float('-inf'), 0)
+        while True:
+            with self.lock:
+                rows = self.db.execute(query, [*params, *after, chunk_rows]).fetchall()
+            for row in rows:
+                yield _row_dict(row[:-1])
+            if len(rows) < chunk_rows:
+                return
+            after = (rows[-1][2], rows[-1][-1])
+
+    @staticmethod
+    def _filter(url=None, device=None, start=None, end=None):
+        """(WHERE clause, params) for the optional filters"""
+        clauses, params = [], []
+        for condition, value in (("url = ?", url), ("device = ?", device),
+                                 ("timestamp >= ?", start), ("timestamp <= ?", end)):
+            if value is not None:
+                clauses.append(condition)
+                params.append(value)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def stats(self):
+        """{'analyses', 'urls', 'first', 'last'}"""
+        with self.lock:
+            count, first, last = self.db.execute(
+                "SELECT COUNT(*), MIN(timestamp), MAX(timestamp) FROM analyses"
+            ).fetchone()
+            urls = self.db.execute("SELECT COUNT(DISTINCT url) FROM sites").fetchone()[0]
+        return {'analyses': count, 'urls': urls, 'first': first, 'last': last}
+
+    def export(self, path, chunk_rows=10_000):
+        """Write every analysis to CSV, reading the table in chunks"""
+        import pandas as pd
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        query = ("SELECT url, device, datetime(timestamp, 'unixepoch') AS timestamp, prediction, "
+                 f"confidence, model_version, {', '.join(TREND_METRICS)} FROM analyses ORDER BY id")
+        rows = 0
+        with self.lock:
+            for i, chunk in enumerate(pd.read_sql_query(query, self.db, chunksize=chunk_rows)):
+                chunk.to_csv(path, mode='w' if i == 0 else 'a', header=i == 0, index=False)
+                rows += len(chunk)
+        return rows
+
+    def close(self):
+        self.db.close()
+
+
+def main():
+    """
+    Command line entry point
+    """
+    parser = argparse.ArgumentParser(description="Inspect or export the analysis history")
+    parser.add_argument("command", choices=["stats", "trend", "export"])
+    parser.add_argument("target", nargs="?", help="URL for trend, output CSV for export")
+    parser.add_argument("--path", default=os.getenv("HISTORY_PATH", DEFAULT_PATH))
+    parser.add_argument("--device", default="mobile")
+    parser.add_argument("--days", type=float, help="Trend window (default: everything)")
+    parser.add_argument("--points", type=int, default=30, help="Trend points to print")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.path):
+        print(f"❌ No history at {args.path}")
+        return
+
+    history = History(args.path)
+    if args.command == "stats":
+        stats = history.stats()
+        print(f"📊 {stats['analyses']} analyses of {stats['urls']} URLs")
+        if stats['first'] is not None:
+            print(f"📅 {time.strftime('%Y-%m-%d %H:%M', time.localtime(stats['first']))} -> "
+                  f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(stats['last']))}")
+    elif args.command == "trend":
+        if not args.target:
+            parser.error("trend needs a URL")
+        start = time.time() - args.days * 86400 if args.days else None
+        end = time.time() if args.days else None
+        points = history.trend(args.target, args.device, start, end,
+                               metrics=['performance_score', 'largest_contentful_paint'],
+                               max_points=args.points)
+        print(f"{'time':<17} {'n':>5} {'perf':>6} {'LCP ms':>8}")
+        for point in points:
+            lcp = point['largest_contentful_paint']
+            perf = point['performance_score']
+            print(f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(point['timestamp'])):<17} "
+                  f"{point['n']:>5} {'-' if perf is None else f'{perf:.1f}':>6} "
+                  f"{'-' if lcp is None else f'{lcp:.0f}':>8}")
+    else:
+        output = args.target or "data/raw/history.csv"
+        rows = history.export(output)
+        print(f"✅ Exported {rows} analyses to {output}")
+    history.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+"""
+Out-of-core training helpers for datasets larger than memory.
+
+The dataset (a CSV, a columnar .cols dataset, or a directory of part
+files written by datagen.py) is read in typed chunks: float32 features,
+a categorical label column and only the columns the model uses. Rows
+without a label are dropped and counted. Two ways to turn the stream
+into a model, both with peak memory bounded by the chunk size and a row
+cap rather than by the dataset size:
+
+    sample_dataset    one pass, stratified reservoir sample of at most
+                      max_rows rows -> fed to the normal in-memory pipeline
+    fit_per_chunk     two passes, fits a few trees on at most chunk_rows
+                      rows at a time and joins them into one forest
+
+    python pipeline.py --chunk-rows 200000 --max-rows 500000
+    python pipeline.py --chunk-rows 200000 --per-chunk
+"""
+
+import copy
+import glob
+import os
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.preprocessing import StandardScaler
+
+import columnar
+import forest
+
+DEFAULT_CHUNK_ROWS = 100_000
+
+PERFORMANCE_BINS = [0, 50, 75, 90, 101]
+PERFORMANCE_LABELS = ['Poor', 'Needs Improvement', 'Good', 'Excellent']
+
+
+def data_files(path):
+    """
+    The dataset itself (a CSV, or its columnar copy when one is up to date),
+    or the sorted part files of a sharded dataset directory
+    """
+    path = columnar.resolve(path)
+    if os.path.isdir(path) and not columnar.is_columnar(path):
+        files = sorted(glob.glob(os.path.join(path, "part-*.csv"))
+                       + glob.glob(os.path.join(path, "part-*" + columnar.SUFFIX)))
+        if not files:
+            raise ValueError(f"No part files in {path}")
+        return files
+    return [path]
+
+
+def add_target(df, target):
+    """Derive the category column from performance_score when it is missing"""
+    if target not in df.columns and 'performance_score' in df.columns:
+        df[target] = pd.cut(
+            df['performance_score'],
+            bins=PERFORMANCE_BINS,
+            labels=PERFORMANCE_LABELS,
+            right=False
+        )
+    if target not in df.columns:
+        raise ValueError(f"Target column '{target}' not found in data")
+    return df
+
+
+def drop_unlabelled(df, target):
+    """
+    Drop rows without a label: a blank category, or a performance_score
+    that is missing or outside PERFORMANCE_BINS (pd.cut gives NaN, which
+    astype(str) would turn into a 'nan' class). Returns (df, rows dropped).
+    """
+    labels = df[target]
+    labelled = labels.notna() & (labels.astype(str).str.strip() != '')
+    dropped = int((~labelled).sum())
+    if dropped:
+        df = df[labelled]
+    return df, dropped
+
+
+def read_chunks(path, features, target, chunk_rows=DEFAULT_CHUNK_ROWS, stats=None):
+    """
+    Yield (X, y, features) per chunk: X is float32, y an object array of labels.
+    Only the model's columns are parsed; features missing from the file are
+    dropped (the same rule as the in-memory load stage). Unlabelled rows are
+    skipped and, when a stats dict is given, counted in stats['rows_dropped'].
+    """
+    if stats is not None:
+        stats.setdefault('rows_dropped', 0)
+    for file_path in data_files(path):
+        if columnar.is_columnar(file_path):
+            dataset = columnar.ColumnarDataset(file_path)
+            header = dataset.columns
+        else:
+            header = pd.read_csv(file_path, nrows=0).columns
+        present = [f for f in features if f in header]
+        label_columns = [c for c in (target, 'performance_score') if c in header][:1]
+
+        if columnar.is_columnar(file_path):
+            # Already typed on disk: chunks are slices of the memory map
+            reader = dataset.iter_frames(present + label_columns, chunk_rows)
+        else:
+            dtype = {f: np.float32 for f in present}
+            if target in label_columns:
+                dtype[target] = 'category'
+            reader = pd.read_csv(file_path, usecols=present + label_columns, dtype=dtype,
+                                 chunksize=chunk_rows)
+        for chunk in reader:
+            chunk, dropped = drop_unlabelled(add_target(chunk, target), target)
+            if stats is not None:
+                stats['rows_dropped'] += dropped
+            X = chunk[present].fillna(0).to_numpy(dtype=np.float32)
+            y = chunk[target].astype(str).to_numpy()
+            yield X, y, present
+
+
+class StratifiedReservoir:
+    """
+    One fixed-size uniform reservoir (Algorithm R) per class.
+
+    Memory is capacity rows per class no matter how many rows stream past;
+    counts keeps the true class totals so a proportional sample can be
+    drawn at the end.
+    """
+
+    def __init__(self, capacity, n_features, seed=42, dtype=np.float32):
+        self.capacity = capacity
+        self.n_features = n_features
+        self.dtype = dtype
+        self.rng = np.random.default_rng(seed)
+        self.samples = {}
+        self.counts = {}
+
+    def add(self, X, y):
+        """Offer a chunk of rows"""
+        for label in np.unique(y):
+            rows = X[y == label]
+            if label not in self.samples:
+                self.samples[label] = np.empty((self.capacity, self.n_features), dtype=self.dtype)
+                self.counts[label] = 0
+            reservoir, seen = self.samples[label], self.counts[label]
+
+            # Stream positions of these rows; the first `capacity` fill the
+            # reservoir, later row t replaces slot j ~ U[0, t] when j < capacity
+            positions = seen + np.arange(len(rows))
+            fill = positions < self.capacity
+            reservoir[positions[fill]] = rows[fill]
+
+            later = np.flatnonzero(~fill)
+            if len(later):
+                slots = self.rng.integers(0, positions[later] + 1)
+                hit = slots < self.capacity
+                slots, later = slots[hit], later[hit]
+                # Sequential semantics: the last row to hit a slot wins
+                _, last = np.unique(slots[::-1], return_index=True)
+                keep = len(slots) - 1 - last
+                reservoir[slots[keep]] = rows[later[keep]]
+
+            self.counts[label] = seen + len(rows)
+
+    def arrays(self, max_rows=None, allocation='proportional'):
+        """
+        Return (X, y) drawn from the reservoirs.
+        allocation='proportional' keeps the stream's class mix; 'equal'
+        gives every class the same share (capped by what it has).
+        """
+        labels = sorted(self.samples)
+        held = {label: min(self.counts[label], self.capacity) for label in labels}
+        total = sum(self.counts.values())
+        max_rows = max_rows or sum(held.values())
+
+        if allocation == 'equal':
+            quota = {label: min(held[label], max_rows // len(labels)) for label in labels}
+        elif allocation == 'proportional':
+            quota = {label: min(held[label], max(1, round(max_rows * self.counts[label] / total)))
+                     for label in labels}
+        else:
+            raise ValueError(f"Unknown allocation: {allocation}")
+
+        X_parts, y_parts = [], []
+        for label in labels:
+            # Reservoir slots are already a uniform sample; a prefix is too
+            X_parts.append(self.samples[label][:quota[label]])
+            y_parts.append(np.full(quota[label], label, dtype=object))
+        return np.concatenate(X_parts), np.concatenate(y_parts)
+
+
+def sample_dataset(path, features, target, max_rows, chunk_rows=DEFAULT_CHUNK_ROWS,
+                   allocation='proportional', seed=42):
+    """
+    One streaming pass that returns a stratified sample of at most max_rows
+    rows as {'X', 'y', 'features', 'rows_seen', 'rows_dropped', 'class_counts'}.
+    """
+    reservoir = None
+    present = None
+    stats = {}
+    for X, y, present in read_chunks(path, features, target, chunk_rows, stats):
+        if reservoir is None:
+            reservoir = StratifiedReservoir(max_rows, len(present), seed=seed)
+        reservoir.add(X, y)
+    if reservoir is None or not reservoir.counts:
+        raise ValueError(f"No labelled rows in {path}")
+
+    X, y = reservoir.arrays(max_rows, allocation)
+    return {
+        'X': X,
+        'y': y,
+        'features': present,
+        'rows_seen': int(sum(reservoir.counts.values())),
+        'rows_dropped': stats['rows_dropped'],
+        'class_counts': dict(reservoir.counts)
+    }
+
+
+def _test_mask(rng, n_rows, test_size):
+    return rng.random(n_rows) < test_size
+
+
+def chunk_tree_budget(n_chunks, n_estimators):
+    """
+    Trees to fit after each chunk, summing to n_estimators. With more trees
+    than chunks every chunk gets its share; with more chunks than trees,
+    consecutive chunks are grouped into n_estimators groups and one tree is
+    fitted on each group (the last chunk of a group carries the budget), so
+    every chunk is offered to some tree.
+    """
+    if n_chunks <= n_estimators:
+        return [len(part) for part in np.array_split(np.arange(n_estimators), n_chunks)]
+    budget = [0] * n_chunks
+    for group in np.array_split(np.arange(n_chunks), n_estimators):
+        budget[group[-1]] = 1
+    return budget
+
+
+def fit_per_chunk(path, features, target, model_params, chunk_rows=DEFAULT_CHUNK_ROWS,
+                  test_size=0.2, max_test_rows=50_000, random_state=42, verbose=True):
+    """
+    Train a forest whose trees are fitted chunk by chunk.
+
+    Pass 1 streams the data once to fit the scaler (StandardScaler.partial_fit),
+    count rows and classes, and keep a bounded stratified test sample. Each
+    row is assigned to test with probability test_size from a seeded stream,
+    so pass 2 can replay the same assignment. Pass 2 fits
+    n_estimators / n_chunks trees on every chunk's training rows (or, with
+    more chunks than trees, one tree per group of consecutive chunks; see
+    chunk_tree_budget) and joins them into one RandomForestClassifier.
+    Training rows go through a StratifiedReservoir of chunk_rows per group,
+    so a fit never sees more than chunk_rows rows however many chunks the
+    group spans. A group whose rows all drew test is skipped.
+
+    Returns {'model', 'scaler', 'features', 'X_test', 'y_test', 'rows_seen',
+    'rows_dropped', 'chunks'} with X_test already scaled.
+    """
+    scaler = StandardScaler()
+    test = None
+    present = None
+    classes = set()
+    n_chunks = 0
+    rows_seen = 0
+    stats = {}
+
+    rng = np.random.default_rng(random_state)
+    for X, y, present in read_chunks(path, features, target, chunk_rows, stats):
+        is_test = _test_mask(rng, len(y), test_size)
+        if test is None:
+            test = StratifiedReservoir(max_test_rows, len(present), seed=random_state)
+        test.add(X[is_test], y[is_test])
+        if (~is_test).any():
+            scaler.partial_fit(X[~is_test])
+        classes.update(np.unique(y[~is_test]))
+        n_chunks += 1
+        rows_seen += len(y)
+    if not rows_seen:
+        raise ValueError(f"No labelled rows in {path}")
+    if not classes:
+        raise ValueError(f"No training rows in {path}; lower test_size")
+
+    classes = np.array(sorted(classes), dtype=object)
+    n_estimators = model_params.get('n_estimators', 100)
+    trees_per_chunk = chunk_tree_budget(n_chunks, n_estimators)
+    if verbose:
+        fits = sum(1 for n in trees_per_chunk if n)
+        print(f"📦 {rows_seen} rows in {n_chunks} chunks -> {fits} fits of "
+              f"{max(trees_per_chunk)} trees at most on {chunk_rows} rows at most")
+        if stats['rows_dropped']:
+            print(f"⚠️  Dropped {stats['rows_dropped']} rows without a label")
+
+    params = {k: v for k, v in model_params.items() if k != 'n_estimators'}
+    trees = []
+    shell = None
+    group = None
+    rng = np.random.default_rng(random_state)
+    for index, (X, y, _) in enumerate(read_chunks(path, features, target, chunk_rows)):
+        is_test = _test_mask(rng, len(y), test_size)
+        seed = None if random_state is None else random_state + index
+        if group is None:
+            group = StratifiedReservoir(chunk_rows, len(present), seed=seed)
+        if (~is_test).any():
+            group.add(scaler.transform(X[~is_test]).astype(np.float32), y[~is_test])
+        n_trees = trees_per_chunk[index]
+        if n_trees == 0:
+            continue
+
+        held = sum(group.counts.values())
+        if not held:
+            group = None
+            continue
+        X_fit, y_fit = group.arrays(min(chunk_rows, held))
+        group = None
+        chunk_forest = RandomForestClassifier(n_estimators=n_trees, n_jobs=-1,
+                                              **{**params, 'random_state': seed})
+        chunk_forest.fit(X_fit, y_fit)
+        columns = np.searchsorted(classes, chunk_forest.classes_)
+        trees.extend(forest._align_tree_classes(tree, columns, len(classes))
+                     for tree in chunk_forest.estimators_)
+        if shell is None:
+            shell = chunk_forest
+
+    model = copy.copy(shell)
+    model.estimators_ = trees
+    model.n_estimators = len(trees)
+    model.classes_ = classes
+    model.n_classes_ = len(classes)
+    model.__dict__.pop('_estimators_samples', None)
+
+    X_test, y_test = test.arrays(max_test_rows)
+    return {
+        'model': model,
+        'scaler': scaler,
+        'features': present,
+        'X_test': scaler.transform(X_test),
+        'y_test': y_test,
+        'rows_seen': rows_seen,
+        'rows_dropped': stats['rows_dropped'],
+        'chunks': n_chunks
+    }
+
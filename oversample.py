@@ -0,0 +1,108 @@
+"""
+Oversampling methods for the pipeline's resample stage.
+
+imblearn's SMOTE runs an exact k-NN search over every minority row, which
+grows super-linearly with the data. The variants here synthesize the same
+kind of rows (x + u * (neighbour - x), u ~ U[0, 1), neighbour among the k
+nearest rows of the same class) but only search for neighbours inside
+small groups of rows, and only once per row used as a base:
+
+    smote_chunked   groups are random chunks of each class
+    smote_approx    groups are k-means cells of each class, so neighbours
+                    found inside a cell are close to the true ones
+    class_weight    no synthetic rows; balanced per-row sample weights
+
+Every class is topped up to the size of the largest one, like SMOTE's
+default sampling strategy.
+"""
+
+import math
+
+import numpy as np
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.neighbors import NearestNeighbors
+from sklearn.utils.class_weight import compute_sample_weight
+
+DEFAULT_CHUNK_ROWS = 5000
+
+
+def _random_groups(n_rows, chunk_rows, rng):
+    """Split a class into random chunks of about chunk_rows rows"""
+    n_groups = max(1, math.ceil(n_rows / chunk_rows))
+    return np.array_split(rng.permutation(n_rows), n_groups)
+
+
+def _kmeans_groups(X, chunk_rows, rng):
+    """Split a class into k-means cells of about chunk_rows rows"""
+    n_groups = max(1, math.ceil(len(X) / chunk_rows))
+    if n_groups == 1:
+        return [np.arange(len(X))]
+    kmeans = MiniBatchKMeans(n_clusters=n_groups, n_init=1, batch_size=4096,
+                             random_state=int(rng.integers(2 ** 31)))
+    labels = kmeans.fit_predict(X)
+    return [np.flatnonzero(labels == cell) for cell in range(n_groups) if (labels == cell).any()]
+
+
+def synthesize(X_class, n_new, groups, k_neighbors, rng):
+    """
+    n_new SMOTE rows for one class, with neighbours searched within groups.
+    New rows are spread over the groups in proportion to their size.
+    """
+    sizes = np.array([len(group) for group in groups], dtype=np.float64)
+    per_group = rng.multinomial(n_new, sizes / sizes.sum())
+
+    parts = []
+    for group, count in zip(groups, per_group):
+        if count == 0:
+            continue
+        X_group = X_class[group]
+        base = rng.integers(len(X_group), size=count)
+        if len(X_group) < 2:
+            # A lone row has no neighbour to interpolate towards
+            parts.append(X_group[base])
+            continue
+
+        k = min(k_neighbors, len(X_group) - 1)
+        neighbours = NearestNeighbors(n_neighbors=k + 1).fit(X_group)
+        # Each distinct base row is queried once; column 0 is the row itself
+        rows, slot = np.unique(base, return_inverse=True)
+        nearest = neighbours.kneighbors(X_group[rows], return_distance=False)[:, 1:]
+        chosen = nearest[slot, rng.integers(k, size=count)]
+        gap = rng.random((count, 1))
+        parts.append(X_group[base] + gap * (X_group[chosen] - X_group[base]))
+
+    return np.concatenate(parts) if parts else np.empty((0, X_class.shape[1]), dtype=X_class.dtype)
+
+
+def smote_partitioned(X, y, strategy='chunked', k_neighbors=5, chunk_rows=DEFAULT_CHUNK_ROWS,
+                      random_state=42):
+    """
+    Oversample every class up to the largest one, searching neighbours
+    within random chunks ('chunked') or k-means cells ('approx') of each
+    class. Returns (X_resampled, y_resampled), originals first.
+    """
+    if strategy not in ('chunked', 'approx'):
+        raise ValueError(f"Unknown partitioning strategy: {strategy}")
+    rng = np.random.default_rng(random_state)
+    classes, counts = np.unique(y, return_counts=True)
+    target = counts.max()
+
+    X_parts, y_parts = [X], [y]
+    for label, count in zip(classes, counts):
+        if count == target:
+            continue
+        X_class = X[y == label]
+        if strategy == 'chunked':
+            groups = _random_groups(len(X_class), chunk_rows, rng)
+        else:
+            groups = _kmeans_groups(X_class, chunk_rows, rng)
+        synthetic = synthesize(X_class, target - count, groups, k_neighbors, rng)
+        X_parts.append(synthetic.astype(X.dtype, copy=False))
+        y_parts.append(np.full(len(synthetic), label, dtype=y.dtype))
+
+    return np.concatenate(X_parts), np.concatenate(y_parts)
+
+
+def balanced_weights(y):
+    """Per-row weights that make every class count equally"""
+    return compute_sample_weight('balanced', y)
@@ -0,0 +1,62 @@
+"""
+Shared-memory helpers for process pools.
+
+The parent publishes NumPy arrays once into named shared-memory blocks;
+worker processes attach to them by name and get zero-copy views, instead
+of every task pickling its own copy of the training data.
+"""
+
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Handles kept alive inside each worker so the views stay valid
+_attached = []
+
+
+class SharedArrays:
+    """
+    Publish a dict of arrays to shared memory for the lifetime of a with-block.
+
+        with SharedArrays({'X': X, 'y': y}) as shared:
+            pool = ProcessPoolExecutor(initializer=init, initargs=(shared.specs,))
+    """
+
+    def __init__(self, arrays):
+        self.specs = {}
+        self._blocks = []
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            view = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+            view[...] = array
+            self._blocks.append(block)
+            self.specs[name] = (block.name, array.shape, array.dtype.str)
+
+    def close(self):
+        """Release and unlink every block"""
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def attach(specs):
+    """
+    Map the published blocks into this process.
+    Returns {name: ndarray} views; call from a pool initializer.
+    """
+    arrays = {}
+    for name, (block_name, shape, dtype) in specs.items():
+        # Pool workers share the parent's resource tracker, so the block is
+        # unlinked exactly once, by SharedArrays.close() in the parent.
+        block = shared_memory.SharedMemory(name=block_name)
+        _attached.append(block)
+        arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+    return arrays
@@ -0,0 +1,623 @@
+#!/usr/bin/env python3
+"""
+TRAINING PIPELINE: One configurable trainer with cached stages
+
+    load -> split -> scale -> resample -> fit -> evaluate -> export
+
+Every stage's output is cached under data/cache/, keyed by a hash of the
+stage's parameters and the keys of the stages it depends on (the load
+stage hashes the data file's contents). Keys are computed before any work
+is done, so changing only the forest hyperparameters loads the cached
+resampled training set and goes straight to the fit stage.
+
+The presets reproduce the four historical trainers:
+    default   -> scripts/02_train_model.py
+    fixed     -> train_model_fixed.py
+    balanced  -> train_with_balanced.py
+    final     -> train_final.py
+
+Examples:
+    python pipeline.py --preset balanced
+    python pipeline.py --preset default --set model.n_estimators=200 --set model.max_depth=14
+    python pipeline.py --preset balanced --search --candidates 27 --workers 4
+    python pipeline.py --preset balanced --cv --folds 5 --repeats 3 --workers 4
+
+A CSV with an up-to-date columnar copy next to it (data/raw/x.cols, see
+columnar.py) is loaded from the copy. Datasets larger than memory are
+read in typed chunks (see outofcore.py):
+    python pipeline.py --chunk-rows 200000 --max-rows 500000
+    python pipeline.py --chunk-rows 200000 --per-chunk
+"""
+
+import argparse
+import ast
+import copy
+import hashlib
+import json
+import os
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import accuracy_score, classification_report
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+
+import columnar
+import outofcore
+import oversample
+
+CACHE_DIR = "data/cache"
+
+BASE_FEATURES = [
+    'first_contentful_paint',
+    'largest_contentful_paint',
+    'cumulative_layout_shift',
+    'total_blocking_time',
+    'total_byte_weight',
+    'meta_description_exists',
+    'title_length',
+    'seo_score',
+    'accessibility_score'
+]
+
+DEFAULT_CONFIG = {
+    'data': {
+        'path': "data/raw/websites.csv",
+        'features': BASE_FEATURES[:4] + ['speed_index'] + BASE_FEATURES[4:],
+        'target': 'performance_category',
+        # Out-of-core reading: chunk_rows switches to typed chunked reads,
+        # max_rows caps the stratified sample kept in memory
+        'chunk_rows': None,
+        'max_rows': None,
+        'allocation': 'proportional'
+    },
+    'split': {'test_size': 0.2, 'random_state': 42},
+    'scale': {'method': 'standard'},
+    # method: smote (exact, imblearn), smote_chunked, smote_approx,
+    # class_weight or none; see oversample.py
+    'resample': {'method': 'smote', 'random_state': 42, 'k_neighbors': 5, 'chunk_rows': 5000},
+    'model': {
+        'n_estimators': 100,
+        'max_depth': 10,
+        'min_samples_split': 5,
+        'min_samples_leaf': 2,
+        'class_weight': 'balanced',
+        'random_state': 42
+    },
+    'export': {'model_dir': "data/model"}
+}
+
+PRESETS = {
+    'default': {},
+    'fixed': {
+        'data': {'path': "data/raw/sample_data.csv", 'features': BASE_FEATURES}
+    },
+    'balanced': {
+        'data': {'path': "data/raw/balanced_data.csv", 'features': BASE_FEATURES},
+        'resample': {'method': 'none'},
+        'model': {'n_estimators': 150, 'max_depth': 12, 'min_samples_leaf': 1, 'class_weight': None}
+    },
+    'final': {
+        'data': {'path': "data/raw/sample_data.csv", 'features': BASE_FEATURES},
+        'resample': {'method': 'none'},
+        'model': {'min_samples_leaf': 1}
+    }
+}
+
+
+def _merge(base, overrides):
+    """Recursively merge override dicts into a copy of base"""
+    merged = copy.deepcopy(base)
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+
+def build_config(preset='default', overrides=None):
+    """Preset settings layered over DEFAULT_CONFIG, then explicit overrides"""
+    config = _merge(DEFAULT_CONFIG, PRESETS[preset])
+    return _merge(config, overrides or {})
+
+
+def parse_overrides(assignments):
+    """Turn ['model.max_depth=12', ...] into a nested override dict"""
+    overrides = {}
+    for assignment in assignments or []:
+        dotted, _, raw = assignment.partition('=')
+        try:
+            value = ast.literal_eval(raw)
+        except (ValueError, SyntaxError):
+            value = raw
+        node = overrides
+        *parents, leaf = dotted.strip().split('.')
+        for part in parents:
+            node = node.setdefault(part, {})
+        node[leaf] = value
+    return overrides
+
+
+def file_digest(path, block_size=1 << 20):
+    """SHA-256 of a file's contents, read in blocks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def data_digest(path):
+    """file_digest of a dataset, or of every file of a columnar or sharded one"""
+    files = []
+    for data_file in outofcore.data_files(path):
+        if os.path.isdir(data_file):
+            files.extend(os.path.join(data_file, name) for name in sorted(os.listdir(data_file)))
+        else:
+            files.append(data_file)
+    if len(files) == 1:
+        return file_digest(files[0])
+    return hashlib.sha256("".join(file_digest(f) for f in files).encode('utf-8')).hexdigest()
+
+
+def export_model(model, scaler, features, model_dir):
+    """Write model.pkl, scaler.pkl and features.pkl for the app"""
+    os.makedirs(model_dir, exist_ok=True)
+    joblib.dump(model, os.path.join(model_dir, 'model.pkl'))
+    joblib.dump(scaler, os.path.join(model_dir, 'scaler.pkl'))
+    joblib.dump(features, os.path.join(model_dir, 'features.pkl'))
+    return model_dir
+
+
+# ---------------------------------------------------------------------------
+# Stages: each takes its config section plus upstream outputs
+# ---------------------------------------------------------------------------
+
+def load_stage(params):
+    """Read the CSV, drop unlabelled rows and keep the configured features that exist"""
+    if params.get('chunk_rows'):
+        return load_chunked(params)
+
+    target = params['target']
+    frames = []
+    for path in outofcore.data_files(params['path']):
+        if columnar.is_columnar(path):
+            # Memory-mapped: only the columns the model needs are touched
+            dataset = columnar.ColumnarDataset(path)
+            wanted = set(params['features']) | {target, 'performance_score'}
+            frames.append(dataset.frame([c for c in dataset.columns if c in wanted]))
+        else:
+            frames.append(pd.read_csv(path))
+    df = pd.concat(frames, ignore_index=True)
+    df, dropped = outofcore.drop_unlabelled(outofcore.add_target(df, target), target)
+
+    features = [f for f in params['features'] if f in df.columns]
+    if len(features) < 3:
+        raise ValueError(f"Not enough features for training: {features}")
+
+    X = df[features].fillna(0).to_numpy(dtype=np.float64)
+    y = df[target].astype(str).to_numpy()
+    return _loaded(X, y, features, dropped)
+
+
+def _loaded(X, y, features, dropped):
+    if dropped:
+        print(f"⚠️  Dropped {dropped} rows without a label")
+    return {'X': X, 'y': y, 'features': features, 'rows_dropped': dropped}
+
+
+def load_chunked(params):
+    """
+    Typed chunked read (float32 features, categorical labels). With
+    max_rows set only a stratified reservoir sample is kept, so memory is
+    bounded whatever the file size.
+    """
+    chunk_rows = params['chunk_rows']
+    if params.get('max_rows'):
+        loaded = outofcore.sample_dataset(
+            params['path'], params['features'], params['target'], params['max_rows'],
+            chunk_rows=chunk_rows, allocation=params.get('allocation', 'proportional')
+        )
+    else:
+        X_parts, y_parts = [], []
+        stats = {}
+        for X, y, features in outofcore.read_chunks(params['path'], params['features'],
+                                                     params['target'], chunk_rows, stats):
+            X_parts.append(X)
+            y_parts.append(y)
+        loaded = {'X': np.concatenate(X_parts), 'y': np.concatenate(y_parts), 'features': features,
+                  'rows_dropped': stats['rows_dropped']}
+
+    if len(loaded['features']) < 3:
+        raise ValueError(f"Not enough features for training: {loaded['features']}")
+    return _loaded(loaded['X'], loaded['y'], loaded['features'], loaded['rows_dropped'])
+
+
+def split_stage(params, loaded):
+    """Stratified train/test split"""
+    X_train, X_test, y_train, y_test = train_test_split(
+        loaded['X'], loaded['y'],
+        test_size=params['test_size'],
+        random_state=params['random_state'],
+        stratify=loaded['y']
+    )
+    return {'X_train': X_train, 'X_test': X_test, 'y_train': y_train, 'y_test': y_test}
+
+
+def scale_stage(params, split):
+    """Fit the scaler on the training split only"""
+    if params['method'] != 'standard':
+        raise ValueError(f"Unknown scaling method: {params['method']}")
+    scaler = StandardScaler()
+    return {
+        'scaler': scaler,
+        'X_train': scaler.fit_transform(split['X_train']),
+        'X_test': scaler.transform(split['X_test']),
+        'y_train': split['y_train'],
+        'y_test': split['y_test']
+    }
+
+
+def resample_stage(params, scaled):
+    """
+    Rebalance the training classes. Returns {'X', 'y'} and, for
+    class_weight, a balanced 'sample_weight' per row.
+    """
+    X, y = scaled['X_train'], scaled['y_train']
+    method = params['method']
+    if method == 'none':
+        return {'X': X, 'y': y}
+    if method == 'smote':
+        from imblearn.over_sampling import SMOTE
+        X_resampled, y_resampled = SMOTE(random_state=params['random_state']).fit_resample(X, y)
+        return {'X': X_resampled, 'y': np.asarray(y_resampled)}
+    if method in ('smote_chunked', 'smote_approx'):
+        X_resampled, y_resampled = oversample.smote_partitioned(
+            X, y,
+            strategy=method.split('_')[1],
+            k_neighbors=params.get('k_neighbors', 5),
+            chunk_rows=params.get('chunk_rows', oversample.DEFAULT_CHUNK_ROWS),
+            random_state=params['random_state']
+        )
+        return {'X': X_resampled, 'y': y_resampled}
+    if method == 'class_weight':
+        return {'X': X, 'y': y, 'sample_weight': oversample.balanced_weights(y)}
+    raise ValueError(f"Unknown resampling method: {method}")
+
+
+def fit_stage(params, resampled):
+    """Train the Random Forest"""
+    sample_weight = resampled.get('sample_weight')
+    if sample_weight is not None:
+        # The resample stage already balanced the classes; don't weight twice
+        params = {**params, 'class_weight': None}
+    model = RandomForestClassifier(**{'n_jobs': -1, **params})
+    model.fit(resampled['X'], resampled['y'], sample_weight=sample_weight)
+    return model
+
+
+def evaluate_stage(params, model, scaled, loaded):
+    """Accuracy, classification report and feature importance on the test split"""
+    y_pred = model.predict(scaled['X_test'])
+    importance = pd.DataFrame({
+        'feature': loaded['features'],
+        'importance': model.feature_importances_
+    }).sort_values('importance', ascending=False)
+    return {
+        'accuracy': float(accuracy_score(scaled['y_test'], y_pred)),
+        'report': classification_report(scaled['y_test'], y_pred, zero_division=0),
+        'importance': importance
+    }
+
+
+STAGES = {
+    # name: (config section, upstream stages, function)
+    'load': ('data', [], load_stage),
+    'split': ('split', ['load'], split_stage),
+    'scale': ('scale', ['split'], scale_stage),
+    'resample': ('resample', ['scale'], resample_stage),
+    'fit': ('model', ['resample'], fit_stage),
+    'evaluate': (None, ['fit', 'scale', 'load'], evaluate_stage)
+}
+
+
+class Pipeline:
+    """
+    Lazily evaluated, content-addressed stage cache.
+
+    output(stage) returns a stage's result, loading it from the cache when
+    a file with the stage's key exists and otherwise computing it (which
+    pulls in only the upstream outputs it actually needs).
+    """
+
+    def __init__(self, config, cache_dir=CACHE_DIR, use_cache=True, verbose=True, fresh=()):
+        self.config = config
+        self.cache_dir = cache_dir
+        self.use_cache = use_cache
+        self.verbose = verbose
+        # Stages always recomputed (still written to the cache), e.g. to time them
+        self.fresh = set(fresh)
+        self.timings = {}
+        self.cache_hits = []
+        self._keys = {}
+        self._outputs = {}
+
+    def _log(self, message):
+        if self.verbose:
+            print(message)
+
+    def _params(self, stage):
+        section = STAGES[stage][0]
+        return self.config[section] if section else {}
+
+    def key(self, stage):
+        """Hash of the stage's parameters and its upstream keys"""
+        if stage not in self._keys:
+            _, deps, _ = STAGES[stage]
+            payload = {
+                'stage': stage,
+                'params': self._params(stage),
+                'deps': [self.key(dep) for dep in deps]
+            }
+            if stage == 'load':
+                payload['file'] = data_digest(self.config['data']['path'])
+            encoded = json.dumps(payload, sort_keys=True, default=str).encode('utf-8')
+            self._keys[stage] = hashlib.sha256(encoded).hexdigest()
+        return self._keys[stage]
+
+    def _cache_path(self, stage):
+        return os.path.join(self.cache_dir, f"{stage}-{self.key(stage)[:20]}.joblib")
+
+    def output(self, stage):
+        """Return a stage's output, from memory, disk cache or by computing it"""
+        if stage in self._outputs:
+            return self._outputs[stage]
+
+        path = self._cache_path(stage)
+        if self.use_cache and stage not in self.fresh and os.path.exists(path):
+            start = time.perf_counter()
+            result = joblib.load(path)
+            self.timings[stage] = time.perf_counter() - start
+            self.cache_hits.append(stage)
+            self._log(f"♻️  {stage:<9} cached ({self.timings[stage]:.2f}s)")
+        else:
+            _, deps, fn = STAGES[stage]
+            inputs = [self.output(dep) for dep in deps]
+            start = time.perf_counter()
+            result = fn(self._params(stage), *inputs)
+            self.timings[stage] = time.perf_counter() - start
+            self._log(f"⚙️  {stage:<9} computed ({self.timings[stage]:.2f}s)")
+            if self.use_cache:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                tmp_path = path + ".tmp"
+                joblib.dump(result, tmp_path)
+                os.replace(tmp_path, path)
+
+        self._outputs[stage] = result
+        return result
+
+    def export(self, model_dir=None):
+        """Write model.pkl, scaler.pkl and features.pkl for the app"""
+        model_dir = model_dir or self.config['export']['model_dir']
+        export_model(self.output('fit'), self.output('scale')['scaler'],
+                     self.output('load')['features'], model_dir)
+        self._log(f"💾 export    {model_dir}/model.pkl, scaler.pkl, features.pkl")
+        return model_dir
+
+    def run(self, export=True):
+        """Run every stage (reusing the cache) and optionally export"""
+        evaluation = self.output('evaluate')
+        if export:
+            self.export()
+        return {
+            'model': self.output('fit'),
+            'scaler': self.output('scale')['scaler'],
+            'features': self.output('load')['features'],
+            'evaluation': evaluation
+        }
+
+
+def train(preset='default', overrides=None, export=True, **pipeline_kwargs):
+    """Convenience wrapper: build the config, run the pipeline, return results"""
+    pipeline = Pipeline(build_config(preset, overrides), **pipeline_kwargs)
+    return pipeline.run(export=export)
+
+
+def train_per_chunk(config, export=True):
+    """
+    Out-of-core alternative to Pipeline.run: trees are fitted chunk by chunk
+    (outofcore.fit_per_chunk), so no stage ever holds the full dataset.
+    Nothing is cached; the resample section is ignored.
+    """
+    data = config['data']
+    result = outofcore.fit_per_chunk(
+        data['path'], data['features'], data['target'], config['model'],
+        chunk_rows=data.get('chunk_rows') or outofcore.DEFAULT_CHUNK_ROWS,
+        test_size=config['split']['test_size'],
+        random_state=config['split']['random_state']
+    )
+    evaluation = evaluate_stage(None, result['model'], result, result)
+    if export:
+        export_model(result['model'], result['scaler'], result['features'],
+                     config['export']['model_dir'])
+        print(f"💾 export    {config['export']['model_dir']}/model.pkl, scaler.pkl, features.pkl")
+    return {
+        'model': result['model'],
+        'scaler': result['scaler'],
+        'features': result['features'],
+        'evaluation': evaluation
+    }
+
+
+RESAMPLE_METHODS = ['none', 'class_weight', 'smote', 'smote_chunked', 'smote_approx']
+
+
+def compare_resampling(config, methods=RESAMPLE_METHODS, cache_dir=CACHE_DIR, use_cache=True):
+    """
+    Run resample -> fit -> evaluate once per method on the same cached
+    split and return one row per method with its timings and test scores.
+    The resample and fit stages are always recomputed so they can be timed.
+    """
+    from sklearn.metrics import f1_score
+
+    rows = []
+    for method in methods:
+        method_config = _merge(config, {'resample': {'method': method}})
+        pipeline = Pipeline(method_config, cache_dir=cache_dir, use_cache=use_cache,
+                            verbose=False, fresh=('resample', 'fit'))
+        scaled = pipeline.output('scale')
+        resampled = pipeline.output('resample')
+        evaluation = pipeline.output('evaluate')
+        y_pred = pipeline.output('fit').predict(scaled['X_test'])
+        rows.append({
+            'method': method,
+            'train_rows': len(resampled['y']),
+            'resample_s': pipeline.timings['resample'],
+            'fit_s': pipeline.timings['fit'],
+            'accuracy': evaluation['accuracy'],
+            'macro_f1': float(f1_score(scaled['y_test'], y_pred, average='macro', zero_division=0))
+        })
+    return rows
+
+
+def run_cv_mode(pipeline, args):
+    """Cross-validate the configured pipeline and print the fold scores"""
+    import crossval
+
+    print(f"\n🔁 {args.folds}-fold CV x {args.repeats} repeat(s)...")
+    result = crossval.run_cv(pipeline, n_splits=args.folds, n_repeats=args.repeats,
+                             workers=args.workers)
+
+    print("\n" + "=" * 60)
+    print("📊 CROSS-VALIDATION")
+    print("=" * 60)
+    for fold in result['folds']:
+        print(f"   repeat {fold['repeat'] + 1} fold {fold['fold'] + 1}: "
+              f"acc {fold['accuracy']:.3f} | macro F1 {fold['macro_f1']:.3f} | {fold['seconds']:.2f}s")
+    print(f"\n✅ Accuracy: {result['accuracy_mean']:.3f} ± {result['accuracy_std']:.3f}")
+    print(f"✅ Macro F1: {result['macro_f1_mean']:.3f} ± {result['macro_f1_std']:.3f}")
+    print(f"⏱️  {result['wall_seconds']:.1f}s wall on {result['workers']} workers "
+          f"({result['fold_seconds']:.1f}s of fold time)")
+
+
+def run_search_mode(pipeline, args):
+    """Run the hyperparameter search, print the frontier, refit the winner"""
+    import search
+
+    print(f"\n🔍 Searching {args.candidates} candidates (eta={args.eta})...")
+    best, frontier, history = search.run_search(
+        pipeline, n_candidates=args.candidates, eta=args.eta, workers=args.workers
+    )
+
+    print("\n" + "=" * 60)
+    print("📈 ACCURACY vs LATENCY FRONTIER (validation split)")
+    print("=" * 60)
+    print(f"{'acc':>6} {'~ms/row':>8} {'budget':>7}  params")
+    for result in frontier:
+        params = ", ".join(f"{k}={v}" for k, v in result['params'].items())
+        print(f"{result['accuracy']:>6.3f} {result['est_full_latency_ms']:>8.2f} "
+              f"{result['budget']:>7.0%}  {params}")
+    print(f"\n({len(history)} fits; latency for partial budgets is extrapolated per tree)")
+
+    # Refit the winner on the full training split; the cached stages up to
+    # resample are reused, only fit/evaluate run again.
+    overrides = {'model': best['params']}
+    print("\n🏆 Best: " + " ".join(f"--set model.{k}={v!r}" for k, v in best['params'].items()))
+    final = Pipeline(_merge(pipeline.config, overrides), cache_dir=pipeline.cache_dir,
+                     use_cache=pipeline.use_cache)
+    result = final.run(export=args.export_best)
+    print(f"✅ Test accuracy: {result['evaluation']['accuracy']:.3f}")
+
+
+def main():
+    """
+    Command line entry point
+    """
+    parser = argparse.ArgumentParser(description="Train the PageSpeed model")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="default")
+    parser.add_argument("--data", help="Override data.path")
+    parser.add_argument("--set", action="append", metavar="SECTION.KEY=VALUE",
+                        help="Override any config value, e.g. model.max_depth=12")
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--no-export", action="store_true")
+    parser.add_argument("--search", action="store_true",
+                        help="Successive-halving hyperparameter search instead of a single fit")
+    parser.add_argument("--candidates", type=int, default=27)
+    parser.add_argument("--eta", type=int, default=3, help="Keep 1/eta of candidates per rung")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--export-best", action="store_true",
+                        help="In search mode, export the winning model")
+    parser.add_argument("--cv", action="store_true",
+                        help="Repeated stratified k-fold CV instead of a single split")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--repeats", type=int, default=1)
+    parser.add_argument("--compare-resampling", nargs="*", metavar="METHOD",
+                        help=f"Time and score resampling methods (default: all of {RESAMPLE_METHODS})")
+    parser.add_argument("--chunk-rows", type=int,
+                        help="Read the data in typed chunks of this many rows")
+    parser.add_argument("--max-rows", type=int,
+                        help="With --chunk-rows, train on a stratified sample of at most this many rows")
+    parser.add_argument("--allocation", choices=["proportional", "equal"],
+                        help="Class mix of the --max-rows sample")
+    parser.add_argument("--per-chunk", action="store_true",
+                        help="Fit trees chunk by chunk instead of sampling (implies --chunk-rows)")
+    args = parser.parse_args()
+
+    overrides = parse_overrides(args.set)
+    if args.data:
+        overrides = _merge(overrides, {'data': {'path': args.data}})
+    for key in ('chunk_rows', 'max_rows', 'allocation'):
+        if getattr(args, key):
+            overrides = _merge(overrides, {'data': {key: getattr(args, key)}})
+    config = build_config(args.preset, overrides)
+
+    print("=" * 60)
+    print(f"🧠 TRAINING PIPELINE ({args.preset})")
+    print("=" * 60)
+
+    if not os.path.exists(config['data']['path']):
+        print(f"❌ No data found at {config['data']['path']}")
+        print("💡 Run: python scripts/01_create_data.py first!")
+        return
+
+    if args.compare_resampling is not None:
+        methods = args.compare_resampling or RESAMPLE_METHODS
+        print(f"\n⚖️  Comparing resampling: {', '.join(methods)}")
+        rows = compare_resampling(config, methods, cache_dir=args.cache_dir,
+                                  use_cache=not args.no_cache)
+        print(f"\n{'method':<14} {'rows':>9} {'resample s':>11} {'fit s':>8} {'accuracy':>9} {'macro F1':>9}")
+        for row in rows:
+            print(f"{row['method']:<14} {row['train_rows']:>9} {row['resample_s']:>11.2f} "
+                  f"{row['fit_s']:>8.2f} {row['accuracy']:>9.3f} {row['macro_f1']:>9.3f}")
+        return
+
+    if args.per_chunk:
+        result = train_per_chunk(config, export=not args.no_export)
+    else:
+        pipeline = Pipeline(config, cache_dir=args.cache_dir, use_cache=not args.no_cache)
+        if args.search:
+            run_search_mode(pipeline, args)
+            return
+        if args.cv:
+            run_cv_mode(pipeline, args)
+            return
+        result = pipeline.run(export=not args.no_export)
+    evaluation = result['evaluation']
+
+    print("\n" + "=" * 60)
+    print("📊 MODEL EVALUATION")
+    print("=" * 60)
+    print(f"✅ Accuracy: {evaluation['accuracy']:.3f}")
+    print("\n📋 Classification Report:")
+    print(evaluation['report'])
+    print("🏆 Top 5 Most Important Features:")
+    print(evaluation['importance'].head())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+REPORT BUNDLES: CSV, JSONL and HTML reports for any set of analyses
+
+A bundle is one zip file:
+
+    summary.csv              one row per analysis (bulk.summary_row columns)
+    results.jsonl            one full result per line
+    index.html               the summary table, linking every report
+    reports/<n>-<site>.html  one page per analysis: scores, charts, advice
+    assets/plotly.min.js     plotly.js, stored once and loaded by every page
+
+Results are consumed one at a time, from a list or any generator (a bulk
+job's snapshot, History.analyses, a JSONL file). Each HTML page is written
+straight into the zip; the CSV, JSONL and index rows go to spooled temp
+files that are copied in at the end. Memory therefore stays flat however
+many analyses are exported, and the only large member, plotly.js, is
+written once per bundle instead of once per page.
+
+    python reports.py bundle.zip --history data/live/history.sqlite --days 30
+    python reports.py bundle.zip --jsonl results.jsonl
+
+Nothing in this module imports Streamlit.
+"""
+
+import argparse
+import csv
+import html
+import io
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+import zipfile
+from datetime import datetime
+
+import analysis
+import bulk
+
+PLOTLY_JS = "assets/plotly.min.js"
+# Spooled files move to disk beyond this size
+SPOOL_BYTES = 1 << 20
+
+STYLE = """
+body { background: #1a1a2e; color: white; font-family: Inter, system-ui, sans-serif; margin: 2rem auto; max-width: 1100px; }
+a { color: #00ff88; }
+table { border-collapse: collapse; width: 100%; }
+th, td { padding: 0.4rem 0.6rem; border-bottom: 1px solid rgba(255,255,255,0.2); text-align: left; }
+.charts { display: grid; grid-template-columns: 1fr 1fr; gap: 1rem; }
+.card { background: rgba(255,255,255,0.08); border-radius: 15px; padding: 1rem 1.5rem; margin: 1rem 0; }
+"""
+
+PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+{head}<style>{style}</style>
+</head>
+<body>
+{body}
+</body>
+</html>
+"""
+
+
+def normalize_result(result):
+    """
+    Result dict in the app's shape from a bulk/comparison result, a History
+    row (timestamp instead of analyzed_at) or a parsed JSONL line
+    """
+    analyzed_at = result.get('analyzed_at')
+    if analyzed_at is None and result.get('timestamp') is not None:
+        analyzed_at = datetime.fromtimestamp(result['timestamp'])
+    elif isinstance(analyzed_at, str):
+        analyzed_at = datetime.fromisoformat(analyzed_at)
+    return {
+        'url': result['url'],
+        'device': result.get('device') or result.get('strategy', ''),
+        'metrics': result.get('metrics'),
+        'prediction': result.get('prediction'),
+        'probabilities': result.get('probabilities'),
+        'analyzed_at': analyzed_at,
+        'timings': result.get('timings') or {},
+        'model_version': result.get('model_version'),
+        'error': result.get('error')
+    }
+
+
+def report_name(index, url):
+    """Zip member name of one analysis' HTML page"""
+    slug = re.sub(r'[^A-Za-z0-9.-]+', '_', re.sub(r'^https?://', '', url)).strip('_')[:60]
+    return f"reports/{index:05d}-{slug}.html"
+
+
+def _script_json(value):
+    # "</" would end the surrounding <script> element early
+    return json.dumps(value).replace("</", "<\\/")
+
+
+def plot_div(spec, div_id):
+    """
+    A chart spec (charts.*_spec) as a div and its Plotly.newPlot call. The
+    specs come from validated templates, so this skips building a Figure.
+    """
+    return (f'<div id="{div_id}"></div><script>Plotly.newPlot("{div_id}", '
+            f'{_script_json(spec["data"])}, {_script_json(spec["layout"])}, '
+            f'{{"displayModeBar": false, "responsive": true}});</script>')
+
+
+def report_page(result):
+    """HTML page for one analysis; loads plotly.js from the bundle's assets"""
+    import charts
+
+    url = html.escape(result['url'])
+    analyzed = result['analyzed_at'].strftime('%Y-%m-%d %H:%M') if result['analyzed_at'] else ''
+    header = (f"<h1>⚡ {url}</h1>"
+              f"<p>{html.escape(result['device'].upper())} · {analyzed}</p>")
+    metrics = result['metrics']
+    if not metrics or not result['probabilities']:
+        body = header + f"<div class='card'>❌ {html.escape(result['error'] or 'No metrics')}</div>"
+        return PAGE.format(title=url, head="", style=STYLE, body=body)
+
+    radar = plot_div(charts.radar_spec(metrics), "radar")
+    probabilities = plot_div(charts.probability_spec(result['probabilities']), "probabilities")
+
+    rows = "".join(
+        f"<tr><td>{html.escape(name.replace('_', ' ').title())}</td><td>{value:,.2f}</td></tr>"
+        for name, value in metrics.items()
+    )
+    advice = "".join(
+        f"<li><b>{html.escape(item['title'])}</b> ({item['priority']}): {html.escape(item['description'])}</li>"
+        for item in analysis.get_recommendations(metrics, result['prediction'])
+    ) or "<li>No issues found</li>"
+
+    body = (
+        header
+        + f"<div class='card'><h2>🤖 {html.escape(result['prediction'])} "
+          f"({max(result['probabilities'].values()):.0%} confidence)</h2></div>"
+        + f"<div class='charts'><div>{radar}</div><div>{probabilities}</div></div>"
+        + f"<div class='card'><h2>📊 Metrics</h2><table>{rows}</table></div>"
+        + f"<div class='card'><h2>💡 Recommendations</h2><ul>{advice}</ul></div>"
+    )
+    return PAGE.format(title=url, head=f'<script src="../{PLOTLY_JS}"></script>\n', style=STYLE, body=body)
+
+
+def format_cell(value):
+    """Index table text for one summary value"""
+    if isinstance(value, float):
+        return f"{value:,.2f}"
+    return str(value)
+
+
+def _spool():
+    return tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES, mode='w+', encoding='utf-8', newline='')
+
+
+def write_bundle(results, target, title="PageSpeed AI reports", html_reports=True):
+    """
+    Stream analyses into a zip bundle at target (a path or a binary file
+    object). Returns the number of analyses written.
+    """
+    count = 0
+    fields = []
+    with zipfile.ZipFile(target, 'w', compression=zipfile.ZIP_DEFLATED) as bundle, \
+            _spool() as summary, _spool() as lines, _spool() as index:
+        writer = None
+        for result in results:
+            result = normalize_result(result)
+            count += 1
+
+            row = bulk.summary_row(result)
+            if writer is None:
+                fields = list(row)
+                writer = csv.DictWriter(summary, fieldnames=fields)
+                writer.writeheader()
+            writer.writerow(row)
+
+            lines.write(json.dumps({**result, 'analyzed_at': result['analyzed_at'].isoformat()
+                                    if result['analyzed_at'] else None}) + "\n")
+
+            cells = "".join(f"<td>{html.escape('' if value is None else format_cell(value))}</td>"
+                            for key, value in row.items() if key != 'url')
+            link = html.escape(result['url'])
+            if html_reports:
+                name = report_name(count, result['url'])
+                bundle.writestr(name, report_page(result))
+                link = f"<a href='{name}'>{link}</a>"
+            index.write(f"<tr><td>{link}</td>{cells}</tr>\n")
+
+        if html_reports and count:
+            from plotly.offline import get_plotlyjs
+            bundle.writestr(PLOTLY_JS, get_plotlyjs())
+
+        for name, source in (("summary.csv", summary), ("results.jsonl", lines)):
+            source.seek(0)
+            with bundle.open(name, 'w') as member, io.TextIOWrapper(member, encoding='utf-8') as text:
+                shutil.copyfileobj(source, text)
+
+        index.seek(0)
+        headers = "".join(f"<th>{html.escape(key)}</th>" for key in fields)
+        with bundle.open("index.html", 'w') as member, io.TextIOWrapper(member, encoding='utf-8') as text:
+            head, tail = PAGE.format(
+                title=html.escape(title), head="", style=STYLE,
+                body=f"<h1>⚡ {html.escape(title)}</h1><p>{count} analyses</p>"
+                     f"<table><tr>{headers}</tr>\n%ROWS%</table>"
+            ).split("%ROWS%")
+            text.write(head)
+            shutil.copyfileobj(index, text)
+            text.write(tail)
+    return count
+
+
+def bundle_bytes(results, title="PageSpeed AI reports", html_reports=True):
+    """
+    Build a bundle in a temp file and return its bytes (for download
+    buttons, which need the finished archive)
+    """
+    with tempfile.TemporaryFile() as f:
+        write_bundle(results, f, title=title, html_reports=html_reports)
+        f.seek(0)
+        return f.read()
+
+
+def read_jsonl(path):
+    """Results from a JSONL file, one per line"""
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def main():
+    """
+    Command line entry point
+    """
+    parser = argparse.ArgumentParser(description="Export analyses as a zip of CSV, JSONL and HTML reports")
+    parser.add_argument("output", help="Zip file to write")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--history", metavar="PATH", help="Export from an analysis history (see history.py)")
+    source.add_argument("--jsonl", metavar="PATH", help="Export results from a JSONL file")
+    parser.add_argument("--url", help="Only this URL (history)")
+    parser.add_argument("--device", help="Only this device (history)")
+    parser.add_argument("--days", type=float, help="Only the last N days (history)")
+    parser.add_argument("--no-html", action="store_true", help="Skip the per-analysis HTML pages")
+    args = parser.parse_args()
+
+    if args.history:
+        import history
+        store = history.History(args.history)
+        start = time.time() - args.days * 86400 if args.days else None
+        results = store.analyses(args.url, args.device, start=start)
+    else:
+        results = read_jsonl(args.jsonl)
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    started = time.perf_counter()
+    count = write_bundle(results, args.output, html_reports=not args.no_html)
+    print(f"✅ Exported {count} analyses to {args.output} "
+          f"({os.path.getsize(args.output) / 1e6:.1f} MB, {time.perf_counter() - started:.1f} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+LIVE SAMPLE RESERVOIR: Bounded, stratified training rows from production
+
+Every analysis the app or the service runs can be offered to a Reservoir.
+It keeps at most `capacity` rows per (performance_category, device)
+stratum using reservoir sampling (Algorithm R), so each stratum holds a
+uniform sample of everything it has seen, the total size is fixed, and
+popular fast sites cannot crowd out the rare slow ones.
+
+Rows live in a small SQLite file rather than in memory. An offer is one
+short transaction that touches a single slot, so memory use is O(1) per
+class and the file is always a complete, trainer-ready sample, even if
+the process is killed. A (url, device) pair the stratum already holds is
+refreshed in its slot instead of being counted again.
+
+    python reservoir.py stats
+    python reservoir.py export data/raw/live_sample.csv
+"""
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import threading
+
+import pandas as pd
+
+import collector
+import columnar
+
+DEFAULT_PATH = "data/live/reservoir.sqlite"
+DEFAULT_CAPACITY = 2000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS strata (
+    stratum TEXT PRIMARY KEY,
+    seen INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS samples (
+    stratum TEXT NOT NULL,
+    slot INTEGER NOT NULL,
+    url TEXT NOT NULL,
+    device TEXT NOT NULL,
+    row TEXT NOT NULL,
+    PRIMARY KEY (stratum, slot)
+);
+CREATE INDEX IF NOT EXISTS samples_url ON samples (url, device);
+"""
+
+
+class Reservoir:
+    """Persistent per-(category, device) reservoir sample of analysis rows"""
+
+    def __init__(self, path=DEFAULT_PATH, capacity=DEFAULT_CAPACITY, seed=None):
+        self.path = path
+        self.capacity = capacity
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.db = sqlite3.connect(path, check_same_thread=False, timeout=30,
+                                  isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+
+    @staticmethod
+    def stratum(category, device):
+        return f"{category}|{device}"
+
+    def offer(self, url, device, metrics, website_type=''):
+        """
+        Offer one analysis. Returns 'added', 'replaced', 'refreshed' or
+        'skipped' (the row lost the reservoir draw).
+        """
+        row = collector.build_row(url, website_type, device, metrics)
+        stratum = self.stratum(row['performance_category'], device)
+        payload = json.dumps(row)
+
+        with self.lock:
+            # IMMEDIATE takes the write lock up front, so concurrent
+            # processes sharing the file serialize their read-modify-write
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                held = self.db.execute(
+                    "SELECT slot FROM samples WHERE stratum = ? AND url = ? AND device = ?",
+                    (stratum, url, device)
+                ).fetchone()
+                if held:
+                    self.db.execute("UPDATE samples SET row = ? WHERE stratum = ? AND slot = ?",
+                                    (payload, stratum, held[0]))
+                    outcome = 'refreshed'
+                else:
+                    seen = self.db.execute("SELECT seen FROM strata WHERE stratum = ?",
+                                           (stratum,)).fetchone()
+                    seen = seen[0] if seen else 0
+                    slot = seen if seen < self.capacity else self.rng.randint(0, seen)
+                    if slot < self.capacity:
+                        self.db.execute(
+                            "INSERT OR REPLACE INTO samples (stratum, slot, url, device, row) "
+                            "VALUES (?, ?, ?, ?, ?)",
+                            (stratum, slot, url, device, payload)
+                        )
+                        outcome = 'added' if seen < self.capacity else 'replaced'
+                    else:
+                        outcome = 'skipped'
+                    self.db.execute(
+                        "INSERT INTO strata (stratum, seen) VALUES (?, 1) "
+                        "ON CONFLICT(stratum) DO UPDATE SET seen = seen + 1",
+                        (stratum,)
+                    )
+                self.db.execute("COMMIT")
+            except Exception:
+                self.db.execute("ROLLBACK")
+                raise
+        return outcome
+
+    def stats(self):
+        """{stratum: {'seen': n, 'held': m}}"""
+        with self.lock:
+            seen = dict(self.db.execute("SELECT stratum, seen FROM strata"))
+            held = dict(self.db.execute("SELECT stratum, COUNT(*) FROM samples GROUP BY stratum"))
+        return {stratum: {'seen': seen.get(stratum, 0), 'held': held.get(stratum, 0)}
+                for stratum in sorted(set(seen) | set(held))}
+
+    def to_frame(self):
+        """The current sample as a training DataFrame (collector.COLUMNS layout)"""
+        with self.lock:
+            rows = [json.loads(row) for (row,) in
+                    self.db.execute("SELECT row FROM samples ORDER BY stratum, slot")]
+        return pd.DataFrame(rows, columns=collector.COLUMNS)
+
+    def export(self, path):
+        """Write the sample as a CSV or, for a .cols path, a columnar dataset"""
+        df = self.to_frame()
+        if path.endswith(columnar.SUFFIX):
+            with columnar.ColumnarWriter(path) as writer:
+                writer.write(df)
+        else:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            df.to_csv(path, index=False)
+        return len(df)
+
+    def close(self):
+        self.db.close()
+
+
+def main():
+    """
+    Command line entry point
+    """
+    parser = argparse.ArgumentParser(description="Inspect or export the live sample reservoir")
+    parser.add_argument("command", choices=["stats", "export"])
+    parser.add_argument("output", nargs="?", default="data/raw/live_sample.csv",
+                        help="Export target (.csv or .cols)")
+    parser.add_argument("--path", default=os.getenv("RESERVOIR_PATH", DEFAULT_PATH))
+    args = parser.parse_args()
+
+    if not os.path.exists(args.path):
+        print(f"❌ No reservoir at {args.path}")
+        return
+
+    reservoir = Reservoir(args.path)
+    if args.command == "stats":
+        print(f"{'category | device':<28} {'seen':>8} {'held':>6}")
+        for stratum, counts in reservoir.stats().items():
+            print(f"{stratum.replace('|', ' | '):<28} {counts['seen']:>8} {counts['held']:>6}")
+    else:
+        rows = reservoir.export(args.output)
+        print(f"✅ Exported {rows} rows to {args.output}")
+    reservoir.close()
+
+
+if __name__ == "__main__":
+    main()
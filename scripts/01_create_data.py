@@ -4,10 +4,15 @@ DATA CREATION SCRIPT: Create initial training data
 NO INTERNET NEEDED - Creates synthetic data immediately
 """
 
-import pandas as pd
-import numpy as np
 import os
-from datetime import datetime
+import sys
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import analysis
+import collector
+import datagen
 from config import DATA_PATH
 
 print("=" * 60)
@@ -18,110 +23,12 @@ def create_synthetic_dataset(num_samples=300):
     """
     Create realistic synthetic data for training
     This runs immediately - no API calls needed
+    For millions of rows use: python datagen.py --profile websites --rows N
     """
     print(f"🎭 Creating {num_samples} synthetic website records...")
     
-    np.random.seed(42)  # For reproducible results
-    
-    data = []
-    
-    for i in range(num_samples):
-        # Generate realistic website metrics
-        website_type = np.random.choice(['ecommerce', 'blog', 'corporate', 'portfolio', 'news'], 
-                                       p=[0.3, 0.25, 0.2, 0.15, 0.1])
-        
-        # Performance metrics based on website type
-        if website_type == 'ecommerce':
-            fcp = np.random.uniform(800, 3500)  # ms
-            lcp = np.random.uniform(1500, 5000)  # ms
-            base_perf = np.random.uniform(40, 90)
-        elif website_type == 'blog':
-            fcp = np.random.uniform(500, 2500)
-            lcp = np.random.uniform(1000, 4000)
-            base_perf = np.random.uniform(60, 95)
-        else:
-            fcp = np.random.uniform(600, 3000)
-            lcp = np.random.uniform(1200, 4500)
-            base_perf = np.random.uniform(50, 92)
-        
-        # Core metrics
-        cls = np.random.uniform(0, 0.4)  # Layout shift
-        tbt = np.random.uniform(0, 600)  # Total blocking time
-        speed_index = np.random.uniform(1000, 5000)
-        page_size = np.random.uniform(500, 8000)  # KB
-        
-        # Calculate performance score based on metrics
-        performance_score = max(0, min(100, 
-            base_perf - (fcp/200 + lcp/300 + cls*50 + tbt/30 + page_size/1000)
-        ))
-        
-        # SEO score (correlated with performance but not exactly)
-        seo_score = max(0, min(100, 
-            performance_score * np.random.uniform(0.8, 1.2)
-        ))
-        
-        # Accessibility score
-        accessibility_score = max(0, min(100, 
-            performance_score * np.random.uniform(0.9, 1.1)
-        ))
-        
-        # Best practices score
-        best_practices_score = max(0, min(100, 
-            performance_score * np.random.uniform(0.85, 1.15)
-        ))
-        
-        # Meta description (1 = exists, 0 = doesn't exist)
-        has_meta = np.random.choice([0, 1], p=[0.3, 0.7])
-        
-        # Title length
-        title_length = np.random.randint(10, 120)
-        
-        # Device type
-        device = np.random.choice(['mobile', 'desktop'])
-        
-        # Create category based on performance score
-        if performance_score >= 90:
-            category = 'Excellent'
-        elif performance_score >= 75:
-            category = 'Good'
-        elif performance_score >= 50:
-            category = 'Needs Improvement'
-        else:
-            category = 'Poor'
-        
-        data.append({
-            'website_id': i + 1,
-            'url': f'https://example{i}.com',
-            'website_type': website_type,
-            'device_type': device,
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            
-            # Scores
-            'performance_score': round(performance_score, 1),
-            'seo_score': round(seo_score, 1),
-            'accessibility_score': round(accessibility_score, 1),
-            'best_practices_score': round(best_practices_score, 1),
-            
-            # Core Web Vitals
-            'first_contentful_paint': round(fcp, 0),
-            'largest_contentful_paint': round(lcp, 0),
-            'cumulative_layout_shift': round(cls, 3),
-            'total_blocking_time': round(tbt, 0),
-            'speed_index': round(speed_index, 0),
-            
-            # Resource metrics
-            'total_byte_weight': round(page_size, 0),
-            
-            # SEO metrics
-            'meta_description_exists': has_meta,
-            'title_length': title_length,
-            
-            # Target for prediction
-            'performance_category': category
-        })
-    
-    # Create DataFrame
-    df = pd.DataFrame(data)
+    # Every column is drawn as one vectorized array (see datagen.py)
+    df = datagen.generate('websites', num_samples, seed=42)
     
     # Save to CSV
     os.makedirs(os.path.dirname(DATA_PATH), exist_ok=True)
@@ -147,15 +54,33 @@ def collect_real_data():
     """
     OPTIONAL: Collect real data from PageSpeed API
     This requires internet and takes time
+    Large corpora: run collector.py as a background job (see its docstring)
     """
     print("🌐 Collecting REAL data from websites...")
-    print("⏳ This will take 10-15 minutes...")
     
-    # You can add real collection here if needed
-    # For now, we'll just use synthetic data
+    seeds_path = input("Seed URL file (one URL per line) [data/seeds/urls.txt]: ").strip()
+    seeds_path = seeds_path or "data/seeds/urls.txt"
+    if not os.path.exists(seeds_path):
+        print(f"❌ Seed file not found: {seeds_path}")
+        print("💡 Falling back to synthetic data")
+        create_synthetic_dataset(200)
+        return False
     
-    create_synthetic_dataset(200)
-    return True
+    api_key = analysis.get_api_key()
+    if not api_key:
+        print("❌ PageSpeed API key is not configured")
+        print("💡 Add PAGESPEED_API_KEY to your .env file")
+        return False
+    
+    seeds = list(collector.read_seeds([seeds_path]))
+    print(f"⏳ {len(seeds)} URLs x {len(collector.STRATEGIES)} strategies, "
+          f"appending to {DATA_PATH} as results arrive...")
+    
+    stats = collector.Collector(DATA_PATH, api_key=api_key, workers=8).run(seeds)
+    
+    print(f"✅ Collected {stats['collected']} real records ({stats['failed']} failed)")
+    print(f"💾 Saved to: {DATA_PATH}")
+    return stats['collected'] > 0
 
 def main():
     """
@@ -1,135 +1,143 @@
 #!/usr/bin/env python3
 """
-TEST SCRIPT: Test the trained model on any website
+ANALYZE SCRIPT: Score websites from the command line with the trained model
+Requires a model from 02_train_model.py (or pipeline.py)
+
+URLs come from the arguments, from --file (a CSV with a `url` column, or
+one URL per line) or, when neither is given, from stdin. They are fetched
+concurrently (--workers) through bulk.BulkJob, so requests share the
+collector's retry, backoff and rate limiting, and each result is written
+as one JSON line the moment it completes:
+
+    {"url", "device", "metrics", "prediction", "probabilities",
+     "confidence", "timings", "analyzed_at", "error"}
+
+Progress and the summary go to stderr, so stdout can be piped straight
+into other tools (jq, reports.py --jsonl, a cron job's log). The exit
+status is 1 if any URL failed. Streamlit is never imported.
+
+Example:
+    python scripts/03_analyze.py https://example.com example.org
+    python scripts/03_analyze.py --file seeds.csv --workers 8 -o results.jsonl
+    cat urls.txt | python scripts/03_analyze.py --device desktop | jq .prediction
 """
 
-import sys
-import os
-import joblib
-import requests
+import argparse
+import io
 import json
-from config import API_KEY, MODEL_PATH, SCALER_PATH
+import os
+import sys
+import threading
+import time
 
-# Add parent directory
+# Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-print("=" * 60)
-print("🔍 TEST MODEL WITH REAL WEBSITE")
-print("=" * 60)
 
-def get_real_time_data(url):
+def result_line(result):
+    """One JSON line for a BulkJob result dict"""
+    probabilities = result['probabilities']
+    return json.dumps({
+        'url': result['url'],
+        'device': result['device'],
+        'metrics': result['metrics'],
+        'prediction': result['prediction'],
+        'probabilities': probabilities,
+        'confidence': max(probabilities.values()) if probabilities else None,
+        'timings': {stage: round(seconds, 4) for stage, seconds in result['timings'].items()},
+        'analyzed_at': result['analyzed_at'].isoformat(),
+        'error': result['error']
+    })
+
+
+def log(message):
+    print(message, file=sys.stderr, flush=True)
+
+
+def main():
     """
-    Get real-time data from PageSpeed API
+    Main analysis function
     """
-    print(f"\n🌐 Fetching real-time data for: {url}")
-    
+    started = time.perf_counter()
+    parser = argparse.ArgumentParser(description="Analyze websites and stream JSONL results")
+    parser.add_argument("urls", nargs="*", help="URLs to analyze ('-' reads stdin)")
+    parser.add_argument("-f", "--file", action="append", default=[],
+                        help="CSV with a url column, or one URL per line (repeatable)")
+    parser.add_argument("-d", "--device", choices=["mobile", "desktop"], default="mobile")
+    parser.add_argument("-w", "--workers", type=int, default=4, help="Concurrent PageSpeed requests")
+    parser.add_argument("-o", "--output", help="Write JSONL here instead of stdout")
+    parser.add_argument("--model-dir", default="data/model")
+    parser.add_argument("-q", "--quiet", action="store_true", help="No progress on stderr")
+    args = parser.parse_args()
+
+    # Imported after argument parsing, so --help and usage errors return at once
+    import analysis
+    import bulk
+    import collector
+
+    sources = list(args.file)
+    inline = [url for url in args.urls if url != '-']
+    if inline:
+        sources.append(io.StringIO("\n".join(inline)))
+    if '-' in args.urls or not (args.urls or args.file):
+        if sys.stdin.isatty():
+            parser.error("give URLs as arguments, with --file, or on stdin")
+        # read_seeds rewinds to sniff a CSV header, which a pipe cannot do
+        sources.append(io.StringIO(sys.stdin.read()))
+    urls = [url for url, _ in collector.read_seeds(sources)]
+    if not urls:
+        parser.error("no URLs to analyze")
+
+    api_key = analysis.get_api_key()
+    if not api_key:
+        log("❌ PAGESPEED_API_KEY is not set (environment or .env)")
+        return 2
     try:
-        response = requests.get(
-            "https://www.googleapis.com/pagespeedonline/v5/runPagespeed",
-            params={
-                'url': url,
-                'key': API_KEY,
-                'strategy': 'mobile',
-                'category': ['PERFORMANCE', 'SEO', 'ACCESSIBILITY']
-            },
-            timeout=30
-        )
-        
-        if response.status_code == 200:
-            data = response.json()
-            
-            # Extract metrics
-            metrics = {}
-            categories = data['lighthouseResult']['categories']
-            
-            metrics['performance_score'] = categories.get('performance', {}).get('score', 0) * 100
-            metrics['seo_score'] = categories.get('seo', {}).get('score', 0) * 100
-            metrics['accessibility_score'] = categories.get('accessibility', {}).get('score', 0) * 100
-            
-            audits = data['lighthouseResult']['audits']
-            
-            metrics['first_contentful_paint'] = audits.get('first-contentful-paint', {}).get('numericValue', 0)
-            metrics['largest_contentful_paint'] = audits.get('largest-contentful-paint', {}).get('numericValue', 0)
-            metrics['cumulative_layout_shift'] = audits.get('cumulative-layout-shift', {}).get('numericValue', 0)
-            metrics['total_blocking_time'] = audits.get('total-blocking-time', {}).get('numericValue', 0)
-            metrics['speed_index'] = audits.get('speed-index', {}).get('numericValue', 0)
-            metrics['total_byte_weight'] = audits.get('total-byte-weight', {}).get('numericValue', 0) / 1024
-            
-            # SEO metrics
-            metrics['meta_description_exists'] = 1 if audits.get('meta-description', {}).get('score', 0) == 1 else 0
-            
-            # Title length
-            title_audit = audits.get('document-title', {})
-            if title_audit.get('details', {}).get('items'):
-                metrics['title_length'] = len(title_audit['details']['items'][0].get('title', ''))
-            else:
-                metrics['title_length'] = 0
-            
-            print("✅ Real-time data fetched successfully!")
-            return metrics
-            
-        else:
-            print(f"❌ API Error: {response.status_code}")
-            return None
-            
+        model, scaler, features = analysis.load_model(args.model_dir)
     except Exception as e:
-        print(f"❌ Error: {e}")
-        return None
+        log(f"❌ Error loading model: {e}")
+        log("💡 Run: python scripts/02_train_model.py first!")
+        return 2
+    if not args.quiet:
+        log(f"🔍 Analyzing {len(urls)} URLs ({args.device}, {args.workers} workers), "
+            f"ready in {time.perf_counter() - started:.2f} s")
+
+    output = open(args.output, "w") if args.output else sys.stdout
+    write_lock = threading.Lock()
+    counts = {'done': 0, 'failed': 0}
+
+    def emit(result):
+        # Called from the job's worker threads
+        line = result_line(result)
+        with write_lock:
+            output.write(line + "\n")
+            output.flush()
+            counts['done'] += 1
+            counts['failed'] += bool(result['error'])
+            if not args.quiet:
+                status = f"❌ {result['error']}" if result['error'] else f"✅ {result['prediction']}"
+                log(f"   [{counts['done']}/{len(urls)}] {result['url']} {status}")
+
+    job = bulk.BulkJob(urls, args.device, api_key, model, scaler, features,
+                       workers=args.workers, on_result=emit)
+    try:
+        while job.running:
+            time.sleep(0.1)
+    except KeyboardInterrupt:
+        log("⏹️  Stopping: finishing requests in flight...")
+        job.cancel()
+        while job.running:
+            time.sleep(0.1)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    if not args.quiet:
+        seconds = time.perf_counter() - started
+        log(f"📊 {counts['done']} analyzed, {counts['failed']} failed in {seconds:.1f} s "
+            f"({counts['done'] / seconds * 60:.0f}/min)")
+    return 1 if counts['failed'] or counts['done'] < len(urls) else 0
 
-def main():
-    """
-    Main testing function
-    """
-    # Test URL
-    test_url = "https://google.com"
-    
-    # Get real-time data
-    real_metrics = get_real_time_data(test_url)
-    
-    if real_metrics:
-        print("\n📊 Real-time Metrics:")
-        print(f"  Performance Score: {real_metrics.get('performance_score', 0):.1f}")
-        print(f"  SEO Score: {real_metrics.get('seo_score', 0):.1f}")
-        print(f"  First Contentful Paint: {real_metrics.get('first_contentful_paint', 0):.0f} ms")
-        print(f"  Largest Contentful Paint: {real_metrics.get('largest_contentful_paint', 0):.0f} ms")
-        
-        # Load trained model
-        try:
-            model = joblib.load(MODEL_PATH)
-            scaler = joblib.load(SCALER_PATH)
-            features = joblib.load('data/model/features.pkl')
-            
-            print(f"\n✅ Loaded trained model with {len(features)} features")
-            
-            # Prepare features for prediction
-            feature_values = []
-            for feature in features:
-                feature_values.append(real_metrics.get(feature, 0))
-            
-            # Scale features
-            features_scaled = scaler.transform([feature_values])
-            
-            # Make prediction
-            prediction = model.predict(features_scaled)[0]
-            probabilities = model.predict_proba(features_scaled)[0]
-            
-            print("\n" + "=" * 60)
-            print("🤖 AI PREDICTION")
-            print("=" * 60)
-            
-            print(f"\n🎯 Predicted Performance Category: {prediction}")
-            print(f"📊 Confidence: {max(probabilities):.1%}")
-            
-            print("\n📈 All Probabilities:")
-            for class_name, prob in zip(model.classes_, probabilities):
-                print(f"  {class_name}: {prob:.1%}")
-            
-        except Exception as e:
-            print(f"\n❌ Error loading model: {e}")
-            print("💡 Run: python scripts/02_train_model.py first!")
-    
-    else:
-        print("\n❌ Could not fetch real-time data")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
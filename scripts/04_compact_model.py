@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+COMPACTION SCRIPT: Shrink the trained forest to a latency or size budget
+Requires a model from 02_train_model.py
+
+Tries tree selection, depth pruning and distillation into fewer trees,
+keeps the candidate that best reproduces the full forest within budget,
+and reports the accuracy change on the same held-out split that
+02_train_model.py evaluates on.
+
+Example:
+    python scripts/04_compact_model.py --max-latency-ms 2
+    python scripts/04_compact_model.py --max-size-kb 100 --replace
+"""
+
+import argparse
+import os
+import sys
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import joblib
+import pandas as pd
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import train_test_split
+
+import analysis
+import forest
+
+DATA_CANDIDATES = [
+    "data/raw/websites.csv",
+    "data/raw/balanced_data.csv",
+    "data/raw/sample_data.csv"
+]
+
+
+def held_out_split(df, features):
+    """
+    Reproduce the 80/20 split from 02_train_model.py
+    (test_size=0.2, random_state=42, stratified on the target)
+    """
+    X = df[features].fillna(0).values
+    y = df['performance_category'].values
+    return train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+
+
+def main():
+    """
+    Main compaction function
+    """
+    parser = argparse.ArgumentParser(description="Compact the trained forest")
+    parser.add_argument("--data", help="Training CSV (defaults to the first one found in data/raw)")
+    parser.add_argument("--model-dir", default=analysis.MODEL_DIR)
+    parser.add_argument("--max-latency-ms", type=float, help="Single-row predict budget")
+    parser.add_argument("--max-size-kb", type=float, help="Model file size budget")
+    parser.add_argument("--strategies", default="select,prune,distill",
+                        help="Comma-separated subset of select, prune, distill")
+    parser.add_argument("--replace", action="store_true",
+                        help="Overwrite model.pkl instead of writing model_compact.pkl")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🗜️  FOREST COMPACTION")
+    print("=" * 60)
+
+    if args.max_latency_ms is None and args.max_size_kb is None:
+        print("❌ Give at least one budget: --max-latency-ms or --max-size-kb")
+        return
+
+    data_path = args.data or next((p for p in DATA_CANDIDATES if os.path.exists(p)), None)
+    if not data_path or not os.path.exists(data_path):
+        print("❌ No training data found")
+        print("💡 Run: python scripts/01_create_data.py first!")
+        return
+
+    model, scaler, features = analysis.load_model(args.model_dir)
+    df = pd.read_csv(data_path)
+    print(f"📊 Loaded {len(df)} samples from {data_path}")
+
+    X_train, X_test, y_train, y_test = held_out_split(df, features)
+    X_train_scaled = scaler.transform(X_train)
+    X_test_scaled = scaler.transform(X_test)
+
+    base_accuracy = accuracy_score(y_test, model.predict(X_test_scaled))
+    base_latency, base_batch = forest.measure_latency(model, X_test_scaled)
+    base_size = forest.model_size_bytes(model) / 1024
+    print(f"\n🌲 Current model: {len(model.estimators_)} trees")
+    print(f"   Accuracy: {base_accuracy:.3f} | Latency: {base_latency:.2f} ms | Size: {base_size:.1f} KB")
+
+    strategies = tuple(s.strip() for s in args.strategies.split(",") if s.strip())
+    print(f"\n🔍 Searching candidates ({', '.join(strategies)})...")
+    best, candidates = forest.compact_forest(
+        model, X_train_scaled, X_test_scaled,
+        max_latency_ms=args.max_latency_ms,
+        max_size_kb=args.max_size_kb,
+        strategies=strategies
+    )
+
+    print(f"\n{'strategy':<9} {'trees':>5} {'depth':>5} {'fidelity':>9} {'ms':>7} {'KB':>8}")
+    for c in sorted(candidates, key=lambda c: c["latency_ms"]):
+        print(f"{c['strategy']:<9} {c['n_trees']:>5} {c['max_depth']:>5} "
+              f"{c['fidelity']:>9.3f} {c['latency_ms']:>7.2f} {c['size_kb']:>8.1f}")
+
+    if best is None:
+        print("\n❌ No candidate fits the budget. Try a looser budget.")
+        return
+
+    compact = best["model"]
+    compact_accuracy = accuracy_score(y_test, compact.predict(X_test_scaled))
+
+    print("\n" + "=" * 60)
+    print("📊 COMPACTION RESULT")
+    print("=" * 60)
+    print(f"✅ Chosen: {best['strategy']} | {best['n_trees']} trees | depth {best['max_depth']}")
+    print(f"   Latency: {base_latency:.2f} → {best['latency_ms']:.2f} ms (single row)")
+    print(f"   Batch:   {base_batch:.2f} → {best['batch_ms']:.2f} ms ({len(X_test_scaled)} rows)")
+    print(f"   Size:    {base_size:.1f} → {best['size_kb']:.1f} KB")
+    print(f"   Accuracy (held-out): {base_accuracy:.3f} → {compact_accuracy:.3f} "
+          f"(Δ {compact_accuracy - base_accuracy:+.3f})")
+
+    output_path = os.path.join(args.model_dir, "model.pkl" if args.replace else "model_compact.pkl")
+    joblib.dump(compact, output_path)
+    print(f"\n💾 Saved: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
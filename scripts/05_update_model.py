@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+UPDATE SCRIPT: Grow the trained forest with newly collected rows
+Requires a model from 02_train_model.py (or pipeline.py)
+
+Instead of refitting on the full history, fits a few new trees on the new
+rows only and retires the oldest (or weakest) existing trees so the forest
+keeps its size. The saved scaler is reused as-is, so new rows are scaled
+exactly like the ones the existing trees were trained on.
+
+Example:
+    python scripts/05_update_model.py --new-data data/raw/new_rows.csv --trees 20
+    python scripts/05_update_model.py --new-data new.csv --retire weakest --replace
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import joblib
+from sklearn.metrics import accuracy_score
+
+import analysis
+import forest
+import pipeline
+
+
+def load_rows(path, features):
+    """Read a CSV with pipeline.load_stage and check it has every model feature"""
+    loaded = pipeline.load_stage({
+        'path': path,
+        'features': features,
+        'target': 'performance_category'
+    })
+    missing = [f for f in features if f not in loaded['features']]
+    if missing:
+        raise ValueError(f"{path} is missing model features: {missing}")
+    return loaded['X'], loaded['y']
+
+
+def main():
+    """
+    Main update function
+    """
+    parser = argparse.ArgumentParser(description="Grow the trained forest with new rows")
+    parser.add_argument("--new-data", required=True, help="CSV of newly collected rows")
+    parser.add_argument("--eval-data", help="Optional CSV to compare accuracy before and after")
+    parser.add_argument("--model-dir", default=analysis.MODEL_DIR)
+    parser.add_argument("--trees", type=int, default=20, help="Trees to fit on the new rows")
+    parser.add_argument("--max-trees", type=int, help="Forest size cap (default: current size)")
+    parser.add_argument("--retire", choices=["oldest", "weakest"], default="oldest")
+    parser.add_argument("--random-state", type=int)
+    parser.add_argument("--replace", action="store_true",
+                        help="Overwrite model.pkl instead of writing model_updated.pkl")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🌱 INCREMENTAL FOREST UPDATE")
+    print("=" * 60)
+
+    if not os.path.exists(args.new_data):
+        print(f"❌ No data found at {args.new_data}")
+        return
+
+    model, scaler, features = analysis.load_model(args.model_dir)
+    X_new, y_new = load_rows(args.new_data, features)
+    X_new = scaler.transform(X_new)
+    print(f"📊 Loaded {len(y_new)} new rows from {args.new_data}")
+    print(f"🌲 Current model: {len(model.estimators_)} trees")
+
+    start = time.perf_counter()
+    updated, info = forest.grow_forest(
+        model, X_new, y_new, args.trees,
+        max_trees=args.max_trees, retire=args.retire, random_state=args.random_state
+    )
+    elapsed = time.perf_counter() - start
+
+    print(f"\n✅ Added {info['added']} trees, retired {len(info['retired'])} "
+          f"({args.retire}) in {elapsed:.2f}s")
+    if info['old_tree_accuracy'] is not None and info['retired']:
+        retired_scores = info['old_tree_accuracy'][info['retired']]
+        print(f"   Retired trees scored {retired_scores.mean():.3f} on the new rows "
+              f"(all old trees: {info['old_tree_accuracy'].mean():.3f})")
+    print(f"   Forest size: {len(model.estimators_)} → {len(updated.estimators_)} trees")
+    print(f"   Accuracy on new rows: {accuracy_score(y_new, model.predict(X_new)):.3f} → "
+          f"{accuracy_score(y_new, updated.predict(X_new)):.3f} (new trees saw these rows)")
+
+    if args.eval_data:
+        X_eval, y_eval = load_rows(args.eval_data, features)
+        X_eval = scaler.transform(X_eval)
+        print(f"   Accuracy on {args.eval_data}: "
+              f"{accuracy_score(y_eval, model.predict(X_eval)):.3f} → "
+              f"{accuracy_score(y_eval, updated.predict(X_eval)):.3f}")
+
+    output_path = os.path.join(args.model_dir, "model.pkl" if args.replace else "model_updated.pkl")
+    joblib.dump(updated, output_path)
+    print(f"\n💾 Saved: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+BENCHMARK SCRIPT: Compare model families on accuracy and serving cost
+Requires features.pkl from a trained model (02_train_model.py / pipeline.py)
+
+Every family is trained on the same cached pipeline split (scaled and
+resampled training rows, same held-out test rows) using the feature list
+in features.pkl, then measured on:
+
+    accuracy / macro F1   on the held-out split
+    fit time              wall time of .fit()
+    artifact size         joblib file size
+    cold load             joblib.load() in a fresh Python process
+    latency               predict_proba p50/p99, single row and batch
+
+Example:
+    python scripts/06_benchmark_models.py
+    python scripts/06_benchmark_models.py --preset default --models rf,hgb --batch-size 512
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import joblib
+import numpy as np
+from sklearn.ensemble import ExtraTreesClassifier, HistGradientBoostingClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, f1_score
+
+import analysis
+import pipeline
+
+
+def build_families(model_params):
+    """One untrained estimator per family, sharing the pipeline's forest settings"""
+    forest_params = {**model_params, 'n_jobs': -1}
+    class_weight = model_params.get('class_weight')
+    random_state = model_params.get('random_state', 42)
+    return {
+        'rf': RandomForestClassifier(**forest_params),
+        'et': ExtraTreesClassifier(**forest_params),
+        'hgb': HistGradientBoostingClassifier(max_iter=200, class_weight=class_weight,
+                                              random_state=random_state),
+        'logreg': LogisticRegression(max_iter=2000, class_weight=class_weight)
+    }
+
+
+def single_threaded(model):
+    """Serving-style copy: per-row calls don't pay for a thread pool"""
+    if 'n_jobs' in model.get_params():
+        model.set_params(n_jobs=1)
+    return model
+
+
+def latency_percentiles(model, X, repeats):
+    """(p50, p99) in ms of model.predict_proba(X) over `repeats` calls"""
+    model.predict_proba(X)  # warm-up
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        model.predict_proba(X)
+        times.append((time.perf_counter() - start) * 1000)
+    return float(np.percentile(times, 50)), float(np.percentile(times, 99))
+
+
+def cold_load_ms(path, repeats=3):
+    """Median time for a fresh interpreter to import joblib and load the artifact"""
+    code = (
+        "import time; start = time.perf_counter(); import joblib; "
+        f"joblib.load({path!r}); print((time.perf_counter() - start) * 1000)"
+    )
+    times = []
+    for _ in range(repeats):
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True,
+                                text=True, check=True).stdout
+        times.append(float(output.strip().splitlines()[-1]))
+    return statistics.median(times)
+
+
+def benchmark(name, model, data, artifact_dir, single_repeats, batch_repeats, batch_size):
+    """Train one model and measure it; returns a result dict"""
+    start = time.perf_counter()
+    model.fit(data['X_train'], data['y_train'], **data['fit_kwargs'])
+    fit_seconds = time.perf_counter() - start
+
+    y_pred = model.predict(data['X_test'])
+    path = os.path.join(artifact_dir, f"{name}.pkl")
+    joblib.dump(model, path)
+
+    serving = single_threaded(model)
+    X_test = data['X_test']
+    rows = np.random.default_rng(0).integers(len(X_test), size=batch_size)
+    single_p50, single_p99 = latency_percentiles(serving, X_test[:1], single_repeats)
+    batch_p50, batch_p99 = latency_percentiles(serving, X_test[rows], batch_repeats)
+
+    return {
+        'model': name,
+        'accuracy': float(accuracy_score(data['y_test'], y_pred)),
+        'macro_f1': float(f1_score(data['y_test'], y_pred, average='macro', zero_division=0)),
+        'fit_s': fit_seconds,
+        'size_kb': os.path.getsize(path) / 1024,
+        'cold_load_ms': cold_load_ms(path),
+        'single_p50_ms': single_p50,
+        'single_p99_ms': single_p99,
+        'batch_p50_ms': batch_p50,
+        'batch_p99_ms': batch_p99
+    }
+
+
+def main():
+    """
+    Main benchmark function
+    """
+    parser = argparse.ArgumentParser(description="Benchmark model families")
+    parser.add_argument("--preset", choices=sorted(pipeline.PRESETS), default="balanced",
+                        help="Pipeline preset providing the data, split and resampling")
+    parser.add_argument("--data", help="Override data.path")
+    parser.add_argument("--model-dir", default=analysis.MODEL_DIR, help="Where features.pkl lives")
+    parser.add_argument("--models", default="rf,et,hgb,logreg",
+                        help="Comma-separated subset of rf, et, hgb, logreg")
+    parser.add_argument("--single-repeats", type=int, default=200)
+    parser.add_argument("--batch-repeats", type=int, default=30)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--output", help="Also write the results as JSON")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🏁 MODEL FAMILY BENCHMARK")
+    print("=" * 60)
+
+    features_path = os.path.join(args.model_dir, "features.pkl")
+    if not os.path.exists(features_path):
+        print(f"❌ No feature list at {features_path}")
+        print("💡 Run: python scripts/02_train_model.py first!")
+        return
+
+    overrides = {'data': {'features': joblib.load(features_path)}}
+    if args.data:
+        overrides['data']['path'] = args.data
+    config = pipeline.build_config(args.preset, overrides)
+    if not os.path.exists(config['data']['path']):
+        print(f"❌ No data found at {config['data']['path']}")
+        return
+
+    pipe = pipeline.Pipeline(config)
+    scaled = pipe.output('scale')
+    resampled = pipe.output('resample')
+    data = {
+        'X_train': resampled['X'],
+        'y_train': resampled['y'],
+        'X_test': scaled['X_test'],
+        'y_test': scaled['y_test'],
+        'fit_kwargs': {'sample_weight': resampled['sample_weight']} if 'sample_weight' in resampled else {}
+    }
+    print(f"📊 {len(data['y_train'])} training rows, {len(data['y_test'])} test rows, "
+          f"{len(pipe.output('load')['features'])} features")
+
+    families = build_families(config['model'])
+    names = [name.strip() for name in args.models.split(",") if name.strip()]
+    unknown = [name for name in names if name not in families]
+    if unknown:
+        print(f"❌ Unknown model(s): {', '.join(unknown)}")
+        return
+
+    results = []
+    with tempfile.TemporaryDirectory() as artifact_dir:
+        for name in names:
+            print(f"⚙️  {name}...")
+            results.append(benchmark(name, families[name], data, artifact_dir,
+                                     args.single_repeats, args.batch_repeats, args.batch_size))
+
+    print("\n" + "=" * 60)
+    print("📊 RESULTS")
+    print("=" * 60)
+    print(f"{'model':<7} {'acc':>6} {'F1':>6} {'fit s':>7} {'KB':>8} {'load ms':>8} "
+          f"{'1-row p50/p99 ms':>17} {f'{args.batch_size}-row p50/p99 ms':>19}")
+    for r in results:
+        print(f"{r['model']:<7} {r['accuracy']:>6.3f} {r['macro_f1']:>6.3f} {r['fit_s']:>7.2f} "
+              f"{r['size_kb']:>8.1f} {r['cold_load_ms']:>8.0f} "
+              f"{r['single_p50_ms']:>8.2f}/{r['single_p99_ms']:<8.2f} "
+              f"{r['batch_p50_ms']:>9.2f}/{r['batch_p99_ms']:<9.2f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Saved: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+STARTUP PROFILE: How long a fresh app process takes to show its first page
+
+Runs app.py's welcome page in fresh Python processes through Streamlit's
+headless script runner (streamlit.testing) and reports:
+
+    first paint     interpreter start -> first script run finished,
+                    including importing Streamlit and the app's modules
+    first run       the first script run alone
+    rerun           a second run of the same page (imports already warm)
+    heavy modules   which of scikit-learn, scipy and pandas the welcome
+                    page loaded (ideally none; Streamlit itself always
+                    imports plotly)
+    imports         cumulative import time per top-level package, from
+                    python -X importtime
+
+Example:
+    python scripts/07_profile_startup.py
+    python scripts/07_profile_startup.py --repeats 5 --top 20
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ['sklearn', 'scipy', 'pandas']
+
+# Runs in the child process; the last stdout line is the JSON result
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file({app!r}, default_timeout=120)
+run_start = time.perf_counter()
+app.run()
+first_paint = time.perf_counter()
+app.run()
+rerun = time.perf_counter()
+print(json.dumps({{
+    'first_paint_ms': (first_paint - start) * 1000,
+    'first_run_ms': (first_paint - run_start) * 1000,
+    'rerun_ms': (rerun - first_paint) * 1000,
+    'exceptions': [str(e.value) for e in app.exception],
+    'heavy_modules': [m for m in {heavy!r} if m in sys.modules]
+}}))
+"""
+
+
+def run_child(app, importtime=False):
+    """One fresh-process welcome page run; returns (result dict, stderr)"""
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += ["-c", CHILD.format(app=app, heavy=HEAVY_MODULES)]
+    completed = subprocess.run(command, cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1]), completed.stderr
+
+
+def import_breakdown(stderr):
+    """{top-level package: cumulative ms} from -X importtime output"""
+    totals = defaultdict(float)
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Nested imports are indented; only top-level ones are summed
+        if name.startswith("  "):
+            continue
+        totals[name.strip().split(".")[0]] += int(cumulative) / 1000
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+def main():
+    """
+    Main profiling function
+    """
+    parser = argparse.ArgumentParser(description="Profile the app's cold start")
+    parser.add_argument("--app", default="app.py", help="Streamlit script to profile")
+    parser.add_argument("--repeats", type=int, default=3, help="Fresh processes to time")
+    parser.add_argument("--top", type=int, default=12, help="Packages shown in the import breakdown")
+    parser.add_argument("--output", help="Also write the results as JSON")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("⏱️  APP STARTUP PROFILE")
+    print("=" * 60)
+
+    runs = []
+    for i in range(args.repeats):
+        result, _ = run_child(args.app)
+        runs.append(result)
+        print(f"   run {i + 1}: first paint {result['first_paint_ms']:.0f} ms")
+
+    profiled, stderr = run_child(args.app, importtime=True)
+    imports = import_breakdown(stderr)
+
+    summary = {
+        'first_paint_ms': statistics.median(r['first_paint_ms'] for r in runs),
+        'first_run_ms': statistics.median(r['first_run_ms'] for r in runs),
+        'rerun_ms': statistics.median(r['rerun_ms'] for r in runs),
+        'heavy_modules': profiled['heavy_modules'],
+        'exceptions': profiled['exceptions'],
+        'imports_ms': imports
+    }
+
+    print("\n📊 Welcome page (median of fresh processes)")
+    print(f"   First paint:  {summary['first_paint_ms']:.0f} ms")
+    print(f"   First run:    {summary['first_run_ms']:.0f} ms")
+    print(f"   Rerun:        {summary['rerun_ms']:.0f} ms")
+    print(f"   Heavy modules loaded: {', '.join(summary['heavy_modules']) or 'none'}")
+    if summary['exceptions']:
+        print(f"⚠️  The page raised: {summary['exceptions']}")
+
+    print("\n📦 Import time by package (cumulative, with -X importtime overhead)")
+    for name, ms in list(imports.items())[:args.top]:
+        print(f"   {name:<24} {ms:>8.1f} ms")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(summary, f, indent=2)
+        print(f"\n💾 Saved: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+Hyperparameter search for the training pipeline.
+
+Candidates are sampled from SEARCH_SPACE and raced with successive
+halving: everyone is trained on a small budget (a fraction of the trees
+and of the training rows), the best 1/eta move up to a budget eta times
+larger, and so on until the survivors are trained on the full budget.
+
+Fits run in a process pool. The scaled training and validation arrays are
+published once through shared memory (see parallel.py) so workers never
+receive a pickled copy of the data.
+
+Run through the pipeline:
+    python pipeline.py --preset balanced --search --candidates 27 --workers 4
+"""
+
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import train_test_split
+
+import forest
+import parallel
+import pipeline
+
+SEARCH_SPACE = {
+    'n_estimators': [50, 100, 150, 200, 300],
+    'max_depth': [6, 8, 10, 12, 16, None],
+    'min_samples_split': [2, 5, 10],
+    'min_samples_leaf': [1, 2, 4],
+    'max_features': ['sqrt', 0.5, None]
+}
+
+# Worker-side views of the shared arrays
+_data = {}
+
+
+def _init_worker(specs):
+    _data.update(parallel.attach(specs))
+
+
+def sample_candidates(n_candidates, seed=42, space=SEARCH_SPACE):
+    """Draw distinct parameter combinations from the search space"""
+    rng = np.random.default_rng(seed)
+    total = math.prod(len(values) for values in space.values())
+    candidates, seen = [], set()
+    while len(candidates) < min(n_candidates, total):
+        params = {name: values[rng.integers(len(values))] for name, values in space.items()}
+        key = tuple(sorted(params.items(), key=lambda item: item[0]))
+        if key not in seen:
+            seen.add(key)
+            candidates.append(params)
+    return candidates
+
+
+def _evaluate(task):
+    """Fit one candidate on its budget and score it (runs in a worker)"""
+    candidate_id, params, base_params, budget, seed = task
+    X_train, y_train = _data['X_train'], _data['y_train']
+    X_val, y_val = _data['X_val'], _data['y_val']
+
+    n_rows = len(y_train)
+    rows = max(min(n_rows, 50), int(round(n_rows * budget)))
+    if rows < n_rows:
+        idx = np.random.default_rng(seed).choice(n_rows, size=rows, replace=False)
+        X_fit, y_fit = X_train[idx], y_train[idx]
+    else:
+        X_fit, y_fit = X_train, y_train
+
+    full_trees = params['n_estimators']
+    trees = max(5, int(round(full_trees * budget)))
+    model = RandomForestClassifier(**{**base_params, **params, 'n_estimators': trees, 'n_jobs': 1})
+
+    start = time.perf_counter()
+    model.fit(X_fit, y_fit)
+    fit_seconds = time.perf_counter() - start
+
+    accuracy = float((model.predict(X_val) == y_val).mean())
+    latency_ms, _ = forest.measure_latency(model, X_val[:64], repeats=20)
+
+    return {
+        'id': candidate_id,
+        'params': params,
+        'budget': budget,
+        'trees': trees,
+        'rows': rows,
+        'accuracy': accuracy,
+        'latency_ms': latency_ms,
+        # Forest latency is close to linear in the number of trees
+        'est_full_latency_ms': latency_ms * full_trees / trees,
+        'fit_seconds': fit_seconds
+    }
+
+
+def successive_halving(X_train, y_train, X_val, y_val, candidates, base_params=None,
+                       eta=3, min_budget=None, workers=None, seed=42, verbose=True):
+    """
+    Race the candidates with successive halving.
+    Returns every evaluation (one per candidate per rung it reached).
+    """
+    base_params = {k: v for k, v in (base_params or {}).items()
+                   if k not in SEARCH_SPACE and k != 'n_jobs'}
+    n_rungs = max(1, int(math.floor(math.log(len(candidates), eta))) + 1)
+    if min_budget is None:
+        min_budget = eta ** -(n_rungs - 1)
+    budgets = [min(1.0, min_budget * eta ** rung) for rung in range(n_rungs)]
+    budgets[-1] = 1.0
+
+    # Integer labels keep the shared block a plain numeric array
+    classes, y_train_codes = np.unique(y_train, return_inverse=True)
+    y_val_codes = np.searchsorted(classes, y_val)
+
+    history = []
+    alive = list(enumerate(candidates))
+    workers = workers or os.cpu_count() or 1
+
+    with parallel.SharedArrays({
+        'X_train': X_train, 'y_train': y_train_codes,
+        'X_val': X_val, 'y_val': y_val_codes
+    }) as shared:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(shared.specs,)) as pool:
+            for rung, budget in enumerate(budgets):
+                tasks = [(cid, params, base_params, budget, seed + cid) for cid, params in alive]
+                start = time.perf_counter()
+                results = list(pool.map(_evaluate, tasks))
+                history.extend(results)
+
+                if verbose:
+                    best = max(results, key=lambda r: r['accuracy'])
+                    print(f"🏁 Rung {rung + 1}/{len(budgets)}: {len(results):>3} candidates @ "
+                          f"{budget:.0%} budget | best acc {best['accuracy']:.3f} | "
+                          f"{time.perf_counter() - start:.1f}s")
+
+                if rung < len(budgets) - 1:
+                    keep = max(1, len(results) // eta)
+                    # Ties go to the faster model
+                    ranked = sorted(results, key=lambda r: (-r['accuracy'], r['est_full_latency_ms']))
+                    survivors = {r['id'] for r in ranked[:keep]}
+                    alive = [(cid, params) for cid, params in alive if cid in survivors]
+
+    return history
+
+
+def latest_results(history):
+    """Each candidate's evaluation at the largest budget it reached"""
+    latest = {}
+    for result in history:
+        if result['id'] not in latest or result['budget'] >= latest[result['id']]['budget']:
+            latest[result['id']] = result
+    return list(latest.values())
+
+
+def pareto_frontier(results):
+    """Candidates not beaten on both accuracy and (estimated) latency"""
+    ordered = sorted(results, key=lambda r: (r['est_full_latency_ms'], -r['accuracy']))
+    frontier, best_accuracy = [], -1.0
+    for result in ordered:
+        if result['accuracy'] > best_accuracy:
+            frontier.append(result)
+            best_accuracy = result['accuracy']
+    return frontier
+
+
+def run_search(pipe, n_candidates=27, eta=3, workers=None, seed=42, validation_size=0.25):
+    """
+    Search hyperparameters using a Pipeline's cached scaled data.
+
+    A stratified validation split is carved out of the training split (the
+    pipeline's test split stays untouched for the final report) and only
+    the remaining rows are resampled with the pipeline's resample method.
+    Returns (best, frontier, history).
+    """
+    scaled = pipe.output('scale')
+    X_fit, X_val, y_fit, y_val = train_test_split(
+        scaled['X_train'], scaled['y_train'],
+        test_size=validation_size, random_state=seed, stratify=scaled['y_train']
+    )
+    resampled = pipeline.resample_stage(pipe.config['resample'], {'X_train': X_fit, 'y_train': y_fit})
+    base_params = pipe.config['model']
+    if 'sample_weight' in resampled:
+        # Workers fit without per-row weights; balanced class weights are equivalent
+        base_params = {**base_params, 'class_weight': 'balanced'}
+
+    candidates = sample_candidates(n_candidates, seed)
+    history = successive_halving(
+        resampled['X'], resampled['y'], X_val, y_val, candidates,
+        base_params=base_params, eta=eta, workers=workers, seed=seed
+    )
+
+    results = latest_results(history)
+    full = [r for r in results if r['budget'] == 1.0]
+    best = max(full, key=lambda r: (r['accuracy'], -r['latency_ms']))
+    return best, pareto_frontier(results), history
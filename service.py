@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+INFERENCE SERVICE: Lightweight HTTP API in front of the trained model
+
+Endpoints:
+    GET  /health   -> model + batching status
+    POST /predict  -> score metric JSON, or fetch a URL first
+
+Request bodies (a JSON list of these is also accepted):
+    {"metrics": {"first_contentful_paint": 1200, ...}}
+    {"url": "https://example.com", "strategy": "mobile"}
+
+Add "explain": true to any item to also get per-feature attributions.
+
+Requests arriving within --max-wait-ms of each other are merged into one
+micro-batch, so the forest is evaluated once per batch instead of once per
+request.
+
+With --reservoir PATH every URL the service fetches is also offered to a
+bounded stratified training sample (see reservoir.py), and with
+--history PATH its prediction is recorded in the analysis history
+(see history.py).
+
+Run: python service.py --port 8080
+"""
+
+import argparse
+import json
+import math
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import analysis
+import forest
+import history
+import reservoir
+
+
+class MicroBatcher:
+    """
+    Collect concurrent prediction requests into small batches.
+
+    The first request in a batch opens a window of max_wait_ms; everything
+    that arrives before the window closes (up to max_batch_size rows) is
+    scored together in a single predict_proba call.
+    """
+
+    def __init__(self, model, scaler, features, max_batch_size=64, max_wait_ms=5.0,
+                 early_exit=False, confidence=None):
+        self.model = model
+        self.scaler = scaler
+        self.features = features
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.early_exit = early_exit or confidence is not None
+        self.confidence = confidence
+
+        self.batches_run = 0
+        self.rows_scored = 0
+
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, metrics):
+        """
+        Queue one metric dict; returns a Future of
+        (prediction, probabilities, trees_used)
+        """
+        future = Future()
+        self._queue.put((metrics, future))
+        return future
+
+    def predict(self, metrics, timeout=None):
+        """Blocking helper around submit()"""
+        return self.submit(metrics).result(timeout=timeout)
+
+    def close(self):
+        """Stop the worker thread after the queued requests are served"""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+
+            batch = [first]
+            deadline = time.perf_counter() + self.max_wait
+            stop = False
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+
+            self._score(batch)
+            if stop:
+                return
+
+    def _score(self, batch):
+        futures = [future for _, future in batch]
+        metrics_list = [metrics for metrics, _ in batch]
+        try:
+            if self.early_exit:
+                results = analysis.predict_batch_early_exit(
+                    self.model, self.scaler, self.features, metrics_list, confidence=self.confidence
+                )
+            else:
+                n_trees = len(getattr(self.model, "estimators_", []))
+                results = [
+                    (prediction, probabilities, n_trees)
+                    for prediction, probabilities in analysis.predict_batch(
+                        self.model, self.scaler, self.features, metrics_list
+                    )
+                ]
+        except Exception as e:
+            if len(batch) > 1:
+                # Rescore row by row, so only the row that broke the batch fails
+                for item in batch:
+                    self._score([item])
+                return
+            futures[0].set_exception(e)
+            return
+
+        self.batches_run += 1
+        self.rows_scored += len(batch)
+        for future, result in zip(futures, results):
+            future.set_result(result)
+
+
+def clean_metrics(metrics):
+    """
+    Metric dict with every value as a finite float (null counts as 0, as in
+    the feature matrix). Raises ValueError naming the first bad value, so a
+    malformed request is rejected before it can join a batch.
+    """
+    if not isinstance(metrics, dict):
+        raise ValueError("'metrics' must be an object")
+    cleaned = {}
+    for name, value in metrics.items():
+        try:
+            number = float(value or 0)
+        except (TypeError, ValueError):
+            raise ValueError(f"Metric '{name}' must be a number, got {json.dumps(value)}") from None
+        if not math.isfinite(number):
+            raise ValueError(f"Metric '{name}' must be finite")
+        cleaned[name] = number
+    return cleaned
+
+
+class InferenceServer(ThreadingHTTPServer):
+    """Threaded HTTP server with a listen backlog sized for bursts"""
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+def make_handler(batcher, api_key=None, fetch_timeout=30, attributor=None, sampler=None,
+                 recorder=None, model_version=None):
+    """Build a request handler class bound to one MicroBatcher"""
+
+    class PredictionHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            # Keep the console quiet at high QPS
+            pass
+
+        def _send_json(self, status, payload):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path != "/health":
+                self._send_json(404, {"error": "Not found"})
+                return
+            self._send_json(200, {
+                "status": "ok",
+                "classes": [str(c) for c in batcher.model.classes_],
+                "features": list(batcher.features),
+                "early_exit": batcher.early_exit,
+                "batches_run": batcher.batches_run,
+                "rows_scored": batcher.rows_scored
+            })
+
+        def do_POST(self):
+            if self.path != "/predict":
+                self._send_json(404, {"error": "Not found"})
+                return
+
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+            except (ValueError, json.JSONDecodeError):
+                self._send_json(400, {"error": "Body must be valid JSON"})
+                return
+
+            items = payload if isinstance(payload, list) else [payload]
+            if not items or not all(isinstance(item, dict) for item in items):
+                self._send_json(400, {"error": "Expected a JSON object or a list of objects"})
+                return
+
+            # Resolve metrics first (fetching URLs if needed), then hand every
+            # row to the batcher before waiting, so one request's rows share
+            # a batch with whatever else is in flight.
+            responses = []
+            pending = []
+            for item in items:
+                try:
+                    response = self._resolve_metrics(item)
+                except analysis.PageSpeedError as e:
+                    responses.append({"url": item.get("url"), "error": str(e)})
+                    pending.append(None)
+                    continue
+                except ValueError as e:
+                    self._send_json(400, {"error": str(e)})
+                    return
+                responses.append(response)
+                pending.append(batcher.submit(response["metrics"]))
+
+            for response, future in zip(responses, pending):
+                if future is None:
+                    continue
+                try:
+                    prediction, probabilities, trees_used = future.result()
+                except Exception as e:
+                    self._send_json(500, {"error": f"Prediction failed: {e}"})
+                    return
+                response["prediction"] = prediction
+                response["probabilities"] = probabilities
+                response["confidence"] = max(probabilities.values())
+                response["trees_used"] = trees_used
+                response["recommendations"] = analysis.get_recommendations(response["metrics"], prediction)
+                if recorder is not None and "url" in response:
+                    try:
+                        recorder.record(response["url"], response["strategy"], response["metrics"],
+                                        prediction, probabilities, model_version=model_version)
+                    except Exception:
+                        # Like sampling, history must never fail a prediction
+                        pass
+
+            # Attributions for every item that asked, in one batched walk
+            explained = [
+                response for item, response in zip(items, responses)
+                if item.get("explain") and "prediction" in response
+            ]
+            if explained and attributor is not None:
+                try:
+                    attributions = analysis.explain_batch(
+                        attributor, batcher.scaler, batcher.features,
+                        [r["metrics"] for r in explained], [r["prediction"] for r in explained]
+                    )
+                except Exception as e:
+                    # The predictions stand; only the explanation is missing
+                    for response in explained:
+                        response["attributions_error"] = f"Attribution failed: {e}"
+                else:
+                    for response, contribution in zip(explained, attributions):
+                        response["attributions"] = contribution
+
+            if isinstance(payload, list):
+                self._send_json(200, responses)
+            else:
+                self._send_json(502 if "error" in responses[0] else 200, responses[0])
+
+        def _resolve_metrics(self, item):
+            if "metrics" in item:
+                return {"metrics": clean_metrics(item["metrics"])}
+
+            if "url" in item:
+                url = analysis.normalize_url(item["url"])
+                strategy = item.get("strategy", "mobile")
+                api_data = analysis.fetch_pagespeed_data(url, strategy, api_key=api_key, timeout=fetch_timeout)
+                try:
+                    metrics = analysis.extract_metrics(api_data)
+                except (KeyError, TypeError) as e:
+                    raise analysis.PageSpeedError(f"Error extracting metrics: {e}")
+                if sampler is not None:
+                    try:
+                        sampler.offer(url, strategy, metrics)
+                    except Exception:
+                        # Sampling must never fail a prediction
+                        pass
+                return {"url": url, "strategy": strategy, "metrics": metrics}
+
+            raise ValueError("Each request needs either 'metrics' or 'url'")
+
+    return PredictionHandler
+
+
+def main():
+    """
+    Start the inference service
+    """
+    parser = argparse.ArgumentParser(description="PageSpeed AI inference service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--model-dir", default=analysis.MODEL_DIR)
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0,
+                        help="How long the first request in a batch waits for company")
+    parser.add_argument("--n-jobs", type=int, default=1,
+                        help="Forest threads per batch (1 avoids pool start-up cost on tiny batches)")
+    parser.add_argument("--early-exit", action="store_true",
+                        help="Stop evaluating trees once each row's label can no longer change")
+    parser.add_argument("--confidence", type=float, default=None,
+                        help="Also stop once the leading class reaches this probability (implies --early-exit)")
+    parser.add_argument("--reservoir", metavar="PATH",
+                        help="Keep a stratified sample of fetched analyses here (see reservoir.py)")
+    parser.add_argument("--history", metavar="PATH",
+                        help="Record predictions for fetched URLs here (see history.py)")
+    args = parser.parse_args()
+
+    model, scaler, features = analysis.load_model(args.model_dir)
+    if hasattr(model, "n_jobs"):
+        model.n_jobs = args.n_jobs
+
+    batcher = MicroBatcher(model, scaler, features, args.max_batch_size, args.max_wait_ms,
+                           early_exit=args.early_exit, confidence=args.confidence)
+    attributor = forest.TreeAttributor(model, features)
+    sampler = reservoir.Reservoir(args.reservoir) if args.reservoir else None
+    recorder = history.History(args.history) if args.history else None
+    handler = make_handler(batcher, api_key=analysis.get_api_key(), attributor=attributor,
+                           sampler=sampler, recorder=recorder,
+                           model_version=analysis.model_version(args.model_dir) if recorder else None)
+    server = InferenceServer((args.host, args.port), handler)
+
+    print(f"🚀 Serving {len(features)}-feature model on http://{args.host}:{args.port}")
+    print(f"📦 Micro-batching: up to {args.max_batch_size} rows / {args.max_wait_ms} ms")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Shutting down...")
+    finally:
+        server.server_close()
+        batcher.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import pytest
+import requests
+
+import analysis
+import collector
+
+
+class CountingLimiter:
+    def __init__(self):
+        self.acquired = 0
+
+    def acquire(self):
+        self.acquired += 1
+
+
+class DownSession:
+    def get(self, *args, **kwargs):
+        raise requests.ConnectionError("down")
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(collector.time, "sleep", lambda seconds: None)
+
+
+def test_missing_key_fails_at_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(analysis, "get_api_key", lambda: None)
+    limiter = CountingLimiter()
+    client = collector.Collector(str(tmp_path / "rows.csv"), limiter=limiter)
+
+    with pytest.raises(analysis.PageSpeedConfigError):
+        client.run([("https://example.com", "blog")], verbose=False)
+    assert limiter.acquired == 0
+
+    with pytest.raises(analysis.PageSpeedConfigError):
+        client.fetch_json("https://example.com", "mobile")
+    assert limiter.acquired == 1
+
+
+def test_network_errors_are_retried(tmp_path):
+    limiter = CountingLimiter()
+    client = collector.Collector(str(tmp_path / "rows.csv"), api_key="key",
+                                 limiter=limiter, max_retries=2)
+    client._local.session = DownSession()
+
+    with pytest.raises(analysis.PageSpeedError):
+        client.fetch_json("https://example.com", "mobile")
+    assert limiter.acquired == 3
@@ -0,0 +1,71 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import columnar
+
+
+def write_chunks(tmp_path, *chunks):
+    """Write DataFrame chunks as given (each keeps its own inferred dtypes)"""
+    path = str(tmp_path / "data.cols")
+    with warnings.catch_warnings():
+        # A lossy cast shows up as a RuntimeWarning; treat it as a failure
+        warnings.simplefilter("error")
+        with columnar.ColumnarWriter(path) as writer:
+            for chunk in chunks:
+                writer.write(pd.DataFrame(chunk))
+    return columnar.ColumnarDataset(path)
+
+
+def test_integer_column_with_later_null_becomes_float(tmp_path):
+    dataset = write_chunks(tmp_path, {'x': [1, 2]}, {'x': [3, None]}, {'x': [5, 6]})
+    assert dataset.specs['x']['kind'] == 'float'
+    np.testing.assert_array_equal(dataset.column('x'), np.array([1, 2, 3, np.nan, 5, 6], dtype=np.float32))
+
+
+def test_integer_column_with_later_fraction_becomes_float(tmp_path):
+    dataset = write_chunks(tmp_path, {'x': [2, 3]}, {'x': [2.5, 4.0]})
+    assert dataset.specs['x']['kind'] == 'float'
+    np.testing.assert_array_equal(dataset.column('x'), np.array([2, 3, 2.5, 4], dtype=np.float32))
+
+
+def test_integral_floats_keep_an_integer_column(tmp_path):
+    dataset = write_chunks(tmp_path, {'n': [1, 2]}, {'n': [300.0, 4.0]}, {'n': [5, 6]})
+    assert dataset.specs['n']['kind'] == 'int'
+    assert np.dtype(dataset.specs['n']['dtype']) == np.int16
+    assert dataset.column('n').tolist() == [1, 2, 300, 4, 5, 6]
+
+
+def test_text_column_that_starts_empty_becomes_category(tmp_path):
+    dataset = write_chunks(tmp_path, {'t': [np.nan, np.nan]}, {'t': ['a', 'b']}, {'t': [None, 'a']})
+    assert dataset.specs['t']['kind'] == 'category'
+    assert dataset.series('t').isna().tolist() == [True, True, False, False, True, False]
+    assert dataset.series('t').dropna().tolist() == ['a', 'b', 'a']
+
+
+def test_text_in_numeric_column_raises(tmp_path):
+    with pytest.raises(ValueError, match="'x'"):
+        write_chunks(tmp_path, {'x': [1, 2]}, {'x': ['oops', 4]})
+    with pytest.raises(ValueError, match="'y'"):
+        write_chunks(tmp_path, {'y': [1.5, 2.5]}, {'y': ['oops', 4]})
+
+
+def test_unparseable_date_raises(tmp_path):
+    with pytest.raises(ValueError, match="not a date"):
+        write_chunks(tmp_path, {'timestamp': ['2024-01-01', '']}, {'timestamp': ['soon', None]})
+
+
+def test_csv_round_trip_across_chunks(tmp_path):
+    df = pd.DataFrame({
+        'score': [10, 20, 30, 40, 50],
+        'lcp': [1200.5, 900.0, 3000.25, 100.0, 5.5],
+        'category': ['Good', 'Poor', 'Good', 'Average', 'Excellent']
+    })
+    src = tmp_path / "data.csv"
+    df.to_csv(src, index=False)
+    dst, rows = columnar.csv_to_columnar(str(src), str(tmp_path / "data.cols"), chunk_rows=2)
+    back, _ = columnar.columnar_to_csv(dst, str(tmp_path / "back.csv"))
+    assert rows == 5
+    pd.testing.assert_frame_equal(pd.read_csv(back), df)
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import outofcore
+
+
+@pytest.mark.parametrize("n_chunks, n_estimators", [(40, 10), (10, 40), (7, 7), (41, 10), (1, 5)])
+def test_chunk_tree_budget_uses_every_chunk(n_chunks, n_estimators):
+    budget = outofcore.chunk_tree_budget(n_chunks, n_estimators)
+    assert len(budget) == n_chunks
+    assert sum(budget) == n_estimators
+    # The last chunk always fits, so no rows are left in the carry
+    assert budget[-1] > 0
+    # Gaps between fits (the carry) stay bounded
+    fits = [i for i, n in enumerate(budget) if n]
+    gaps = np.diff([-1] + fits)
+    assert gaps.max() <= -(-n_chunks // n_estimators)
+
+
+def _write(tmp_path, df):
+    path = tmp_path / "rows.csv"
+    df.to_csv(path, index=False)
+    return str(path)
+
+
+def _frame(n_rows):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({'a': rng.normal(size=n_rows), 'b': rng.normal(size=n_rows)})
+    df['performance_category'] = np.where(df['a'] > 0, 'Good', 'Poor')
+    return df
+
+
+def test_fit_per_chunk_caps_fit_size_with_more_chunks_than_trees(tmp_path):
+    path = _write(tmp_path, _frame(4000))
+
+    result = outofcore.fit_per_chunk(path, ['a', 'b'], 'performance_category',
+                                     {'n_estimators': 5, 'bootstrap': False},
+                                     chunk_rows=100, test_size=0.2, verbose=False)
+
+    assert result['chunks'] == 40
+    trees = result['model'].estimators_
+    assert len(trees) == 5
+    # Without bootstrap each tree's root holds exactly the rows it was fitted on
+    fit_rows = [tree.tree_.n_node_samples[0] for tree in trees]
+    assert max(fit_rows) <= 100 + 2
+    assert min(fit_rows) >= 100 - 2
+
+
+def test_fit_per_chunk_uses_every_training_row_with_more_trees_than_chunks(tmp_path):
+    path = _write(tmp_path, _frame(400))
+
+    result = outofcore.fit_per_chunk(path, ['a', 'b'], 'performance_category',
+                                     {'n_estimators': 8, 'bootstrap': False},
+                                     chunk_rows=100, test_size=0.2, verbose=False)
+
+    # Two trees per chunk, both fitted on all of the chunk's training rows
+    fit_rows = sum(tree.tree_.n_node_samples[0] for tree in result['model'].estimators_)
+    assert fit_rows // 2 + len(result['y_test']) == 400
+
+
+def test_fit_per_chunk_skips_groups_without_training_rows(tmp_path):
+    path = _write(tmp_path, _frame(200))
+
+    # One-row chunks, one tree each: a chunk whose row drew test gets no tree
+    result = outofcore.fit_per_chunk(path, ['a', 'b'], 'performance_category',
+                                     {'n_estimators': 200}, chunk_rows=1,
+                                     test_size=0.2, verbose=False)
+
+    assert len(result['model'].estimators_) == 200 - len(result['y_test'])
+
+
+def test_unlabelled_rows_are_dropped_and_counted(tmp_path):
+    df = pd.DataFrame({'a': [1.0, 2.0, 3.0, 4.0, 5.0], 'b': 0.0,
+                       'performance_score': [95, None, 101, 40, 80]})
+    path = _write(tmp_path, df)
+
+    sample = outofcore.sample_dataset(path, ['a', 'b'], 'performance_category', 10, chunk_rows=2)
+    assert sample['rows_dropped'] == 2
+    assert sorted(sample['y']) == ['Excellent', 'Good', 'Poor']
+
+    df = pd.DataFrame({'a': [1.0, 2.0, 3.0], 'b': 0.0, 'performance_category': ['Good', '', 'Poor']})
+    path = _write(tmp_path, df)
+    stats = {}
+    chunks = list(outofcore.read_chunks(path, ['a', 'b'], 'performance_category', stats=stats))
+    assert stats['rows_dropped'] == 1
+    assert 'nan' not in np.concatenate([y for _, y, _ in chunks])
@@ -0,0 +1,111 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.preprocessing import StandardScaler
+
+import service
+
+FEATURES = ['first_contentful_paint', 'largest_contentful_paint']
+
+
+@pytest.fixture
+def batcher():
+    rng = np.random.default_rng(0)
+    X = rng.uniform(500, 5000, size=(200, 2))
+    y = np.where(X[:, 1] > 2500, 'Poor', 'Good')
+    scaler = StandardScaler().fit(X)
+    model = RandomForestClassifier(n_estimators=5, random_state=0).fit(scaler.transform(X), y)
+    # A long window so every row submitted below lands in the same batch
+    batcher = service.MicroBatcher(model, scaler, FEATURES, max_wait_ms=200)
+    yield batcher
+    batcher.close()
+
+
+def test_clean_metrics():
+    assert service.clean_metrics({'a': "1.5", 'b': None, 'c': 2}) == {'a': 1.5, 'b': 0.0, 'c': 2.0}
+    with pytest.raises(ValueError, match="first_contentful_paint"):
+        service.clean_metrics({'first_contentful_paint': "abc"})
+    with pytest.raises(ValueError):
+        service.clean_metrics({'first_contentful_paint': float('nan')})
+    with pytest.raises(ValueError):
+        service.clean_metrics([1, 2])
+
+
+def test_bad_row_fails_alone_in_its_batch(batcher):
+    good = batcher.submit({'first_contentful_paint': 1000, 'largest_contentful_paint': 1200})
+    bad = batcher.submit({'first_contentful_paint': "abc", 'largest_contentful_paint': 1200})
+    other = batcher.submit({'first_contentful_paint': 1000, 'largest_contentful_paint': 4800})
+
+    assert good.result(timeout=5)[0] == 'Good'
+    assert other.result(timeout=5)[0] == 'Poor'
+    with pytest.raises(ValueError):
+        bad.result(timeout=5)
+
+
+def serve(handler):
+    server = service.InferenceServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/predict"
+
+
+def post_json(url, payload):
+    request = urllib.request.Request(url, data=json.dumps(payload).encode(),
+                                     headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_handler_rejects_bad_metrics_without_failing_other_clients(batcher):
+    server, url = serve(service.make_handler(batcher))
+
+    def post(payload, responses, key):
+        responses[key] = post_json(url, payload)
+
+    responses = {}
+    clients = [
+        threading.Thread(target=post, args=({'metrics': {'first_contentful_paint': "abc"}}, responses, 'bad')),
+        threading.Thread(target=post, args=({'metrics': {'first_contentful_paint': 900,
+                                                         'largest_contentful_paint': 1000}},
+                                            responses, 'good'))
+    ]
+    try:
+        for client in clients:
+            client.start()
+        for client in clients:
+            client.join()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert responses['bad'][0] == 400
+    assert "first_contentful_paint" in responses['bad'][1]['error']
+    assert responses['good'][0] == 200
+    assert responses['good'][1]['prediction'] == 'Good'
+
+
+class BrokenAttributor:
+    def explain_class(self, *args, **kwargs):
+        raise RuntimeError("walk failed")
+
+
+def test_failed_attributions_keep_predictions(batcher):
+    server, url = serve(service.make_handler(batcher, attributor=BrokenAttributor()))
+    try:
+        status, body = post_json(url, {'metrics': {'first_contentful_paint': 900,
+                                                   'largest_contentful_paint': 1000},
+                                       'explain': True})
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert status == 200
+    assert body['prediction'] == 'Good'
+    assert "walk failed" in body['attributions_error']
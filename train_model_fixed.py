@@ -1,9 +1,8 @@
 # train_model_fixed.py
 import pandas as pd
 import numpy as np
-import joblib
 import os
-import sys
+import pipeline
 
 print("=" * 60)
 print("🧠 TRAINING AI MODEL WITH FIXED DATA PATH")
@@ -70,124 +69,32 @@ print(f"✅ Loaded {len(df)} training samples")
 # Show column names to debug
 print(f"\n🔍 Columns in data: {list(df.columns)}")
 
-# Check if we have the target column
-if 'performance_category' not in df.columns:
-    print("❌ 'performance_category' column not found!")
-    print("Creating it from performance_score...")
-    
-    # Create category from performance_score
-    df['performance_category'] = pd.cut(
-        df['performance_score'],
-        bins=[0, 50, 75, 90, 101],
-        labels=['Poor', 'Needs Improvement', 'Good', 'Excellent']
-    )
-
-# Define features
-features = [
-    'first_contentful_paint',
-    'largest_contentful_paint', 
-    'cumulative_layout_shift',
-    'total_blocking_time',
-    'total_byte_weight',
-    'meta_description_exists',
-    'title_length',
-    'seo_score',
-    'accessibility_score'
-]
+# Train through the cached pipeline (see pipeline.py, preset 'fixed').
+# It derives 'performance_category' from performance_score if missing,
+# keeps only the features that exist, scales, applies SMOTE and fits.
+print("\n🌲 Training Random Forest Classifier...")
+try:
+    result = pipeline.train('fixed', {'data': {'path': data_path}})
+except ValueError as e:
+    print(f"❌ {e}")
+    exit(1)
 
-# Check which features exist
-available_features = []
-for feature in features:
-    if feature in df.columns:
-        available_features.append(feature)
-    else:
-        print(f"⚠️ Feature '{feature}' not found in data")
+model, scaler, available_features = result['model'], result['scaler'], result['features']
+evaluation = result['evaluation']
 
-print(f"\n🔧 Using {len(available_features)} available features:")
+print(f"\n🔧 Used {len(available_features)} available features:")
 print(f"   {available_features}")
 
-if len(available_features) < 3:
-    print("❌ Not enough features for training!")
-    exit(1)
-
-# Prepare X and y
-X = df[available_features].values
-y = df['performance_category'].values
-
-print(f"\n🎯 Target classes: {np.unique(y)}")
-print(f"📈 Class distribution:")
-for cls in np.unique(y):
-    count = np.sum(y == cls)
-    print(f"   {cls}: {count} samples ({count/len(y):.1%})")
-
-# Split data
-from sklearn.model_selection import train_test_split
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, random_state=42, stratify=y
-)
-
-print(f"\n📐 Data split:")
-print(f"   Training: {len(X_train)} samples")
-print(f"   Testing:  {len(X_test)} samples")
-
-# Scale features
-from sklearn.preprocessing import StandardScaler
-scaler = StandardScaler()
-X_train_scaled = scaler.fit_transform(X_train)
-X_test_scaled = scaler.transform(X_test)
-
-# Handle class imbalance
-from imblearn.over_sampling import SMOTE
-smote = SMOTE(random_state=42)
-X_resampled, y_resampled = smote.fit_resample(X_train_scaled, y_train)
-
-print(f"\n🔄 After SMOTE:")
-print(f"   Training: {len(X_resampled)} samples")
-
-# Train Random Forest
-from sklearn.ensemble import RandomForestClassifier
-print("\n🌲 Training Random Forest Classifier...")
-model = RandomForestClassifier(
-    n_estimators=100,
-    max_depth=10,
-    min_samples_split=5,
-    min_samples_leaf=2,
-    random_state=42,
-    class_weight='balanced',
-    n_jobs=-1
-)
-
-model.fit(X_resampled, y_resampled)
-
-# Evaluate
-from sklearn.metrics import accuracy_score, classification_report
-y_pred = model.predict(X_test_scaled)
-accuracy = accuracy_score(y_test, y_pred)
-
 print(f"\n✅ Model trained!")
-print(f"📈 Accuracy: {accuracy:.1%}")
+print(f"📈 Accuracy: {evaluation['accuracy']:.1%}")
 
 print("\n📋 Detailed Report:")
-print(classification_report(y_test, y_pred))
-
-# Feature importance
-feature_importance = pd.DataFrame({
-    'feature': available_features,
-    'importance': model.feature_importances_
-}).sort_values('importance', ascending=False)
+print(evaluation['report'])
 
 print("\n🏆 Feature Importance:")
-print(feature_importance)
-
-# Save model
-print("\n💾 Saving model...")
-os.makedirs('data/model', exist_ok=True)
-
-joblib.dump(model, 'data/model/model.pkl')
-joblib.dump(scaler, 'data/model/scaler.pkl')
-joblib.dump(available_features, 'data/model/features.pkl')
+print(evaluation['importance'])
 
-print(f"✅ Model saved: data/model/model.pkl")
+print(f"\n✅ Model saved: data/model/model.pkl")
 print(f"✅ Scaler saved: data/model/scaler.pkl")
 print(f"✅ Features saved: data/model/features.pkl")
 